@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Import-Time Benchmark - Entry Point Start-Up Budgets
+====================================================
+Measures how long the pipeline and script entry points take to import,
+using CPython's `-X importtime`, and checks each against a time budget and
+a list of heavy packages it must not pull in at import time (they are
+imported lazily by the stage that needs them).
+
+Each target is imported in a fresh interpreter --repeat times; the median
+cumulative import time of the target module is compared with its budget.
+Process-pool workers import the same modules, so this is also worker
+start-up cost.
+
+Usage (from the repository root):
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --repeat 7 --budget-scale 2.0 --output import_time.json
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent
+SCRIPTS_DIR = REPO_ROOT / "scripts"
+
+# Packages that must only load when their stage runs
+HEAVY = ["matplotlib", "numpy", "pydantic", "scipy", "trimesh", "polyscope"]
+
+# name -> module, budget (ms), heavy packages it must not import
+TARGETS = {
+    "pipeline_cli": {
+        "module": "dental_data_pipeline.main",
+        "budget_ms": 100,
+        "forbidden": HEAVY,
+    },
+    "pipeline_query": {
+        "module": "dental_data_pipeline.query",
+        "budget_ms": 100,
+        "forbidden": HEAVY,
+    },
+    "pipeline_serve": {
+        "module": "dental_data_pipeline.serve",
+        "budget_ms": 100,
+        "forbidden": HEAVY,
+    },
+    "pipeline_worker": {
+        "module": "dental_data_pipeline.src.ingest",
+        "budget_ms": 250,
+        "forbidden": ["matplotlib", "numpy", "scipy", "trimesh", "polyscope"],
+    },
+    "dental_utils": {
+        "module": "dental_utils",
+        "budget_ms": 250,
+        "forbidden": ["matplotlib", "scipy", "trimesh", "polyscope"],
+    },
+    "visualize_case": {
+        "module": "visualize_case",
+        "budget_ms": 250,
+        "forbidden": ["matplotlib", "scipy", "trimesh", "polyscope"],
+    },
+    "analyze_stl_color": {
+        "module": "analyze_stl_color",
+        "budget_ms": 250,
+        "forbidden": ["matplotlib", "scipy", "trimesh", "polyscope"],
+    },
+    "case_dataset": {
+        "module": "case_dataset",
+        "budget_ms": 250,
+        "forbidden": ["matplotlib", "scipy", "trimesh", "polyscope"],
+    },
+}
+
+
+def parse_importtime(stderr: str) -> list[dict]:
+    """
+    Parse `-X importtime` output.
+
+    Returns one dict per imported module: name, self_us, cumulative_us,
+    depth (0 = imported directly by the -c statement).
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        stripped = name.lstrip()
+        rows.append({
+            "name": stripped.strip(),
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            "depth": (len(name) - len(stripped) - 1) // 2,
+        })
+    return rows
+
+
+def measure_import(module: str) -> list[dict]:
+    """Import module in a fresh interpreter and return its importtime rows."""
+    code = f"import sys; sys.path.insert(0, {str(SCRIPTS_DIR)!r}); import {module}"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr[-2000:]}")
+    return parse_importtime(proc.stderr)
+
+
+def check_target(name: str, spec: dict, repeat: int, budget_scale: float) -> dict:
+    """Median import time of one target, its heaviest dependencies and violations."""
+    module = spec["module"]
+    times_ms = []
+    rows = []
+    for _ in range(repeat):
+        rows = measure_import(module)
+        target = [r for r in rows if r["name"] == module]
+        times_ms.append(target[-1]["cumulative_us"] / 1000 if target else 0.0)
+
+    imported = {r["name"] for r in rows}
+    leaked = [pkg for pkg in spec["forbidden"] if pkg in imported]
+    # Heaviest packages pulled in (by cumulative time of their top-level module)
+    heaviest = sorted(
+        (r for r in rows if "." not in r["name"] and r["name"] != module),
+        key=lambda r: r["cumulative_us"], reverse=True,
+    )[:5]
+    budget_ms = spec["budget_ms"] * budget_scale
+    median_ms = statistics.median(times_ms)
+    return {
+        "name": name,
+        "module": module,
+        "median_ms": median_ms,
+        "min_ms": min(times_ms),
+        "budget_ms": budget_ms,
+        "leaked": leaked,
+        "heaviest": [(r["name"], r["cumulative_us"] / 1000) for r in heaviest],
+        "ok": median_ms <= budget_ms and not leaked,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time budgets for entry points")
+    parser.add_argument("--only", nargs="*", default=None, help="Targets whose name contains any of these")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh-interpreter imports per target")
+    parser.add_argument("--budget-scale", type=float, default=1.0,
+                        help="Multiply all budgets (e.g. 2.0 on slow CI machines)")
+    parser.add_argument("--output", type=str, default=None, help="Write results JSON here")
+    args = parser.parse_args()
+
+    selected = [n for n in TARGETS if not args.only or any(o in n for o in args.only)]
+    results = []
+    for name in selected:
+        result = check_target(name, TARGETS[name], args.repeat, args.budget_scale)
+        results.append(result)
+        status = "OK" if result["ok"] else "OVER BUDGET"
+        print(f"  {name:<20} {result['median_ms']:8.1f} ms  (budget {result['budget_ms']:.0f} ms)  {status}")
+        if result["leaked"]:
+            print(f"  {'':<20} imports heavy packages: {', '.join(result['leaked'])}")
+        if not result["ok"]:
+            heaviest = ", ".join(f"{pkg} {ms:.0f} ms" for pkg, ms in result["heaviest"])
+            print(f"  {'':<20} heaviest: {heaviest}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+    failed = [r["name"] for r in results if not r["ok"]]
+    if failed:
+        print(f"\nOver budget: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
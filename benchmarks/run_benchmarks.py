@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+"""
+Micro-Benchmarks - Parsers, Stats and Mesh Utilities
+====================================================
+Times and memory-profiles the hot functions of the pipeline and scripts on
+seeded synthetic data (see benchmarks/synthetic.py), stores baselines and
+flags regressions against them.
+
+Each benchmark reports median / min wall time over --repeat runs and the
+tracemalloc peak of one extra run.
+
+Usage (from the repository root):
+    # Run and print results
+    python -m benchmarks.run_benchmarks --scale small
+
+    # Store the current numbers as the baseline for this scale
+    python -m benchmarks.run_benchmarks --scale small --save-baseline
+
+    # Compare against the baseline (exit code 1 on regression)
+    python -m benchmarks.run_benchmarks --scale small --compare --report bench_report.md
+
+    # Only some benchmarks
+    python -m benchmarks.run_benchmarks --only parse_ classify
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.synthetic import make_case, make_cases
+
+# Scripts are flat modules, imported the same way the tests do
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+
+SCALES = {
+    "small": {"cases": 1000, "teeth": 6, "margin_points": 300, "stl_vertices": 20000},
+    "medium": {"cases": 10000, "teeth": 10, "margin_points": 1000, "stl_vertices": 100000},
+    "large": {"cases": 50000, "teeth": 14, "margin_points": 3000, "stl_vertices": 300000},
+}
+
+BENCHMARKS = {}
+
+
+def benchmark(name: str):
+    """
+    Register a benchmark.
+
+    The decorated function gets the fixture context and returns the
+    zero-argument callable to time (setup cost is excluded).
+    """
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+class Fixture:
+    """Synthetic inputs for one scale, built lazily and shared by benchmarks."""
+
+    def __init__(self, params: dict, workdir: Path, seed: int = 0):
+        self.params = params
+        self.workdir = workdir
+        self.seed = seed
+        self._case_dir = None
+        self._cases = None
+        self._jaw = None
+
+    @property
+    def case_dir(self) -> Path:
+        if self._case_dir is None:
+            self._case_dir = make_case(
+                self.workdir, "bench_case", seed=self.seed,
+                n_teeth=self.params["teeth"],
+                margin_points=self.params["margin_points"],
+                stl_vertices=self.params["stl_vertices"],
+            )
+        return self._case_dir
+
+    def file(self, suffix: str) -> str:
+        return str(self.case_dir / f"bench_case{suffix}")
+
+    @property
+    def cases(self) -> list:
+        if self._cases is None:
+            self._cases = make_cases(self.params["cases"], seed=self.seed,
+                                     margin_points=self.params["margin_points"])
+        return self._cases
+
+    @property
+    def jaw(self) -> tuple:
+        """(mesh, teeth with margins) of the jaw with the most teeth."""
+        if self._jaw is None:
+            from dental_utils import load_teeth, load_mesh
+            teeth = [t for t in load_teeth(self.file(".constructionInfo")) if len(t["margin_points"])]
+            upper = [t for t in teeth if t["jaw"] == "upper"]
+            lower = [t for t in teeth if t["jaw"] == "lower"]
+            jaw, jaw_teeth = ("UpperJaw", upper) if len(upper) >= len(lower) else ("LowerJaw", lower)
+            self._jaw = (load_mesh(self.file(f"-{jaw}.stl")), jaw_teeth)
+        return self._jaw
+
+
+# =============================================================================
+# Benchmarks
+# =============================================================================
+
+@benchmark("parse_dental_project")
+def bench_parse_dental_project(fx: Fixture):
+    from dental_data_pipeline.src.parsers import parse_dental_project
+    path = fx.file(".dentalProject")
+    return lambda: parse_dental_project(path)
+
+
+@benchmark("parse_construction_info")
+def bench_parse_construction_info(fx: Fixture):
+    from dental_data_pipeline.src.parsers import parse_construction_info
+    path = fx.file(".constructionInfo")
+    return lambda: parse_construction_info(path)
+
+
+def _parsed_case(fx: Fixture) -> tuple:
+    """(case id, jaw type, [(number, type)], margins) as the parsers return them."""
+    from dental_data_pipeline.src.parsers import parse_dental_project, parse_construction_info
+    case = parse_dental_project(fx.file(".dentalProject"))
+    margins = parse_construction_info(fx.file(".constructionInfo"))
+    return case.id, case.jaw_type, [(t.number, t.reconstruction_type) for t in case.teeth], margins
+
+
+@benchmark("construct_case_validated")
+def bench_construct_case_validated(fx: Fixture):
+    from dental_data_pipeline.src.models import Case, Tooth
+    case_id, jaw_type, teeth, margins = _parsed_case(fx)
+    return lambda: Case(id=case_id, jaw_type=jaw_type, teeth=[
+        Tooth(number=n, reconstruction_type=t, margin_points=margins.get(n, [])) for n, t in teeth
+    ])
+
+
+@benchmark("construct_case_trusted")
+def bench_construct_case_trusted(fx: Fixture):
+    from dental_data_pipeline.src.models import Case, Tooth
+    case_id, jaw_type, teeth, margins = _parsed_case(fx)
+    return lambda: Case(id=case_id, jaw_type=jaw_type, teeth=[
+        Tooth.trusted(n, t, margins.get(n)) for n, t in teeth
+    ])
+
+
+@benchmark("parse_case")
+def bench_parse_case(fx: Fixture):
+    from dental_data_pipeline.src.ingest import read_case, parse_case
+    raw = read_case(str(fx.case_dir))
+    return lambda: parse_case(raw)
+
+
+@benchmark("validate_case")
+def bench_validate_case(fx: Fixture):
+    from dental_data_pipeline.src.ingest import read_case, parse_case
+    case = parse_case(read_case(str(fx.case_dir)))
+    return lambda: case.validated()
+
+
+@benchmark("calculate_points_per_tooth_type")
+def bench_points_per_tooth_type(fx: Fixture):
+    from dental_data_pipeline.src.stats import calculate_points_per_tooth_type
+    cases = fx.cases
+    return lambda: calculate_points_per_tooth_type(cases)
+
+
+@benchmark("calculate_margin_point_counts")
+def bench_margin_point_counts(fx: Fixture):
+    from dental_data_pipeline.src.stats import calculate_margin_point_counts
+    cases = fx.cases
+    return lambda: calculate_margin_point_counts(cases)
+
+
+@benchmark("case_level_stats")
+def bench_case_level_stats(fx: Fixture):
+    from dental_data_pipeline.src.stats import (
+        calculate_jaw_distribution, calculate_case_types,
+        get_cases_size_histogram, get_tooth_frequency
+    )
+    cases = fx.cases
+
+    def run():
+        calculate_jaw_distribution(cases)
+        calculate_case_types(cases)
+        get_cases_size_histogram(cases)
+        get_tooth_frequency(cases)
+    return run
+
+
+@benchmark("build_case_table")
+def bench_build_case_table(fx: Fixture):
+    from dental_data_pipeline.src.case_table import build_case_table
+    cases = fx.cases
+    return lambda: build_case_table(cases)
+
+
+@benchmark("case_table_stats")
+def bench_case_table_stats(fx: Fixture):
+    from dental_data_pipeline.src import case_table
+    table = case_table.build_case_table(fx.cases)
+
+    def run():
+        for fn_name in case_table.STATS_FUNCTIONS.values():
+            getattr(case_table, fn_name)(table)
+        case_table.count_adjacency(table)
+        case_table.bridge_spans(table)
+    return run
+
+
+@benchmark("count_adjacency")
+def bench_count_adjacency(fx: Fixture):
+    from dental_data_pipeline.src.stats import count_adjacency
+    cases = fx.cases
+    return lambda: [count_adjacency(c.teeth) for c in cases]
+
+
+@benchmark("load_teeth")
+def bench_load_teeth(fx: Fixture):
+    from dental_utils import load_teeth
+    path = fx.file(".constructionInfo")
+    return lambda: load_teeth(path)
+
+
+@benchmark("load_mesh")
+def bench_load_mesh(fx: Fixture):
+    from dental_utils import load_mesh
+    path = fx.file("-UpperJaw.stl")
+    return lambda: load_mesh(path)
+
+
+@benchmark("load_qmesh")
+def bench_load_qmesh(fx: Fixture):
+    from mesh_format import convert_stl, load_qmesh
+    path = convert_stl(fx.file("-UpperJaw.stl"))["qmesh"]
+    return lambda: load_qmesh(path)
+
+
+@benchmark("classify_vertices")
+def bench_classify_vertices(fx: Fixture):
+    from dental_utils import classify_vertices
+    mesh, teeth = fx.jaw
+    return lambda: classify_vertices(mesh, teeth)
+
+
+@benchmark("compute_distances")
+def bench_compute_distances(fx: Fixture):
+    from dental_utils import compute_distances, transform_points
+    mesh, teeth = fx.jaw
+    points = np.vstack([
+        transform_points(t["margin_points"], np.linalg.inv(t["transform_matrix"])) for t in teeth
+    ])
+    # The BVH is built lazily on first query; time queries, not the build
+    compute_distances(mesh, points[:1])
+    return lambda: compute_distances(mesh, points)
+
+
+@benchmark("build_topology")
+def bench_build_topology(fx: Fixture):
+    from topology_utils import build_topology
+    mesh, _ = fx.jaw
+    faces, n_vertices = mesh.faces, len(mesh.vertices)
+    return lambda: build_topology(faces, n_vertices)
+
+
+@benchmark("load_topology_cached")
+def bench_load_topology_cached(fx: Fixture):
+    from topology_utils import load_topology
+    path = fx.file("-UpperJaw.stl")
+    load_topology(path)
+    return lambda: load_topology(path)
+
+
+@benchmark("knn_graphs")
+def bench_knn_graphs(fx: Fixture):
+    from knn_utils import knn_graphs
+    mesh, _ = fx.jaw
+    vertices = mesh.vertices
+    return lambda: knn_graphs(vertices, k=16, dilations=(1, 2))
+
+
+@benchmark("crop_teeth")
+def bench_crop_teeth(fx: Fixture):
+    from roi_utils import crop_teeth
+    mesh, teeth = fx.jaw
+    vertices, faces = mesh.vertices, mesh.faces
+    return lambda: crop_teeth(vertices, faces, teeth)
+
+
+@benchmark("resample_margins")
+def bench_resample_margins(fx: Fixture):
+    from margin_utils import pack_margins, resample_margins
+    points, offsets = pack_margins([t.margin_points for c in fx.cases for t in c.teeth if t.margin_points])
+    return lambda: resample_margins(points, offsets, k=128)
+
+
+@benchmark("render_views")
+def bench_render_views(fx: Fixture):
+    from render_utils import orbit_cameras, render_views
+    mesh, _ = fx.jaw
+    cameras = orbit_cameras(mesh.vertices, k=8, size=256)
+    return lambda: render_views(mesh.vertices, mesh.faces, cameras)
+
+
+@benchmark("backproject")
+def bench_backproject(fx: Fixture):
+    from render_utils import orbit_cameras, render_views, backproject
+    mesh, _ = fx.jaw
+    views = render_views(mesh.vertices, mesh.faces, orbit_cameras(mesh.vertices, k=8, size=256))
+    scores = views["depth"]
+    return lambda: backproject(scores, views, mesh.faces, len(mesh.vertices))
+
+
+@benchmark("render_thumbnail")
+def bench_render_thumbnail(fx: Fixture):
+    from render_utils import render_thumbnail
+    mesh, _ = fx.jaw
+    labels = np.zeros(len(mesh.vertices), dtype=np.int16)
+    return lambda: render_thumbnail(mesh.vertices, mesh.faces, labels, size=128)
+
+
+# =============================================================================
+# Measurement
+# =============================================================================
+
+def measure(fn, repeat: int) -> dict:
+    """Median/min wall time over repeat runs (after one warm-up) + tracemalloc peak."""
+    fn()
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "median_s": statistics.median(times),
+        "min_s": min(times),
+        "peak_kb": peak / 1024,
+        "repeat": repeat,
+    }
+
+
+def run_benchmarks(scale: str, repeat: int, only: list = None, seed: int = 0) -> dict:
+    """Run all (or selected) benchmarks at a scale and return a results document."""
+    params = SCALES[scale]
+    selected = [n for n in BENCHMARKS if not only or any(o in n for o in only)]
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="dental_bench_") as tmp:
+        fx = Fixture(params, Path(tmp), seed=seed)
+        for name in selected:
+            try:
+                fn = BENCHMARKS[name](fx)
+            except ImportError as e:
+                print(f"  {name:<34} skipped ({e})")
+                continue
+            results[name] = measure(fn, repeat)
+            r = results[name]
+            print(f"  {name:<34} median {r['median_s'] * 1000:10.2f} ms   peak {r['peak_kb']:10.0f} KB")
+
+    return {
+        "meta": {
+            "scale": scale,
+            "params": params,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, time_tolerance: float, mem_tolerance: float) -> list[dict]:
+    """
+    Compare results with a baseline.
+
+    A benchmark regresses when its median time exceeds the baseline by more
+    than time_tolerance (fraction) or its peak memory by more than
+    mem_tolerance.
+    """
+    rows = []
+    for name, cur in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            rows.append({"name": name, "status": "NEW", "time_ratio": None, "mem_ratio": None})
+            continue
+        time_ratio = cur["median_s"] / base["median_s"] if base["median_s"] > 0 else 1.0
+        mem_ratio = cur["peak_kb"] / base["peak_kb"] if base["peak_kb"] > 0 else 1.0
+        status = "OK"
+        if time_ratio > 1 + time_tolerance or mem_ratio > 1 + mem_tolerance:
+            status = "REGRESSION"
+        elif time_ratio < 1 - time_tolerance:
+            status = "FASTER"
+        rows.append({"name": name, "status": status, "time_ratio": time_ratio, "mem_ratio": mem_ratio,
+                     "median_s": cur["median_s"], "base_median_s": base["median_s"]})
+    return rows
+
+
+def format_report(rows: list[dict], current: dict) -> str:
+    """Markdown comparison table."""
+    meta = current["meta"]
+    lines = [
+        "# Benchmark Comparison",
+        "",
+        f"Scale: **{meta['scale']}** | Python {meta['python']} | NumPy {meta['numpy']} | {meta['timestamp']}",
+        "",
+        "| Benchmark | Baseline (ms) | Current (ms) | Time x | Memory x | Status |",
+        "|---|---|---|---|---|---|",
+    ]
+    for r in rows:
+        if r["time_ratio"] is None:
+            lines.append(f"| {r['name']} | - | - | - | - | {r['status']} |")
+            continue
+        lines.append(
+            f"| {r['name']} | {r['base_median_s'] * 1000:.2f} | {r['median_s'] * 1000:.2f} | "
+            f"{r['time_ratio']:.2f} | {r['mem_ratio']:.2f} | {r['status']} |"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run pipeline micro-benchmarks")
+    parser.add_argument("--scale", choices=list(SCALES), default="small")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark")
+    parser.add_argument("--only", nargs="*", default=None, help="Run benchmarks whose name contains any of these")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=str, default=None, help="Write results JSON here")
+    parser.add_argument("--save-baseline", action="store_true", help="Store results as the baseline for this scale")
+    parser.add_argument("--compare", action="store_true", help="Compare with the stored baseline")
+    parser.add_argument("--baseline", type=str, default=None, help="Baseline JSON (default: baselines/<scale>.json)")
+    parser.add_argument("--time-tolerance", type=float, default=0.25, help="Allowed slowdown fraction")
+    parser.add_argument("--mem-tolerance", type=float, default=0.25, help="Allowed peak memory growth fraction")
+    parser.add_argument("--report", type=str, default=None, help="Write markdown comparison here")
+    args = parser.parse_args()
+
+    print(f"Running benchmarks (scale: {args.scale}, repeat: {args.repeat})...")
+    current = run_benchmarks(args.scale, args.repeat, args.only, args.seed)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(current, indent=2))
+
+    baseline_path = Path(args.baseline) if args.baseline else BASELINE_DIR / f"{args.scale}.json"
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(current, indent=2))
+        print(f"\nBaseline saved: {baseline_path}")
+
+    if not args.compare:
+        return 0
+    if not baseline_path.exists():
+        print(f"\nNo baseline found: {baseline_path} (run with --save-baseline first)")
+        return 1
+
+    rows = compare(current, json.loads(baseline_path.read_text()), args.time_tolerance, args.mem_tolerance)
+    report = format_report(rows, current)
+    print("\n" + report)
+    if args.report:
+        Path(args.report).write_text(report + "\n")
+
+    regressions = [r["name"] for r in rows if r["status"] == "REGRESSION"]
+    if regressions:
+        print(f"\nRegressions: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
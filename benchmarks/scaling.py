@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Scaling Harness - main.py at 1k / 10k / 100k Synthetic Cases
+============================================================
+Materialises synthetic case trees of several sizes on local disk (cached
+between runs), then runs the full pipeline on each under several
+executor/worker settings. Every run happens in a fresh subprocess so peak
+RSS is measured per run.
+
+Reported per run: wall time split into listing, processing (glob + XML
+parsing + STL stat), stats, plots and report; throughput in cases/s; and
+peak RSS of the pipeline process (and of its worker processes, for the
+process and staged executors).
+
+Usage (from the repository root):
+    python -m benchmarks.scaling --sizes 1000 10000 100000 \\
+        --configs thread thread:32 process:4 process:8 staged:4 \\
+        --workdir /tmp/dental_scaling --output-dir scaling_results
+
+Outputs in --output-dir: results.json, scaling.md (table), scaling.png.
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from benchmarks.synthetic import make_case
+
+REPO_ROOT = Path(__file__).parent.parent
+
+
+# =============================================================================
+# Dataset materialisation
+# =============================================================================
+
+def _make_case_args(args: tuple) -> None:
+    root, name, seed, margin_points, stl_vertices = args
+    make_case(root, name, seed=seed, margin_points=margin_points, stl_vertices=stl_vertices)
+
+
+def materialise(workdir: Path, n_cases: int, seed: int, margin_points: int, stl_vertices: int) -> Path:
+    """
+    Create (or reuse) a synthetic tree of n_cases case folders.
+
+    Trees are keyed by their parameters; a marker file makes reuse safe
+    after an interrupted generation.
+    """
+    root = workdir / f"cases_{n_cases}_m{margin_points}_v{stl_vertices}_s{seed}"
+    marker = root / ".complete"
+    if marker.exists():
+        return root
+
+    root.mkdir(parents=True, exist_ok=True)
+    width = len(str(n_cases - 1))
+    jobs = [(root, f"case_{i:0{width}d}", seed + i, margin_points, stl_vertices) for i in range(n_cases)]
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor() as pool:
+        list(pool.map(_make_case_args, jobs, chunksize=256))
+    marker.write_text(str(n_cases))
+    print(f"  Materialised {n_cases} cases in {time.perf_counter() - t0:.1f}s: {root}")
+    return root
+
+
+# =============================================================================
+# Single run (child process)
+# =============================================================================
+
+def run_once(data_dir: str, executor: str, workers: int, out_dir: str, plots: bool = True) -> dict:
+    """Run the pipeline stages of main.main() with per-stage wall times."""
+    from dental_data_pipeline.main import compute_stats
+    from dental_data_pipeline.src.ingest import find_case_dirs, process_cases
+    from dental_data_pipeline.src.reporting import generate_markdown_report
+
+    timings = {}
+    t_start = time.perf_counter()
+
+    t0 = time.perf_counter()
+    case_dirs = find_case_dirs(data_dir)
+    timings["listing"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    cases = process_cases(case_dirs, executor, workers)
+    timings["processing"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    stats = compute_stats(cases)
+    timings["stats"] = time.perf_counter() - t0
+
+    plots_dir = os.path.join(out_dir, "plots")
+    t0 = time.perf_counter()
+    if plots:
+        from dental_data_pipeline.src.visualization import generate_plots
+        generate_plots(stats, plots_dir)
+    timings["plots"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    with open(os.path.join(out_dir, "report.md"), "w") as f:
+        f.write(generate_markdown_report(stats, plots_dir=plots_dir if plots else None))
+    timings["report"] = time.perf_counter() - t0
+
+    total = time.perf_counter() - t_start
+    # ru_maxrss is KB on Linux, bytes on macOS
+    rss_unit = 1 if sys.platform == "darwin" else 1024
+    return {
+        "cases": len(cases),
+        "executor": executor,
+        "workers": workers,
+        "timings": timings,
+        "total_s": total,
+        "cases_per_s": len(cases) / total if total > 0 else 0.0,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * rss_unit / 2 ** 20,
+        "peak_rss_children_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * rss_unit / 2 ** 20,
+    }
+
+
+def run_in_subprocess(data_dir: Path, executor: str, workers: int, plots: bool) -> dict:
+    """Run one configuration in a fresh interpreter and return its result."""
+    with tempfile.TemporaryDirectory(prefix="dental_scaling_out_") as out_dir:
+        cmd = [
+            sys.executable, "-m", "benchmarks.scaling", "run-one",
+            "--data-dir", str(data_dir), "--executor", executor, "--out-dir", out_dir,
+        ]
+        if workers:
+            cmd += ["--workers", str(workers)]
+        if not plots:
+            cmd.append("--no-plots")
+        proc = subprocess.run(cmd, cwd=REPO_ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"Run failed ({executor}:{workers}):\n{proc.stderr}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+# =============================================================================
+# Reporting
+# =============================================================================
+
+def parse_config(text: str) -> tuple[str, int]:
+    """'thread' -> ('thread', None); 'process:8' -> ('process', 8)."""
+    executor, _, workers = text.partition(":")
+    if executor not in ("thread", "process", "staged"):
+        raise argparse.ArgumentTypeError(f"Unknown executor: {executor}")
+    return executor, int(workers) if workers else None
+
+
+def config_label(result: dict) -> str:
+    return f"{result['executor']}:{result['workers'] or 'default'}"
+
+
+def format_table(results: list[dict]) -> str:
+    """Markdown table of all runs."""
+    stages = ["listing", "processing", "stats", "plots", "report"]
+    lines = [
+        "# Pipeline Scaling",
+        "",
+        "| Cases | Config | Total (s) | Cases/s | Peak RSS (MB) | Workers RSS (MB) | "
+        + " | ".join(f"{s} (s)" for s in stages) + " |",
+        "|---" * (6 + len(stages)) + "|",
+    ]
+    for r in results:
+        lines.append(
+            f"| {r['cases']} | {config_label(r)} | {r['total_s']:.2f} | {r['cases_per_s']:.0f} | "
+            f"{r['peak_rss_mb']:.0f} | {r['peak_rss_children_mb']:.0f} | "
+            + " | ".join(f"{r['timings'][s]:.2f}" for s in stages) + " |"
+        )
+    return "\n".join(lines)
+
+
+def plot_results(results: list[dict], path: Path):
+    """Throughput and peak memory against dataset size, one line per config."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, (ax_tp, ax_mem) = plt.subplots(1, 2, figsize=(12, 5))
+    for label in sorted({config_label(r) for r in results}):
+        runs = sorted((r for r in results if config_label(r) == label), key=lambda r: r["cases"])
+        sizes = [r["cases"] for r in runs]
+        ax_tp.plot(sizes, [r["cases_per_s"] for r in runs], marker="o", label=label)
+        ax_mem.plot(sizes, [r["peak_rss_mb"] + r["peak_rss_children_mb"] for r in runs], marker="o", label=label)
+
+    for ax, title, ylabel in ((ax_tp, "Throughput", "Cases / s"), (ax_mem, "Peak Memory", "Peak RSS (MB)")):
+        ax.set_xscale("log")
+        ax.set_title(title)
+        ax.set_xlabel("Dataset Size (cases)")
+        ax.set_ylabel(ylabel)
+        ax.grid(linestyle="--", alpha=0.7)
+        ax.legend()
+    plt.tight_layout()
+    plt.savefig(path, dpi=150, facecolor="white")
+    plt.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scaling harness for the dental data pipeline")
+    sub = parser.add_subparsers(dest="command")
+
+    p_one = sub.add_parser("run-one", help="(internal) run one configuration and print JSON")
+    p_one.add_argument("--data-dir", required=True)
+    p_one.add_argument("--executor", choices=["thread", "process", "staged"], default="thread")
+    p_one.add_argument("--workers", type=int, default=None)
+    p_one.add_argument("--out-dir", required=True)
+    p_one.add_argument("--no-plots", action="store_true")
+
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--configs", type=parse_config, nargs="+",
+                        default=[("thread", None), ("process", None)],
+                        help="executor[:workers], e.g. thread thread:32 process:8 staged:8")
+    parser.add_argument("--workdir", type=str, default=os.path.join(tempfile.gettempdir(), "dental_scaling"),
+                        help="Where synthetic trees are materialised (reused between runs)")
+    parser.add_argument("--output-dir", type=str, default="scaling_results")
+    parser.add_argument("--margin-points", type=int, default=100, help="Margin points per crown")
+    parser.add_argument("--stl-vertices", type=int, default=256, help="Vertices per synthetic jaw STL")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-plots", action="store_true", help="Skip the pipeline's plot stage")
+    args = parser.parse_args()
+
+    if args.command == "run-one":
+        result = run_once(args.data_dir, args.executor, args.workers, args.out_dir, plots=not args.no_plots)
+        print(json.dumps(result))
+        return 0
+
+    workdir = Path(args.workdir)
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    results = []
+    for size in sorted(args.sizes):
+        print(f"Size {size}:")
+        data_dir = materialise(workdir, size, args.seed, args.margin_points, args.stl_vertices)
+        for executor, workers in args.configs:
+            result = run_in_subprocess(data_dir, executor, workers, plots=not args.no_plots)
+            results.append(result)
+            print(f"  {config_label(result):<16} {result['total_s']:8.2f}s  "
+                  f"{result['cases_per_s']:8.0f} cases/s  peak {result['peak_rss_mb']:.0f} MB")
+
+    (output_dir / "results.json").write_text(json.dumps(results, indent=2))
+    table = format_table(results)
+    (output_dir / "scaling.md").write_text(table + "\n")
+    plot_results(results, output_dir / "scaling.png")
+    print("\n" + table)
+    print(f"\nResults written to: {output_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Service Load Test - Latency and QPS of the Resident Query Service
+=================================================================
+Drives a running `dental_data_pipeline/serve.py` with a fixed mix of
+stats, filter and per-case requests from N concurrent clients (one
+keep-alive connection each) for a fixed duration, and reports requests
+per second plus p50/p90/p99/max latency overall and per request kind.
+
+The filter mix mirrors the questions the service exists for: lower molar
+crowns, cases lacking constructionInfo, valid training teeth, complete
+upper cases. Per-case lookups cycle over case names fetched at start-up.
+
+Usage (from the repository root):
+    # Against a running service
+    python -m dental_data_pipeline.serve --data-dir data/ --port 8765 &
+    python -m benchmarks.service_load --target http://127.0.0.1:8765 --concurrency 8 --duration 10
+
+    # Unix socket
+    python -m benchmarks.service_load --target unix:/tmp/dental.sock
+
+    # Self-contained: serve --data-dir in this process (clients share its GIL,
+    # so QPS is a lower bound)
+    python -m benchmarks.service_load --serve data/ --duration 5 --output service_load.json
+"""
+
+import argparse
+import http.client
+import json
+import socket
+import statistics
+import threading
+import time
+from typing import Dict, List, Tuple
+
+# (kind, path) request mix; per-case lookups are added from the served case names
+FILTER_QUERIES = [
+    ("cases", "/cases?arch=lower&tooth_class=molar&type=AnatomicWaxup&count=1"),
+    ("cases", "/cases?missing=constructionInfo"),
+    ("cases", "/cases?valid_training=1&count=1"),
+    ("cases", "/cases?jaw=Upper&complete=1&limit=100"),
+    ("cases", "/cases?teeth=36,46&min_margin_points=51&count=1"),
+]
+STATIC_QUERIES = [("stats", "/stats"), ("health", "/health")]
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection over a Unix domain socket."""
+
+    def __init__(self, path: str, timeout: float = 10.0):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+def connect(target: str) -> http.client.HTTPConnection:
+    """Connection to "http://host:port" or "unix:/path/to.sock"."""
+    if target.startswith("unix:"):
+        return UnixHTTPConnection(target[len("unix:"):])
+    host_port = target.split("://", 1)[-1].rstrip("/")
+    host, _, port = host_port.partition(":")
+    return http.client.HTTPConnection(host, int(port or 80), timeout=10.0)
+
+
+def get(conn: http.client.HTTPConnection, path: str) -> Tuple[int, bytes]:
+    conn.request("GET", path)
+    response = conn.getresponse()
+    return response.status, response.read()
+
+
+def build_queries(target: str, n_cases: int = 50) -> List[Tuple[str, str]]:
+    """Request mix: stats, health, filters and lookups of up to n_cases case names."""
+    conn = connect(target)
+    try:
+        status, body = get(conn, f"/cases?limit={n_cases}")
+    finally:
+        conn.close()
+    if status != 200:
+        raise RuntimeError(f"GET /cases failed with {status}")
+    names = [path.rstrip("/").rsplit("/", 1)[-1] for path in json.loads(body)["cases"]]
+    return STATIC_QUERIES + FILTER_QUERIES + [("case", f"/case/{name}") for name in names]
+
+
+def _client(target: str, queries: list, offset: int, deadline: float, out: list) -> None:
+    """One keep-alive client issuing the request mix round-robin until the deadline."""
+    conn = connect(target)
+    i = offset
+    try:
+        while time.perf_counter() < deadline:
+            kind, path = queries[i % len(queries)]
+            i += 1
+            t0 = time.perf_counter()
+            try:
+                status, _ = get(conn, path)
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = connect(target)
+                status = 0
+            out.append((kind, time.perf_counter() - t0, status))
+    finally:
+        conn.close()
+
+
+def _latency_summary(latencies: List[float]) -> Dict[str, float]:
+    if not latencies:
+        return {"n": 0}
+    ms = sorted(l * 1000 for l in latencies)
+    q = statistics.quantiles(ms, n=100, method="inclusive") if len(ms) > 1 else ms * 99
+    return {"n": len(ms), "p50_ms": q[49], "p90_ms": q[89], "p99_ms": q[98], "max_ms": ms[-1]}
+
+
+def run_load(target: str, concurrency: int = 8, duration: float = 10.0, queries: list = None) -> Dict:
+    """
+    Runs the load test and returns totals, QPS and latency percentiles
+    (overall and per request kind). Status 0 marks a connection error.
+    """
+    queries = queries or build_queries(target)
+    results = [[] for _ in range(concurrency)]
+    start = time.perf_counter()
+    deadline = start + duration
+    threads = [
+        threading.Thread(target=_client, args=(target, queries, i * len(queries) // concurrency, deadline, results[i]))
+        for i in range(concurrency)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    samples = [s for r in results for s in r]
+    kinds = sorted({kind for kind, _ in queries})
+    return {
+        "target": target,
+        "concurrency": concurrency,
+        "duration_s": elapsed,
+        "requests": len(samples),
+        "errors": sum(1 for _, _, status in samples if status != 200),
+        "qps": len(samples) / elapsed if elapsed > 0 else 0.0,
+        "latency": _latency_summary([l for _, l, _ in samples]),
+        "by_kind": {kind: _latency_summary([l for k, l, _ in samples if k == kind]) for kind in kinds},
+    }
+
+
+def print_summary(result: Dict) -> None:
+    print(f"{result['requests']} requests in {result['duration_s']:.1f}s with {result['concurrency']} clients: "
+          f"{result['qps']:,.0f} req/s, {result['errors']} errors")
+    print(f"\n{'Kind':<10} {'n':>8} {'p50 (ms)':>10} {'p90 (ms)':>10} {'p99 (ms)':>10} {'max (ms)':>10}")
+    for kind, s in [("all", result["latency"])] + sorted(result["by_kind"].items()):
+        if s["n"]:
+            print(f"{kind:<10} {s['n']:>8} {s['p50_ms']:>10.2f} {s['p90_ms']:>10.2f} {s['p99_ms']:>10.2f} {s['max_ms']:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test for the resident query service")
+    parser.add_argument("--target", type=str, default="http://127.0.0.1:8765", help="http://host:port or unix:/path")
+    parser.add_argument("--serve", type=str, default=None, metavar="DATA_DIR",
+                        help="Start the service in-process on a free port over this data directory")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent keep-alive clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run")
+    parser.add_argument("--output", type=str, default=None, help="Write the result JSON here")
+    args = parser.parse_args()
+
+    server = service = None
+    target = args.target
+    if args.serve:
+        from dental_data_pipeline.src.service import CaseService, make_server
+        service = CaseService(args.serve)
+        service.load()
+        server = make_server(service, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        target = "http://%s:%d" % server.server_address[:2]
+        print(f"Serving {len(service.snapshot)} cases on {target}")
+
+    try:
+        result = run_load(target, args.concurrency, args.duration)
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+            service.close()
+    print_summary(result)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"\nResult written: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Synthetic Dental Data Generator
+===============================
+Seeded generator for benchmark and scaling inputs that look like Exocad
+exports: .dentalProject / .constructionInfo XML and binary STL jaws of
+configurable size, laid out the way both dental_data_pipeline/main.py
+and scripts/ expect:
+
+    <root>/<case>/<case>.dentalProject
+    <root>/<case>/<case>.constructionInfo
+    <root>/<case>/<case>-UpperJaw.stl
+    <root>/<case>/<case>-LowerJaw.stl
+
+Jaws are height-field surfaces with a bump per tooth along a parabolic
+arch; margins are rings around the bumps, stored in Design Space (the
+ZRotationMatrix maps Scanner -> Design), so alignment and classification
+code paths behave as on real data.
+
+Usage:
+    from benchmarks.synthetic import make_case, make_dataset, make_cases
+    make_dataset("/tmp/synthetic", n_cases=100, seed=0)
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+UPPER_TEETH = [q * 10 + i for q in (1, 2) for i in range(1, 9)]
+LOWER_TEETH = [q * 10 + i for q in (3, 4) for i in range(1, 9)]
+RECONSTRUCTION_TYPES = ["AnatomicWaxup", "WaxupPontic", "Implant", "Veneer"]
+RECONSTRUCTION_WEIGHTS = [0.75, 0.15, 0.07, 0.03]
+
+STL_RECORD = np.dtype([
+    ("normal", "<f4", (3,)),
+    ("vertices", "<f4", (3, 3)),
+    ("attr", "<u2"),
+])
+
+
+def tooth_position(number: int) -> np.ndarray:
+    """Approximate (x, y) of a tooth centre on a parabolic arch (mm)."""
+    quadrant, index = divmod(number, 10)
+    side = -1.0 if quadrant in (1, 4) else 1.0
+    x = side * (index - 0.5) * 4.5
+    y = 0.03 * x ** 2
+    return np.array([x, y])
+
+
+def _design_matrix(rng: np.random.Generator) -> np.ndarray:
+    """Random rigid Scanner -> Design transform (4x4, column-vector convention)."""
+    angle = rng.uniform(-np.pi, np.pi)
+    c, s = np.cos(angle), np.sin(angle)
+    mat = np.eye(4)
+    mat[:2, :2] = [[c, -s], [s, c]]
+    mat[:3, 3] = rng.uniform(-30, 30, size=3)
+    return mat
+
+
+def make_jaw(teeth: list[int], n_vertices: int, rng: np.random.Generator) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Height-field jaw surface with one bump per tooth.
+
+    Returns (vertices (N, 3), faces (F, 3)) with N close to n_vertices.
+    """
+    side = max(int(np.sqrt(n_vertices)), 2)
+    xs = np.linspace(-40, 40, side)
+    ys = np.linspace(-5, 45, side)
+    gx, gy = np.meshgrid(xs, ys)
+    z = rng.normal(0, 0.02, size=gx.shape)
+    for number in teeth:
+        cx, cy = tooth_position(number)
+        z += 8.0 * np.exp(-((gx - cx) ** 2 + (gy - cy) ** 2) / (2 * 2.2 ** 2))
+    vertices = np.stack([gx.ravel(), gy.ravel(), z.ravel()], axis=1)
+
+    idx = np.arange(side * side).reshape(side, side)
+    a, b = idx[:-1, :-1].ravel(), idx[:-1, 1:].ravel()
+    c, d = idx[1:, :-1].ravel(), idx[1:, 1:].ravel()
+    faces = np.concatenate([np.stack([a, b, d], axis=1), np.stack([a, d, c], axis=1)])
+    return vertices, faces
+
+
+def make_margin(number: int, n_points: int, rng: np.random.Generator) -> np.ndarray:
+    """Closed, slightly undulating margin ring around a tooth bump (Scanner Space)."""
+    cx, cy = tooth_position(number)
+    t = np.linspace(0, 2 * np.pi, n_points, endpoint=False)
+    radius = 3.0 + rng.uniform(-0.3, 0.3)
+    x = cx + radius * np.cos(t)
+    y = cy + radius * 0.85 * np.sin(t)
+    z = 8.0 * np.exp(-radius ** 2 / (2 * 2.2 ** 2)) + 0.3 * np.sin(2 * t)
+    return np.stack([x, y, z], axis=1)
+
+
+def write_binary_stl(path: Path, vertices: np.ndarray, faces: np.ndarray) -> None:
+    """Write a binary STL (per-face vertices, zero normals and attributes)."""
+    records = np.zeros(len(faces), dtype=STL_RECORD)
+    records["vertices"] = vertices[faces]
+    with open(path, "wb") as f:
+        f.write(b"synthetic".ljust(80, b" "))
+        f.write(np.uint32(len(faces)).tobytes())
+        f.write(records.tobytes())
+
+
+def dental_project_xml(teeth: list[tuple[int, str]]) -> str:
+    """XML text of a .dentalProject with the given (number, type) teeth."""
+    body = "".join(
+        f"<Tooth><Number>{n}</Number><ReconstructionType>{t}</ReconstructionType></Tooth>"
+        for n, t in teeth
+    )
+    return f'<?xml version="1.0" encoding="utf-8"?>\n<Project><Teeth>{body}</Teeth></Project>\n'
+
+
+def construction_info_xml(case_name: str, teeth: list[dict]) -> str:
+    """
+    XML text of a .constructionInfo.
+
+    Each tooth dict has number, jaw, margin_points (Design Space) and
+    matrix (Scanner -> Design, column-vector convention; written
+    transposed as Exocad does, so load_teeth's .T recovers it).
+    """
+    parts = []
+    for tooth in teeth:
+        vecs = "".join(
+            f"<Vec3><x>{x:.6f}</x><y>{y:.6f}</y><z>{z:.6f}</z></Vec3>"
+            for x, y, z in tooth["margin_points"]
+        )
+        stored = tooth["matrix"].T
+        mat = "".join(f"<_{r}{c}>{stored[r, c]:.9f}</_{r}{c}>" for r in range(4) for c in range(4))
+        jaw_name = "UpperJaw" if tooth["jaw"] == "upper" else "LowerJaw"
+        parts.append(
+            f"<Tooth><Number>{tooth['number']}</Number>"
+            f"<ToothScanFileName>{case_name}-{jaw_name}.stl</ToothScanFileName>"
+            f"<Margin>{vecs}</Margin><ZRotationMatrix>{mat}</ZRotationMatrix></Tooth>"
+        )
+    return f'<?xml version="1.0" encoding="utf-8"?>\n<ConstructionInfo><Teeth>{"".join(parts)}</Teeth></ConstructionInfo>\n'
+
+
+def make_case(
+    root,
+    name: str,
+    seed: int = 0,
+    n_teeth: int = None,
+    margin_points: int = 300,
+    stl_vertices: int = 20000,
+    with_stl: bool = True
+) -> Path:
+    """
+    Write one synthetic case folder.
+
+    Args:
+        root: Parent directory
+        name: Case folder / file stem
+        seed: RNG seed (same seed -> identical files)
+        n_teeth: Number of teeth (default: random 1-12)
+        margin_points: Margin points per crown
+        stl_vertices: Approximate vertices per jaw STL
+        with_stl: Also write jaw STLs (skip for XML-only benchmarks)
+
+    Returns:
+        Path to the case folder
+    """
+    rng = np.random.default_rng(seed)
+    case_dir = Path(root) / name
+    case_dir.mkdir(parents=True, exist_ok=True)
+
+    if n_teeth is None:
+        n_teeth = int(rng.integers(1, 13))
+    pool = UPPER_TEETH + LOWER_TEETH
+    numbers = sorted(rng.choice(pool, size=min(n_teeth, len(pool)), replace=False).tolist())
+    types = rng.choice(RECONSTRUCTION_TYPES, size=len(numbers), p=RECONSTRUCTION_WEIGHTS).tolist()
+
+    (case_dir / f"{name}.dentalProject").write_text(dental_project_xml(list(zip(numbers, types))))
+
+    construction = []
+    for number, rec_type in zip(numbers, types):
+        jaw = "upper" if number < 30 else "lower"
+        matrix = _design_matrix(rng)
+        if rec_type == "WaxupPontic":
+            margin = np.zeros((0, 3))
+        else:
+            scanner = make_margin(number, margin_points, rng)
+            margin = (np.hstack([scanner, np.ones((len(scanner), 1))]) @ matrix.T)[:, :3]
+        construction.append({"number": number, "jaw": jaw, "margin_points": margin, "matrix": matrix})
+    (case_dir / f"{name}.constructionInfo").write_text(construction_info_xml(name, construction))
+
+    if with_stl:
+        for jaw, jaw_name, jaw_teeth in (("upper", "UpperJaw", UPPER_TEETH), ("lower", "LowerJaw", LOWER_TEETH)):
+            present = [n for n in numbers if n in jaw_teeth]
+            vertices, faces = make_jaw(present, stl_vertices, rng)
+            write_binary_stl(case_dir / f"{name}-{jaw_name}.stl", vertices, faces)
+    return case_dir
+
+
+def make_dataset(root, n_cases: int, seed: int = 0, **kwargs) -> list[Path]:
+    """Write n_cases synthetic case folders under root (case i uses seed + i)."""
+    width = len(str(max(n_cases - 1, 0)))
+    return [
+        make_case(root, f"case_{i:0{width}d}", seed=seed + i, **kwargs)
+        for i in range(n_cases)
+    ]
+
+
+def make_cases(n_cases: int, seed: int = 0, margin_points: int = 300) -> list:
+    """In-memory pipeline Case objects (no files) for stats benchmarks."""
+    from dental_data_pipeline.src.models import Case, Tooth, ReconstructionType
+
+    rng = np.random.default_rng(seed)
+    pool = np.array(UPPER_TEETH + LOWER_TEETH)
+    margin = [(0.0, 0.0, 0.0)] * margin_points
+    cases = []
+    for i in range(n_cases):
+        numbers = rng.choice(pool, size=int(rng.integers(1, 13)), replace=False)
+        types = rng.choice(RECONSTRUCTION_TYPES, size=len(numbers), p=RECONSTRUCTION_WEIGHTS)
+        teeth = [
+            Tooth.trusted(int(n), ReconstructionType(t), [] if t == "WaxupPontic" else margin)
+            for n, t in zip(numbers, types)
+        ]
+        upper = any(n < 30 for n in numbers)
+        lower = any(n >= 30 for n in numbers)
+        jaw = "Mixed" if upper and lower else "Upper" if upper else "Lower"
+        cases.append(Case(id=f"case_{i}", jaw_type=jaw, teeth=teeth,
+                          scan_vertex_count=int(rng.integers(50000, 400000)),
+                          file_size_mb=float(rng.uniform(5, 60))))
+    return cases
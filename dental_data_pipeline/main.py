@@ -2,114 +2,265 @@
 import os
 import argparse
 import sys
-import glob
-from concurrent.futures import ThreadPoolExecutor
-from typing import List
-from dental_data_pipeline.src.parsers import parse_dental_project, parse_construction_info
-from dental_data_pipeline.src.models import Case
-from dental_data_pipeline.src.reporting import generate_markdown_report
-from dental_data_pipeline.src.visualization import generate_plots
-from dental_data_pipeline.src.stats import (
-    calculate_jaw_distribution, 
-    calculate_completeness_stats,
-    get_tooth_frequency,
-    get_reconstruction_stats,
-    get_cases_size_histogram,
-    calculate_margin_point_counts,
-    calculate_scan_resolution,
-    calculate_file_size_stats,
-    calculate_points_per_tooth_type,
-    calculate_case_types
-)
-
-def process_case(case_dir: str) -> Case:
+import time
+from typing import List, Dict, Optional, Tuple, TYPE_CHECKING
+from dental_data_pipeline.src.tracing import Tracer, get_tracer, set_tracer
+
+# Stage dependencies (pydantic, numpy, matplotlib) are imported inside the
+# stages that need them, so --help and worker start-up stay fast and
+# --no-plots never loads matplotlib. See benchmarks/import_time.py.
+if TYPE_CHECKING:
+    from dental_data_pipeline.src.models import Case
+
+def compute_stats(cases: List["Case"]) -> Dict:
     """
-    Worker function to process a single case folder.
+    Builds the statistics payload consumed by plots and the report.
+    The cases are converted once to a columnar CaseTable; each statistic is
+    then computed over the table (the stats module and catalog_stats() use the same functions).
     """
-    case_name = os.path.basename(case_dir)
-    dental_project_files = glob.glob(os.path.join(case_dir, "*.dentalProject"))
+    from dental_data_pipeline.src.case_table import build_case_table, table_stats
+
+    tracer = get_tracer()
+    with tracer.span("stats.build_case_table"):
+        table = build_case_table(cases)
+    return table_stats(table)
+
+def print_stage_timings(tracer: Tracer):
+    """Prints wall/CPU time and memory peak of the top-level stages."""
+    summary = tracer.summary()
+    print(f"\n{'Stage':<14} {'Wall (s)':>10} {'CPU (s)':>10} {'Peak (MB)':>10}")
+    for stage in ["listing", "processing", "stats", "plots", "report"]:
+        if stage in summary:
+            s = summary[stage]
+            peak = f"{s['peak_bytes'] / 2**20:.1f}" if s["peak_bytes"] is not None else "n/a"
+            print(f"{stage:<14} {s['wall_s']:>10.2f} {s['cpu_s']:>10.2f} {peak:>10}")
+
+def ingest_cases(args, tracer: Tracer) -> Tuple[List[str], List["Case"], Optional[Dict]]:
+    """Listing, optional duplicate detection and case processing stages of main()."""
+    from dental_data_pipeline.src.ingest import find_case_dirs, process_cases
+
+    with tracer.span("listing"):
+        case_dirs = find_case_dirs(args.data_dir)
     
-    if not dental_project_files:
-        return Case(id=case_name, missing_files=["dentalProject"])
-        
-    project_path = dental_project_files[0]
+    print(f"Found {len(case_dirs)} case directories. Processing...")
+
+    duplicates = None
+    if args.find_duplicates or args.dedupe:
+        from dental_data_pipeline.src.dedup import find_duplicates
+        with tracer.span("dedup"):
+            # Sorted so the kept case of each duplicate group is stable
+            duplicates = find_duplicates(sorted(case_dirs), args.dedup_index)
+        print(f"Duplicate scans: {len(duplicates['scan_groups'])} groups, {duplicates['dropped']} redundant cases")
+        if args.dedupe:
+            kept = set(duplicates["unique_case_dirs"])
+            case_dirs = [d for d in case_dirs if d in kept]
+            print(f"--dedupe: processing {len(case_dirs)} unique cases")
     
-    try:
-        case = parse_dental_project(project_path)
-    except Exception as e:
-        return Case(id=case_name, missing_files=["dentalProject_corrupt"])
-
-    construction_files = glob.glob(os.path.join(case_dir, "*.constructionInfo"))
-    if construction_files:
-        margins = parse_construction_info(construction_files[0])
-        for tooth in case.teeth:
-            if tooth.number in margins:
-                tooth.margin_points = margins[tooth.number]
-    else:
-        case.missing_files.append("constructionInfo")
+    with tracer.span("processing", cases=len(case_dirs)):
+        cases = process_cases(case_dirs, args.executor, args.workers, args.io_workers, args.queue_size)
+    return case_dirs, cases, duplicates
+
+def write_outputs(stats_payload: Dict, args, tracer: Tracer):
+    """Plots (unless --no-plots) and the markdown report."""
+    if not args.no_plots:
+        print(f"Generating Plots in '{args.plots_dir}'...")
+        with tracer.span("plots"):
+            from dental_data_pipeline.src.visualization import generate_plots
+            generate_plots(stats_payload, args.plots_dir)
+
+    with tracer.span("report"):
+        from dental_data_pipeline.src.reporting import generate_markdown_report
+        plots_dir = None if args.no_plots else args.plots_dir
+        markdown_output = generate_markdown_report(stats_payload, plots_dir=plots_dir)
         
-    stl_files = glob.glob(os.path.join(case_dir, "*.stl"))
-    if not stl_files:
-        case.missing_files.append("scan_stl")
-    else:
-        try:
-             total_size = sum(os.path.getsize(f) for f in stl_files)
-             case.file_size_mb = total_size / (1024 * 1024)
-        except OSError:
-             pass
+        with open(args.output, "w") as f:
+            f.write(markdown_output)
+        
+    print(f"\nReport generated successfully: {args.output}")
+
+def watch_cases(args, tracer: Tracer, max_polls: Optional[int] = None):
+    """
+    Long-running ingestion: re-processes only new or changed case folders and
+    keeps one single-row CaseTable per folder, so a statistics update is a
+    concat of cached rows. Plots and report are rewritten at most once per
+    --report-interval seconds, and once more on exit if changes are pending.
+    With --trace, every rewrite also exports the spans recorded since the
+    previous one and resets the tracer, so memory stays bounded.
+    """
+    from dental_data_pipeline.src.case_table import build_case_table, concat_case_tables, table_stats
+    from dental_data_pipeline.src.ingest import process_cases
+    from dental_data_pipeline.src.watch import CaseWatcher
+
+    watcher = CaseWatcher(args.data_dir, use_inotify=not args.watch_polling)
+    print(f"Watching '{args.data_dir}' ({watcher.mode}), Ctrl+C to stop...")
+    rows = {}
+    dirty, last_write, polls = False, float("-inf"), 0
 
-    return case
+    def update():
+        with tracer.span("stats"):
+            stats_payload = table_stats(concat_case_tables([rows[d] for d in sorted(rows)]))
+        write_outputs(stats_payload, args, tracer)
+        print(f"Total Cases: {stats_payload['total_cases']}")
+        if args.trace:
+            export_trace(args, tracer)
+            tracer.reset()
+
+    try:
+        while max_polls is None or polls < max_polls:
+            polls += 1
+            changed, removed = watcher.poll(args.watch_interval)
+            for case_dir in removed:
+                rows.pop(case_dir, None)
+            if changed:
+                with tracer.span("processing", cases=len(changed)):
+                    cases = process_cases(changed, args.executor, args.workers, args.io_workers, args.queue_size)
+                for case_dir, case in zip(changed, cases):
+                    rows[case_dir] = build_case_table([case])
+            if changed or removed:
+                dirty = True
+                print(f"{len(changed)} new or changed, {len(removed)} removed case directories")
+            if dirty and time.monotonic() - last_write >= args.report_interval:
+                update()
+                dirty, last_write = False, time.monotonic()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+    if dirty:
+        update()
+
+def export_trace(args, tracer: Tracer):
+    """Prints stage timings and writes the trace files into --trace-dir."""
+    print_stage_timings(tracer)
+    paths = tracer.export(args.trace_dir)
+    print(f"Trace written: {paths['summary']}, {paths['chrome']}, {paths['prometheus']}")
+
+def finish(args, tracer: Tracer):
+    """Stage timings and trace export (--trace; watch mode exports on every report write)."""
+    if args.trace and not args.watch:
+        export_trace(args, tracer)
+    tracer.close()
+    print("Done.")
 
 def main():
     parser = argparse.ArgumentParser(description="Run Dental Data Pipeline Analysis")
-    parser.add_argument("--data-dir", type=str, required=True, help="Path to data directory containing case folders")
+    parser.add_argument("--data-dir", type=str, default=None, help="Path to data directory containing case folders")
+    parser.add_argument("--from-catalog", type=str, default=None, help="Compute stats from a --catalog file instead of --data-dir")
+    parser.add_argument("--catalog", type=str, default=None, help="Write a queryable SQLite catalog of cases and teeth here")
     parser.add_argument("--output", type=str, default="report.md", help="Output markdown file")
     parser.add_argument("--plots-dir", type=str, default="plots", help="Directory to save plots")
+    parser.add_argument("--no-plots", action="store_true", help="Skip plot generation (never imports matplotlib)")
+    parser.add_argument("--executor", choices=["thread", "process", "staged"], default="thread", help="Executor used to process cases")
+    parser.add_argument("--workers", type=int, default=None, help="Number of case workers, parser processes for staged (default: executor default)")
+    parser.add_argument("--io-workers", type=int, default=8, help="Staged executor: reader threads listing and reading case files")
+    parser.add_argument("--queue-size", type=int, default=64, help="Staged executor: max read-but-unparsed cases held in memory")
+    parser.add_argument("--trace", action="store_true", help="Record per-stage timings and memory peaks")
+    parser.add_argument("--trace-dir", type=str, default="trace", help="Where --trace writes summary JSON, Chrome trace and Prometheus metrics (--watch: rewritten with each report)")
+    parser.add_argument("--no-trace-memory", action="store_true", help="With --trace, skip tracemalloc peaks (lower overhead)")
+    parser.add_argument("--find-duplicates", action="store_true", help="Fingerprint STL/XML files and report duplicate scans and cases")
+    parser.add_argument("--dedupe", action="store_true", help="Like --find-duplicates, and process each unique scan once")
+    parser.add_argument("--dedup-index", type=str, default="dedup_index.sqlite", help="Persistent file-hash index used by duplicate detection")
+    parser.add_argument("--profile-cases", type=int, default=0, metavar="N", help="Profile every case and list the N slowest in the report")
+    parser.add_argument("--profile-csv", type=str, default="case_profile.csv", help="Where --profile-cases writes the full per-case CSV")
+    parser.add_argument("--cprofile-top", type=int, default=0, metavar="K", help="With --profile-cases, cProfile the K slowest cases")
+    parser.add_argument("--cprofile-dir", type=str, default="case_profiles", help="Where --cprofile-top writes .prof/.txt dumps")
+    parser.add_argument("--gallery", action="store_true", help="Render per-case thumbnails and add a paginated case gallery to the report")
+    parser.add_argument("--gallery-dir", type=str, default="gallery", help="Where --gallery writes thumbnails (cached per case fingerprint) and pages")
+    parser.add_argument("--thumbnail-size", type=int, default=128, help="Thumbnail height in pixels (one tile per jaw)")
+    parser.add_argument("--gallery-page-size", type=int, default=100, help="Thumbnails per gallery page")
+    parser.add_argument("--watch", action="store_true", help="Keep running: process new or changed case folders and refresh stats, plots and report")
+    parser.add_argument("--watch-interval", type=float, default=1.0, help="Watch: seconds between directory polls (a case is processed once stable for one poll)")
+    parser.add_argument("--watch-polling", action="store_true", help="Watch: poll directory stats even where inotify is available")
+    parser.add_argument("--report-interval", type=float, default=5.0, help="Watch: minimum seconds between plot/report rewrites")
     args = parser.parse_args()
 
-    if not os.path.exists(args.data_dir):
-        print(f"Directory not found: {args.data_dir}")
+    if not args.data_dir and not args.from_catalog:
+        parser.error("one of --data-dir or --from-catalog is required")
+    if args.watch and not args.data_dir:
+        parser.error("--watch requires --data-dir")
+    if args.watch:
+        # Watch mode only refreshes stats, plots and the report
+        unsupported = [
+            flag for flag, used in [
+                ("--dedupe", args.dedupe), ("--find-duplicates", args.find_duplicates),
+                ("--catalog", args.catalog), ("--profile-cases", args.profile_cases > 0),
+                ("--gallery", args.gallery),
+            ] if used
+        ]
+        if unsupported:
+            parser.error(f"--watch cannot be combined with {', '.join(unsupported)}")
+    source = args.from_catalog or args.data_dir
+    if not os.path.exists(source):
+        print(f"{'Catalog' if args.from_catalog else 'Directory'} not found: {source}")
         sys.exit(1)
 
-    all_items = [os.path.join(args.data_dir, d) for d in os.listdir(args.data_dir)]
-    case_dirs = [d for d in all_items if os.path.isdir(d)]
-    
-    print(f"Found {len(case_dirs)} case directories. Processing...")
-    
-    cases: List[Case] = []
-    with ThreadPoolExecutor() as executor:
-        results = executor.map(process_case, case_dirs)
-        cases = list(results)
+    # Case profiling reuses the per-case spans; memory peaks only with --trace
+    tracer = Tracer(
+        enabled=args.trace or args.profile_cases > 0,
+        trace_memory=args.trace and not args.no_trace_memory
+    )
+    set_tracer(tracer)
 
-    print("Calculating Statistics...")
-    
-    stats_payload = {
-        "total_cases": len(cases),
-        "completeness": calculate_completeness_stats(cases),
-        "jaw_dist": calculate_jaw_distribution(cases),
-        "reconstruction_stats": get_reconstruction_stats(cases),
-        "margin_stats": calculate_margin_point_counts(cases),
-        "hist_teeth_per_case": get_cases_size_histogram(cases),
-        "crown_counts": get_tooth_frequency(cases),
-        "file_size_stats": calculate_file_size_stats(cases),
-        "scan_resolution_stats": calculate_scan_resolution(cases),
-        "clinical_types": calculate_case_types(cases),
-        "points_per_tooth": calculate_points_per_tooth_type(cases) 
-    }
-
-    # --- GENERATE PLOTS ---
-    print(f"Generating Plots in '{args.plots_dir}'...")
-    generate_plots(stats_payload, args.plots_dir)
-
-    # --- GENERATE REPORT ---
-    markdown_output = generate_markdown_report(stats_payload, plots_dir=args.plots_dir)
-    
-    with open(args.output, "w") as f:
-        f.write(markdown_output)
+    if args.watch:
+        watch_cases(args, tracer)
+        finish(args, tracer)
+        return
+
+    if args.from_catalog:
+        from dental_data_pipeline.src.catalog import catalog_stats
+        print(f"Calculating Statistics from catalog '{args.from_catalog}'...")
+        with tracer.span("stats"):
+            stats_payload = catalog_stats(args.from_catalog)
+    else:
+        case_dirs, cases, duplicates = ingest_cases(args, tracer)
+
+        print("Calculating Statistics...")
         
-    print(f"\nReport generated successfully: {args.output}")
-    print(f"Total Cases: {len(cases)}")
-    print("Done.")
+        with tracer.span("stats"):
+            stats_payload = compute_stats(cases)
+        if duplicates is not None:
+            stats_payload["duplicates"] = {**duplicates, "deduped": args.dedupe}
+
+        if args.catalog:
+            from dental_data_pipeline.src.catalog import build_catalog
+            with tracer.span("catalog"):
+                build_catalog(args.catalog, case_dirs, cases)
+            print(f"Catalog written: {args.catalog}")
+
+        if args.profile_cases > 0:
+            from dental_data_pipeline.src.ingest import process_case
+            from dental_data_pipeline.src.profiling import (
+                build_case_profile,
+                write_case_profile_csv,
+                dump_case_cprofiles,
+                slowest_cases_payload
+            )
+            with tracer.span("profiling"):
+                profile_rows = build_case_profile(case_dirs, cases, tracer.events)
+                write_case_profile_csv(profile_rows, args.profile_csv)
+                stats_payload["slowest_cases"] = slowest_cases_payload(profile_rows, args.profile_cases)
+            print(f"Per-case profile written: {args.profile_csv}")
+            if args.cprofile_top > 0:
+                slowest = {r["case"] for r in profile_rows[:args.cprofile_top]}
+                dumps = dump_case_cprofiles(
+                    [d for d in case_dirs if os.path.basename(d) in slowest], process_case, args.cprofile_dir
+                )
+                print(f"cProfile dumps for {len(dumps)} slowest cases written to: {args.cprofile_dir}")
+
+        if args.gallery:
+            from dental_data_pipeline.src.gallery import build_gallery
+            print(f"Rendering case thumbnails in '{args.gallery_dir}'...")
+            with tracer.span("gallery"):
+                gallery = build_gallery(
+                    case_dirs, args.gallery_dir, args.thumbnail_size, args.gallery_page_size, args.workers
+                )
+            stats_payload["gallery"] = {**gallery, "dir": args.gallery_dir}
+            print(f"Thumbnails: {gallery['rendered']} rendered, {gallery['cached']} cached, {gallery['failed']} failed")
+
+    write_outputs(stats_payload, args, tracer)
+    print(f"Total Cases: {stats_payload['total_cases']}")
+
+    finish(args, tracer)
 
 if __name__ == "__main__":
     main()
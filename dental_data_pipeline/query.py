@@ -0,0 +1,51 @@
+import argparse
+import sys
+import time
+from dental_data_pipeline.src.catalog import query_case_dirs, tooth_numbers, TOOTH_CLASSES, ARCH_QUADRANTS
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Select cases from a catalog written by main.py --catalog and emit a manifest "
+                    "(one case folder per line, as read by scripts/visualize_case.py --manifest)"
+    )
+    parser.add_argument("--catalog", type=str, default="catalog.sqlite", help="Catalog built by main.py --catalog")
+    parser.add_argument("--teeth", type=int, nargs="+", default=None, help="FDI tooth numbers, e.g. 36 46")
+    parser.add_argument("--arch", choices=list(ARCH_QUADRANTS), default=None, help="Restrict teeth to one arch")
+    parser.add_argument("--tooth-class", choices=list(TOOTH_CLASSES), default=None, help="Restrict teeth to one class")
+    parser.add_argument("--type", type=str, default=None, help="Reconstruction type, e.g. AnatomicWaxup")
+    parser.add_argument("--min-margin-points", type=int, default=None, help="Tooth has at least this many margin points")
+    parser.add_argument("--valid-training", action="store_true", help="Tooth is a valid training sample (crown, >50 points)")
+    parser.add_argument("--jaw", choices=["Upper", "Lower", "Mixed", "Unknown"], default=None, help="Case jaw type")
+    parser.add_argument("--complete", action="store_true", help="Case has no missing files")
+    parser.add_argument("--output", type=str, default=None, help="Write the manifest here (default: stdout)")
+    parser.add_argument("--count", action="store_true", help="Only print the number of matching cases")
+    args = parser.parse_args()
+
+    teeth = args.teeth
+    if args.arch or args.tooth_class:
+        selected = tooth_numbers(args.arch, args.tooth_class)
+        teeth = [t for t in teeth if t in selected] if teeth else selected
+
+    t0 = time.perf_counter()
+    case_dirs = query_case_dirs(
+        args.catalog,
+        teeth=teeth,
+        reconstruction_type=args.type,
+        min_margin_points=args.min_margin_points,
+        valid_training=args.valid_training,
+        jaw_type=args.jaw,
+        complete=args.complete,
+    )
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+
+    if args.count:
+        print(len(case_dirs))
+    elif args.output:
+        with open(args.output, "w") as f:
+            f.write("".join(f"{d}\n" for d in case_dirs))
+    else:
+        sys.stdout.write("".join(f"{d}\n" for d in case_dirs))
+    print(f"{len(case_dirs)} cases matched in {elapsed_ms:.1f} ms", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
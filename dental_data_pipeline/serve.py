@@ -0,0 +1,47 @@
+import argparse
+import os
+import sys
+import time
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Resident query service: parses the case folders once, keeps them indexed in memory "
+                    "and answers JSON requests (GET /health, /stats, /cases?teeth=36,46&type=..., /case/<name>)"
+    )
+    parser.add_argument("--data-dir", type=str, required=True, help="Path to data directory containing case folders")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Listen address (localhost only by default)")
+    parser.add_argument("--port", type=int, default=8765, help="Listen port")
+    parser.add_argument("--socket", type=str, default=None, help="Serve on this Unix socket instead of host:port")
+    parser.add_argument("--refresh-interval", type=float, default=2.0, help="Seconds between checks for new or changed case folders")
+    parser.add_argument("--watch-polling", action="store_true", help="Poll directory stats even where inotify is available")
+    parser.add_argument("--executor", choices=["thread", "process", "staged"], default="thread", help="Executor used to parse cases")
+    parser.add_argument("--workers", type=int, default=None, help="Number of case workers")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.data_dir):
+        print(f"Directory not found: {args.data_dir}")
+        sys.exit(1)
+
+    from dental_data_pipeline.src.service import CaseService, make_server
+
+    service = CaseService(args.data_dir, args.executor, args.workers, use_inotify=not args.watch_polling)
+    t0 = time.perf_counter()
+    service.load()
+    print(f"Indexed {len(service.snapshot)} cases in {time.perf_counter() - t0:.2f}s")
+    service.start_refresh(args.refresh_interval)
+
+    server = make_server(service, args.host, args.port, args.socket)
+    where = args.socket or "http://%s:%d" % server.server_address[:2]
+    print(f"Serving on {where} ({service.watcher.mode} refresh), Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if args.socket and os.path.exists(args.socket):
+            os.remove(args.socket)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+from dataclasses import dataclass
+from typing import List, Dict, Any
+import numpy as np
+from .models import Case, ReconstructionType
+from .sketches import QuantileSketch, sketch_summary, grouped_sketches, quantile_fields
+from .tracing import get_tracer
+
+# Categorical codes
+JAW_TYPES = ["Upper", "Lower", "Mixed", "Unknown"]
+RECONSTRUCTION_TYPES = list(ReconstructionType)
+
+# Completeness flags
+MISSING_LABELS = 1
+MISSING_SCANS = 2
+INCOMPLETE = 4
+
+# Tooth bitmask: FDI quadrant q and position p (both 1-8) -> bit (q - 1) * 8 + (p - 1).
+# Numbers outside 11-88 stay in the tooth columns but are left out of the masks.
+UPPER_BITS = np.uint64(0xFFFF)            # quadrants 1-2 (teeth 11-28)
+LOWER_BITS = np.uint64(0xFFFF << 16)      # quadrants 3-4 (teeth 31-48)
+# Arch neighbours: position +/- 1 within a quadrant, plus the midline pairs 11-21 and 31-41
+_NOT_LAST_POSITION = np.uint64(0x7F7F7F7F7F7F7F7F)
+_MIDLINE_PAIRS = ((0, 8), (16, 24))
+# Arch word: permanent teeth in arch order, 18..11 21..28 (bits 0-15) then 48..41 31..38 (bits 16-31)
+_REVERSE_BYTE = np.array([int(f"{b:08b}"[::-1], 2) for b in range(256)], dtype=np.uint64)
+_HAS_PREDECESSOR = np.uint64(0xFFFFFFFF & ~(1 | 1 << 16))
+_HAS_SUCCESSOR = np.uint64(0xFFFFFFFF & ~(1 << 15 | 1 << 31))
+
+@dataclass
+class CaseTable:
+    """
+    Struct-of-arrays view of a case list: one row per case (C) and CSR
+    tooth columns (T), so statistics are bit ops and bincounts over all
+    cases at once instead of loops over Tooth objects.
+    """
+    tooth_mask: np.ndarray          # (C,) uint64, FDI bitmask of the case's teeth
+    type_masks: np.ndarray          # (len(RECONSTRUCTION_TYPES), C) uint64, bitmask per type
+    jaw_code: np.ndarray            # (C,) int8 into JAW_TYPES
+    n_teeth: np.ndarray             # (C,) int32
+    flags: np.ndarray               # (C,) int8, MISSING_LABELS | MISSING_SCANS | INCOMPLETE
+    file_size_mb: np.ndarray        # (C,) float64
+    scan_vertex_count: np.ndarray   # (C,) int64
+    tooth_offsets: np.ndarray       # (C+1,) int64, case c owns teeth [offsets[c], offsets[c+1])
+    tooth_number: np.ndarray        # (T,) int16
+    tooth_bit: np.ndarray           # (T,) int8, mask bit of the tooth (-1: number has no bit)
+    tooth_type: np.ndarray          # (T,) int8 into RECONSTRUCTION_TYPES
+    margin_count: np.ndarray        # (T,) int32
+
+    def __len__(self) -> int:
+        return len(self.n_teeth)
+
+def tooth_bits(numbers: np.ndarray) -> np.ndarray:
+    """Bit index of each FDI number, -1 where it has no bit."""
+    numbers = np.asarray(numbers, dtype=np.int64)
+    quadrant, position = numbers // 10, numbers % 10
+    valid = (quadrant >= 1) & (quadrant <= 8) & (position >= 1) & (position <= 8)
+    return np.where(valid, (quadrant - 1) * 8 + position - 1, -1)
+
+def _or_per_case(values: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """Bitwise OR of the tooth values of each case (0 for cases without teeth)."""
+    out = np.zeros(len(offsets) - 1, dtype=np.uint64)
+    nonempty = offsets[:-1] < offsets[1:]
+    if values.size:
+        out[nonempty] = np.bitwise_or.reduceat(values, offsets[:-1][nonempty])
+    return out
+
+def build_case_table(cases: List[Case]) -> CaseTable:
+    """Builds the CaseTable in one pass over the cases."""
+    jaw_codes = {jaw: i for i, jaw in enumerate(JAW_TYPES)}
+    type_codes = {t: i for i, t in enumerate(RECONSTRUCTION_TYPES)}
+    unknown = jaw_codes["Unknown"]
+
+    n_teeth, jaw, flags, sizes, vertices = [], [], [], [], []
+    numbers, types, margins = [], [], []
+    for c in cases:
+        n_teeth.append(len(c.teeth))
+        jaw.append(jaw_codes.get(c.jaw_type, unknown))
+        missing = c.missing_files
+        flags.append(
+            (INCOMPLETE if missing else 0)
+            | (MISSING_LABELS if "constructionInfo" in missing else 0)
+            | (MISSING_SCANS if "scan_stl" in missing else 0)
+        )
+        sizes.append(c.file_size_mb)
+        vertices.append(c.scan_vertex_count)
+        for t in c.teeth:
+            numbers.append(t.number)
+            types.append(type_codes[t.reconstruction_type])
+            margins.append(len(t.margin_points))
+    return table_from_columns(n_teeth, jaw, flags, sizes, vertices, numbers, types, margins)
+
+def table_from_columns(
+    n_teeth, jaw_code, flags, file_size_mb, scan_vertex_count,
+    tooth_number, tooth_type, margin_count
+) -> CaseTable:
+    """
+    Builds the CaseTable from plain per-case and per-tooth columns (teeth
+    grouped by case, in case order), e.g. as read back from the catalog.
+    """
+    n_cases = len(n_teeth)
+    offsets = np.zeros(n_cases + 1, dtype=np.int64)
+    np.cumsum(n_teeth, out=offsets[1:])
+    tooth_number = np.array(tooth_number, dtype=np.int16)
+    tooth_type = np.array(tooth_type, dtype=np.int8)
+
+    bits = tooth_bits(tooth_number)
+    tooth_values = np.where(bits >= 0, np.uint64(1) << np.maximum(bits, 0).astype(np.uint64), np.uint64(0))
+    type_masks = np.stack([
+        _or_per_case(np.where(tooth_type == code, tooth_values, np.uint64(0)), offsets)
+        for code in range(len(RECONSTRUCTION_TYPES))
+    ]) if n_cases else np.zeros((len(RECONSTRUCTION_TYPES), 0), dtype=np.uint64)
+
+    return CaseTable(
+        tooth_mask=_or_per_case(tooth_values, offsets),
+        type_masks=type_masks,
+        jaw_code=np.array(jaw_code, dtype=np.int8),
+        n_teeth=np.array(n_teeth, dtype=np.int32),
+        flags=np.array(flags, dtype=np.int8),
+        file_size_mb=np.array(file_size_mb, dtype=np.float64),
+        scan_vertex_count=np.array(scan_vertex_count, dtype=np.int64),
+        tooth_offsets=offsets,
+        tooth_number=tooth_number,
+        tooth_bit=bits.astype(np.int8),
+        tooth_type=tooth_type,
+        margin_count=np.array(margin_count, dtype=np.int32),
+    )
+
+def concat_case_tables(tables: List[CaseTable]) -> CaseTable:
+    """
+    Stacks tables row-wise (cases in table order), e.g. cached per-case
+    tables, so only new or changed cases go through build_case_table.
+    """
+    if not tables:
+        return build_case_table([])
+    offsets = [np.zeros(1, dtype=np.int64)]
+    base = 0
+    for t in tables:
+        offsets.append(t.tooth_offsets[1:] + base)
+        base += int(t.tooth_offsets[-1])
+    column = lambda name: np.concatenate([getattr(t, name) for t in tables])
+    return CaseTable(
+        tooth_mask=column("tooth_mask"),
+        type_masks=np.concatenate([t.type_masks for t in tables], axis=1),
+        jaw_code=column("jaw_code"),
+        n_teeth=column("n_teeth"),
+        flags=column("flags"),
+        file_size_mb=column("file_size_mb"),
+        scan_vertex_count=column("scan_vertex_count"),
+        tooth_offsets=np.concatenate(offsets),
+        tooth_number=column("tooth_number"),
+        tooth_bit=column("tooth_bit"),
+        tooth_type=column("tooth_type"),
+        margin_count=column("margin_count"),
+    )
+
+def _popcount(x: np.ndarray) -> np.ndarray:
+    """Set bits per uint64."""
+    if hasattr(np, "bitwise_count"):  # NumPy >= 2.0
+        return np.bitwise_count(x).astype(np.int64)
+    x = x - ((x >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    x = (x & np.uint64(0x3333333333333333)) + ((x >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    x = (x + (x >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return ((x * np.uint64(0x0101010101010101)) >> np.uint64(56)).astype(np.int64)
+
+def arch_words(mask: np.ndarray) -> np.ndarray:
+    """Permanent-tooth bits of FDI masks reordered along the arches (bit i + 1 follows bit i)."""
+    byte = lambda q: (mask >> np.uint64(8 * (q - 1))) & np.uint64(0xFF)
+    return (
+        _REVERSE_BYTE[byte(1)]
+        | (byte(2) << np.uint64(8))
+        | (_REVERSE_BYTE[byte(4)] << np.uint64(16))
+        | (byte(3) << np.uint64(24))
+    )
+
+def _predecessor_present(word: np.ndarray) -> np.ndarray:
+    return (word << np.uint64(1)) & _HAS_PREDECESSOR & word
+
+# --- Case-level classification ---
+
+def classify_jaws(table: CaseTable) -> np.ndarray:
+    """Jaw codes (into JAW_TYPES) from the tooth bitmasks, as the parser assigns jaw_type."""
+    upper = (table.tooth_mask & UPPER_BITS) != 0
+    lower = (table.tooth_mask & LOWER_BITS) != 0
+    return np.select(
+        [upper & lower, upper, lower],
+        [JAW_TYPES.index("Mixed"), JAW_TYPES.index("Upper"), JAW_TYPES.index("Lower")],
+        default=JAW_TYPES.index("Unknown"),
+    ).astype(np.int8)
+
+def count_adjacency(table: CaseTable) -> np.ndarray:
+    """
+    (T,) arch neighbours of each tooth present in its case (stats.count_adjacency
+    for all cases at once). Numbers without a mask bit count no neighbours.
+    """
+    one = np.uint64(1)
+    mask = table.tooth_mask
+    # Per case: teeth whose next position is present, and teeth whose previous position
+    # (or, for 11/21/31/41, the midline partner) is present - a tooth is in each at most once
+    has_next = mask & ((mask >> one) & _NOT_LAST_POSITION)
+    has_prev = mask & ((mask & _NOT_LAST_POSITION) << one)
+    for a, b in _MIDLINE_PAIRS:
+        pair = (one << np.uint64(a)) | (one << np.uint64(b))
+        has_prev |= np.where((mask & pair) == pair, pair, np.uint64(0))
+
+    sizes = np.diff(table.tooth_offsets)
+    shift = np.maximum(table.tooth_bit, 0).astype(np.uint64)
+    count = ((np.repeat(has_next, sizes) >> shift) & one) + ((np.repeat(has_prev, sizes) >> shift) & one)
+    return np.where(table.tooth_bit >= 0, count, 0).astype(np.int64)
+
+def bridge_spans(table: CaseTable) -> Dict[str, np.ndarray]:
+    """
+    Runs of adjacent permanent teeth along each arch (11-21 and 31-41 connect).
+
+    Returns per case:
+        spans: runs of 2+ teeth
+        longest_span: teeth in the longest run (0 without teeth)
+        bridges: runs of 2+ teeth containing a pontic
+    """
+    word = arch_words(table.tooth_mask)
+    starts = word & ~_predecessor_present(word)
+    multi = starts & ((word >> np.uint64(1)) & _HAS_SUCCESSOR)
+    spans = _popcount(multi)
+
+    # Each round drops the first tooth of every run; runs of length L survive L rounds
+    longest = np.zeros(len(word), dtype=np.int64)
+    remaining = word
+    length = 0
+    while remaining.any():
+        length += 1
+        longest[remaining != 0] = length
+        remaining = _predecessor_present(remaining)
+
+    # Spread pontic bits over their whole run, then count the runs they reached
+    pontic_index = RECONSTRUCTION_TYPES.index(ReconstructionType.PONTIC)
+    reached = arch_words(table.type_masks[pontic_index]) & word
+    for _ in range(16):
+        spread = reached | (((reached << np.uint64(1)) & _HAS_PREDECESSOR) | ((reached >> np.uint64(1)) & _HAS_SUCCESSOR)) & word
+        if np.array_equal(spread, reached):
+            break
+        reached = spread
+    return {"spans": spans, "longest_span": longest, "bridges": _popcount(multi & reached)}
+
+# --- Report statistics: the single implementation behind compute_stats(), catalog_stats() and the stats module ---
+
+def calculate_completeness_stats(table: CaseTable) -> Dict[str, int]:
+    flags = table.flags
+    return {
+        "missing_labels": int(np.count_nonzero(flags & MISSING_LABELS)),
+        "missing_scans": int(np.count_nonzero(flags & MISSING_SCANS)),
+        "complete": int(np.count_nonzero((flags & INCOMPLETE) == 0)),
+    }
+
+def calculate_jaw_distribution(table: CaseTable) -> Dict[str, int]:
+    counts = np.bincount(table.jaw_code, minlength=len(JAW_TYPES))
+    return {jaw: int(counts[JAW_TYPES.index(jaw)]) for jaw in ["Upper", "Lower", "Mixed"]}
+
+def get_reconstruction_stats(table: CaseTable) -> Dict[ReconstructionType, int]:
+    """Tooth counts per type, in order of first appearance."""
+    counts = np.bincount(table.tooth_type, minlength=len(RECONSTRUCTION_TYPES))
+    present = np.flatnonzero(counts)
+    first = [int(np.argmax(table.tooth_type == code)) for code in present]
+    return {RECONSTRUCTION_TYPES[code]: int(counts[code]) for _, code in sorted(zip(first, present))}
+
+def calculate_margin_point_counts(table: CaseTable) -> Dict[str, Any]:
+    counts = table.margin_count[table.margin_count > 0]
+    if not len(counts):
+        return {"count": 0, "min": 0, "max": 0, "mean": 0}
+    return sketch_summary(QuantileSketch.of(counts))
+
+def get_cases_size_histogram(table: CaseTable) -> Dict[str, int]:
+    counts = np.bincount(np.minimum(table.n_teeth, 10), minlength=11)
+    return {
+        "1_unit": int(counts[1]),
+        "2_5_units": int(counts[2:6].sum()),
+        "6_9_units": int(counts[6:10].sum()),
+        "10_plus_units": int(counts[10]),
+    }
+
+def get_tooth_frequency(table: CaseTable) -> Dict[int, int]:
+    """Teeth per FDI number (in number order)."""
+    numbers = table.tooth_number.astype(np.int64)
+    if not len(numbers):
+        return {}
+    low = min(int(numbers.min()), 0)
+    counts = np.bincount(numbers - low)
+    return {int(n) + low: int(counts[n]) for n in np.flatnonzero(counts)}
+
+def calculate_file_size_stats(table: CaseTable) -> Dict[str, float]:
+    sizes = table.file_size_mb
+    if not len(sizes):
+        return {"mean": 0.0, "max": 0.0, "min": 0.0}
+    return sketch_summary(QuantileSketch.of(sizes))
+
+def calculate_scan_resolution(table: CaseTable) -> Dict[str, Any]:
+    resolutions = table.scan_vertex_count
+    if not len(resolutions):
+        return {"mean": 0, "max": 0}
+    sketch = QuantileSketch.of(resolutions)
+    return {**sketch_summary(sketch), "total_scanned_vertices": int(sketch.sum)}
+
+def calculate_case_types(table: CaseTable) -> Dict[str, int]:
+    """Clinical type per case with precedence Implant > Veneer > Crown > PonticOnly."""
+    has = lambda t: table.type_masks[RECONSTRUCTION_TYPES.index(t)] != 0
+    # Teeth without a mask bit still count: fall back to the per-tooth type column
+    fallback = np.zeros((len(RECONSTRUCTION_TYPES), len(table)), dtype=bool)
+    unmapped = table.tooth_bit < 0
+    if unmapped.any():
+        case_of = np.repeat(np.arange(len(table)), np.diff(table.tooth_offsets))
+        fallback[table.tooth_type[unmapped], case_of[unmapped]] = True
+    implant, veneer, crown = (
+        has(t) | fallback[RECONSTRUCTION_TYPES.index(t)]
+        for t in (ReconstructionType.IMPLANT, ReconstructionType.VENEER, ReconstructionType.CROWN)
+    )
+    kind = np.select([implant, veneer, crown], [0, 1, 2], default=3)
+    counts = np.bincount(kind, minlength=4)
+    return {name: int(n) for name, n in zip(["Implant", "Veneer", "Crown", "PonticOnly"], counts)}
+
+def calculate_points_per_tooth_type(table: CaseTable) -> Dict[int, Dict]:
+    """Margin point count stats and p50/p90/p99 per FDI number (teeth with margins, in number order)."""
+    with_margin = table.margin_count > 0
+    counts = table.margin_count[with_margin].astype(np.int64)
+    numbers = table.tooth_number[with_margin].astype(np.int64)
+    if not len(counts):
+        return {}
+    low = min(int(numbers.min()), 0)
+    numbers -= low
+    n_numbers = int(numbers.max()) + 1
+    totals = np.bincount(numbers, minlength=n_numbers)
+    sums = np.bincount(numbers, weights=counts, minlength=n_numbers)
+
+    width = int(counts.max()) + 1
+    if n_numbers * width <= 1 << 24:
+        # (number, count) histogram: min/max are the first/last filled column of each row
+        grid = np.bincount(numbers * width + counts, minlength=n_numbers * width).reshape(n_numbers, width) > 0
+        mins = np.argmax(grid, axis=1)
+        maxs = width - 1 - np.argmax(grid[:, ::-1], axis=1)
+    else:
+        order = np.argsort(numbers, kind="stable")
+        starts = np.r_[0, np.cumsum(totals)[:-1]]
+        present = totals > 0
+        mins = np.zeros(n_numbers, dtype=np.int64)
+        maxs = np.zeros(n_numbers, dtype=np.int64)
+        mins[present] = np.minimum.reduceat(counts[order], starts[present])
+        maxs[present] = np.maximum.reduceat(counts[order], starts[present])
+
+    sketches = grouped_sketches(numbers, counts)
+    # Integer sums are exact in float64, so sum / count equals np.mean of the group
+    return {
+        int(n) + low: {
+            "mean": float(sums[n] / totals[n]),
+            "min": int(mins[n]),
+            "max": int(maxs[n]),
+            "count": int(totals[n]),
+            **quantile_fields(sketches[int(n)]),
+        }
+        for n in np.flatnonzero(totals)
+    }
+
+# Payload key -> stats function name, in report order
+STATS_FUNCTIONS = {
+    "completeness": "calculate_completeness_stats",
+    "jaw_dist": "calculate_jaw_distribution",
+    "reconstruction_stats": "get_reconstruction_stats",
+    "margin_stats": "calculate_margin_point_counts",
+    "hist_teeth_per_case": "get_cases_size_histogram",
+    "crown_counts": "get_tooth_frequency",
+    "file_size_stats": "calculate_file_size_stats",
+    "scan_resolution_stats": "calculate_scan_resolution",
+    "clinical_types": "calculate_case_types",
+    "points_per_tooth": "calculate_points_per_tooth_type",
+}
+
+def table_stats(table: CaseTable) -> Dict:
+    """Statistics payload of an already built CaseTable."""
+    tracer = get_tracer()
+    payload = {"total_cases": len(table)}
+    for key, fn_name in STATS_FUNCTIONS.items():
+        with tracer.span(f"stats.{fn_name}"):
+            payload[key] = globals()[fn_name](table)
+    return payload
@@ -0,0 +1,175 @@
+import os
+import sqlite3
+from typing import Dict, List, Optional, Any, Iterable
+
+# FDI position (second digit) -> tooth class
+TOOTH_CLASSES = {
+    "incisor": (1, 2),
+    "canine": (3,),
+    "premolar": (4, 5),
+    "molar": (6, 7, 8),
+}
+ARCH_QUADRANTS = {"upper": (1, 2), "lower": (3, 4)}
+
+SCHEMA = """
+CREATE TABLE cases (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT,
+    case_dir TEXT UNIQUE,
+    jaw_type TEXT,
+    n_teeth INTEGER,
+    missing_files TEXT,
+    complete INTEGER,
+    missing_labels INTEGER,
+    missing_scans INTEGER,
+    scan_vertex_count INTEGER,
+    file_size_mb REAL
+);
+CREATE TABLE teeth (
+    rowid INTEGER PRIMARY KEY,
+    case_rowid INTEGER REFERENCES cases(rowid),
+    number INTEGER,
+    reconstruction_type TEXT,
+    margin_point_count INTEGER,
+    valid_training_sample INTEGER
+);
+CREATE INDEX idx_cases_jaw ON cases(jaw_type);
+CREATE INDEX idx_cases_complete ON cases(complete);
+CREATE INDEX idx_teeth_case ON teeth(case_rowid);
+CREATE INDEX idx_teeth_number ON teeth(number, reconstruction_type, margin_point_count);
+CREATE INDEX idx_teeth_type ON teeth(reconstruction_type);
+CREATE INDEX idx_teeth_margin ON teeth(margin_point_count);
+"""
+
+def build_catalog(path: str, case_dirs: List[str], cases: List[Any]):
+    """
+    Writes a fresh SQLite catalog of cases and teeth (cases in case_dirs order).
+    Built in a temp file and renamed, so readers never see a partial catalog.
+    Cases are fully validated (Case.validated()) before they are written.
+    """
+    tmp_path = f"{path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(SCHEMA)
+        case_rows, tooth_rows = [], []
+        for rowid, (case_dir, case) in enumerate(zip(case_dirs, cases), start=1):
+            case = case.validated()
+            missing = case.missing_files
+            case_rows.append((
+                rowid, case.id, os.path.abspath(case_dir), case.jaw_type, len(case.teeth),
+                ";".join(missing), int(not missing), int("constructionInfo" in missing),
+                int("scan_stl" in missing), case.scan_vertex_count, case.file_size_mb,
+            ))
+            for tooth in case.teeth:
+                tooth_rows.append((
+                    rowid, tooth.number, tooth.reconstruction_type.value,
+                    len(tooth.margin_points), int(tooth.is_valid_training_sample),
+                ))
+        conn.executemany("INSERT INTO cases VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", case_rows)
+        conn.executemany(
+            "INSERT INTO teeth (case_rowid, number, reconstruction_type, margin_point_count, valid_training_sample) "
+            "VALUES (?, ?, ?, ?, ?)", tooth_rows
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+
+def tooth_numbers(arch: Optional[str] = None, tooth_class: Optional[str] = None) -> List[int]:
+    """FDI numbers of permanent teeth in an arch and/or class."""
+    quadrants = ARCH_QUADRANTS[arch] if arch else (1, 2, 3, 4)
+    positions = TOOTH_CLASSES[tooth_class] if tooth_class else range(1, 9)
+    return [q * 10 + p for q in quadrants for p in positions]
+
+def query_case_dirs(
+    path: str,
+    teeth: Optional[Iterable[int]] = None,
+    reconstruction_type: Optional[str] = None,
+    min_margin_points: Optional[int] = None,
+    valid_training: bool = False,
+    jaw_type: Optional[str] = None,
+    complete: bool = False
+) -> List[str]:
+    """
+    Case folders matching all filters, sorted. Tooth filters must hold for the
+    same tooth (a case matches if any one tooth satisfies all of them).
+    """
+    where, params = [], []
+    if jaw_type:
+        where.append("c.jaw_type = ?")
+        params.append(jaw_type)
+    if complete:
+        where.append("c.complete = 1")
+
+    tooth_where = []
+    if teeth is not None:
+        teeth = list(teeth)
+        tooth_where.append(f"t.number IN ({', '.join('?' * len(teeth))})")
+        params.extend(teeth)
+    if reconstruction_type:
+        tooth_where.append("t.reconstruction_type = ?")
+        params.append(reconstruction_type)
+    if min_margin_points is not None:
+        tooth_where.append("t.margin_point_count >= ?")
+        params.append(min_margin_points)
+    if valid_training:
+        tooth_where.append("t.valid_training_sample = 1")
+    if tooth_where:
+        where.append(
+            "EXISTS (SELECT 1 FROM teeth t WHERE t.case_rowid = c.rowid AND " + " AND ".join(tooth_where) + ")"
+        )
+
+    sql = "SELECT c.case_dir FROM cases c"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY c.case_dir"
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        return [row[0] for row in conn.execute(sql, params)]
+    finally:
+        conn.close()
+
+def catalog_table(path: str):
+    """Reads the catalog back into a CaseTable (cases in catalog order)."""
+    from .case_table import (
+        table_from_columns, JAW_TYPES, RECONSTRUCTION_TYPES, MISSING_LABELS, MISSING_SCANS, INCOMPLETE
+    )
+    from .models import ReconstructionType
+
+    jaw_codes = {jaw: i for i, jaw in enumerate(JAW_TYPES)}
+    type_codes = {t.value: i for i, t in enumerate(RECONSTRUCTION_TYPES)}
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        cases = conn.execute(
+            "SELECT n_teeth, jaw_type, complete, missing_labels, missing_scans, file_size_mb, scan_vertex_count "
+            "FROM cases ORDER BY rowid"
+        ).fetchall()
+        teeth = conn.execute(
+            "SELECT number, reconstruction_type, margin_point_count FROM teeth ORDER BY case_rowid, rowid"
+        ).fetchall()
+    finally:
+        conn.close()
+
+    unknown = jaw_codes["Unknown"]
+    # Unknown type strings map to OTHER, as ReconstructionType does when parsing
+    other = type_codes[ReconstructionType.OTHER.value]
+    return table_from_columns(
+        n_teeth=[c[0] for c in cases],
+        jaw_code=[jaw_codes.get(c[1], unknown) for c in cases],
+        flags=[
+            (0 if complete else INCOMPLETE) | (MISSING_LABELS if labels else 0) | (MISSING_SCANS if scans else 0)
+            for _, _, complete, labels, scans, _, _ in cases
+        ],
+        file_size_mb=[c[5] for c in cases],
+        scan_vertex_count=[c[6] for c in cases],
+        tooth_number=[t[0] for t in teeth],
+        tooth_type=[type_codes.get(t[1], other) for t in teeth],
+        margin_count=[t[2] for t in teeth],
+    )
+
+def catalog_stats(path: str) -> Dict[str, Any]:
+    """The compute_stats() payload, computed from the catalog instead of the XML."""
+    from .case_table import table_stats
+    return table_stats(catalog_table(path))
@@ -0,0 +1,179 @@
+import hashlib
+import os
+import sqlite3
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Any
+
+# Bytes hashed at the start, middle and end of a file by the sampled hash
+SAMPLE_BLOCK = 64 * 1024
+FULL_CHUNK = 1024 * 1024
+
+# File suffix -> kind; only these files take part in duplicate detection
+FILE_KINDS = {
+    ".stl": "stl",
+    ".dentalProject": "dentalProject",
+    ".constructionInfo": "constructionInfo",
+}
+
+class DedupIndex:
+    """
+    Persistent cache of file hashes (SQLite), keyed by path and invalidated
+    by size or mtime changes, so re-runs only hash new or edited files.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.conn = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, sample_hash TEXT, full_hash TEXT)"
+        )
+
+    def get(self, path: str, size: int, mtime_ns: int) -> Tuple[Optional[str], Optional[str]]:
+        """(sample_hash, full_hash) cached for this file version, None where unknown."""
+        row = self.conn.execute(
+            "SELECT size, mtime_ns, sample_hash, full_hash FROM files WHERE path = ?", (path,)
+        ).fetchone()
+        if row is None or row[0] != size or row[1] != mtime_ns:
+            return None, None
+        return row[2], row[3]
+
+    def put(self, path: str, size: int, mtime_ns: int, sample: Optional[str], full: Optional[str]):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)", (path, size, mtime_ns, sample, full)
+        )
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+def sample_hash(path: str, size: int, block: int = SAMPLE_BLOCK) -> str:
+    """Hash of the size plus the first, middle and last block (whole file if small)."""
+    h = hashlib.blake2b(str(size).encode(), digest_size=16)
+    with open(path, "rb") as f:
+        if size <= 3 * block:
+            h.update(f.read())
+        else:
+            for offset in (0, size // 2 - block // 2, size - block):
+                f.seek(offset)
+                h.update(f.read(block))
+    return h.hexdigest()
+
+def full_hash(path: str, chunk: int = FULL_CHUNK) -> str:
+    """Streaming hash of the whole file."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while True:
+            data = f.read(chunk)
+            if not data:
+                break
+            h.update(data)
+    return h.hexdigest()
+
+def list_case_files(case_dir: str) -> List[Dict[str, Any]]:
+    """STL/XML files of one case folder with kind, size and mtime."""
+    files = []
+    try:
+        entries = list(os.scandir(case_dir))
+    except OSError:
+        return files
+    for entry in entries:
+        kind = FILE_KINDS.get(os.path.splitext(entry.name)[1])
+        if kind is None or not entry.is_file():
+            continue
+        st = entry.stat()
+        files.append({"path": entry.path, "kind": kind, "size": st.st_size, "mtime_ns": st.st_mtime_ns})
+    return files
+
+def _collisions(files: List[Dict[str, Any]], key: str) -> List[List[Dict[str, Any]]]:
+    """Groups of 2+ files sharing (kind, key)."""
+    groups = defaultdict(list)
+    for f in files:
+        groups[(f["kind"], f[key])].append(f)
+    return [g for g in groups.values() if len(g) > 1]
+
+def find_duplicates(case_dirs: List[str], index_path: Optional[str] = None, workers: int = 8) -> Dict[str, Any]:
+    """
+    Fingerprints the STL and XML files of all cases in three rounds: size,
+    then a sampled-block hash for size collisions, then a full streaming hash
+    for sample collisions. Hashes persist in the SQLite index at index_path.
+
+    Returns:
+        scan_groups: case names sharing identical scan (STL) content
+        case_groups: case names whose files are all identical
+        unique_case_dirs: case_dirs with later duplicate scans dropped
+        dropped: number of case_dirs left out of unique_case_dirs
+        sample_hashed / full_hashed: files hashed in this run (cache misses)
+    """
+    index = DedupIndex(index_path)
+    case_names = {d: os.path.basename(d) for d in case_dirs}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        listed = list(pool.map(list_case_files, case_dirs))
+    files = []
+    for case_dir, case_files in zip(case_dirs, listed):
+        for f in case_files:
+            f["case_dir"] = case_dir
+            files.append(f)
+
+    counters = {"sample_hashed": 0, "full_hashed": 0}
+
+    def compute(f, which):
+        if which == "sample":
+            f["sample"] = sample_hash(f["path"], f["size"])
+            # Small files are hashed whole by the sample hash
+            if f["size"] <= 3 * SAMPLE_BLOCK:
+                f["full"] = f["sample"]
+        else:
+            f["full"] = full_hash(f["path"])
+
+    def fill(pool, group_files, which):
+        # Cache lookups stay on this thread (one SQLite connection); only misses are hashed
+        misses = []
+        for f in group_files:
+            cached_sample, cached_full = index.get(f["path"], f["size"], f["mtime_ns"])
+            f["sample"] = f.get("sample") or cached_sample
+            f["full"] = f.get("full") or cached_full
+            if f[which] is None:
+                misses.append(f)
+        list(pool.map(lambda f: compute(f, which), misses))
+        counters[f"{which}_hashed"] += len(misses)
+
+    try:
+        candidates = [f for g in _collisions(files, "size") for f in g]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            fill(pool, candidates, "sample")
+            fill(pool, [f for g in _collisions(candidates, "sample") for f in g], "full")
+        for f in candidates:
+            index.put(f["path"], f["size"], f["mtime_ns"], f["sample"], f["full"])
+    finally:
+        index.close()
+
+    # Content identity: equal full hashes mean equal content; files never needing one are unique
+    for f in files:
+        full = f.get("full")
+        f["identity"] = f"{f['kind']}:{full}" if full else f"unique:{f['path']}"
+
+    scan_keys, case_keys = {}, {}
+    for case_dir, case_files in zip(case_dirs, listed):
+        stls = sorted(f["identity"] for f in case_files if f["kind"] == "stl")
+        scan_keys[case_dir] = tuple(stls) if stls else None
+        case_keys[case_dir] = tuple(sorted(f["identity"] for f in case_files)) or None
+
+    def groups_of(keys):
+        groups = defaultdict(list)
+        for case_dir in case_dirs:
+            if keys[case_dir] is not None:
+                groups[keys[case_dir]].append(case_names[case_dir])
+        return sorted(sorted(g) for g in groups.values() if len(g) > 1)
+
+    scan_groups = groups_of(scan_keys)
+    # Keep the first case (by name) of each duplicate scan group
+    dropped = {name for group in scan_groups for name in group[1:]}
+    return {
+        "scan_groups": scan_groups,
+        "dropped": len(dropped),
+        "case_groups": groups_of(case_keys),
+        "unique_case_dirs": [d for d in case_dirs if case_names[d] not in dropped],
+        "files": len(files),
+        **counters,
+    }
@@ -0,0 +1,156 @@
+import hashlib
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+# Bump when thumbnail rendering changes so every cached thumbnail is redrawn
+THUMBNAIL_VERSION = 1
+# Only these inputs change a thumbnail
+THUMBNAIL_INPUTS = (".stl", ".constructionInfo")
+THUMBS_DIR = "thumbs"
+COLUMNS = 4
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "scripts")
+
+def case_fingerprint(case_dir: str, size: int) -> str:
+    """
+    Key of a case's thumbnail: names, sizes and mtimes of its STL and
+    constructionInfo files plus the render settings (no file contents are read).
+    """
+    h = hashlib.blake2b(f"v{THUMBNAIL_VERSION}:{size}".encode(), digest_size=8)
+    for name in sorted(os.listdir(case_dir)):
+        if name.endswith(THUMBNAIL_INPUTS):
+            st = os.stat(os.path.join(case_dir, name))
+            h.update(f"|{name}:{st.st_size}:{st.st_mtime_ns}".encode())
+    return h.hexdigest()
+
+def render_thumbnail_file(case_dir: str, path: str, size: int) -> Optional[str]:
+    """
+    Worker: renders one case thumbnail to path (written atomically).
+    Returns None on success, else the error message.
+    """
+    if SCRIPTS_DIR not in sys.path:
+        sys.path.insert(0, SCRIPTS_DIR)
+    tmp = path + ".tmp"
+    try:
+        from render_utils import render_case_thumbnail, write_png
+        write_png(tmp, render_case_thumbnail(case_dir, size))
+        os.replace(tmp, path)
+        return None
+    except Exception as e:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return f"{type(e).__name__}: {e}"
+
+def _existing_thumbnails(thumbs_dir: str) -> Dict[str, List[str]]:
+    """Case name -> thumbnail file names currently in thumbs_dir."""
+    existing: Dict[str, List[str]] = {}
+    for name in os.listdir(thumbs_dir):
+        if name.endswith(".png"):
+            existing.setdefault(name[:-4].rsplit("-", 1)[0], []).append(name)
+    return existing
+
+def build_gallery(
+    case_dirs: List[str],
+    gallery_dir: str,
+    size: int = 128,
+    page_size: int = 100,
+    workers: Optional[int] = None
+) -> Dict:
+    """
+    Renders missing or outdated case thumbnails in a process pool and writes
+    the paginated gallery pages. A thumbnail file is named after the case and
+    its fingerprint, so unchanged cases are never re-rendered; thumbnails of
+    outdated fingerprints and of cases no longer in case_dirs are deleted.
+
+    Returns the "gallery" payload used by the report: page file names
+    (relative to gallery_dir), page size, case count and rendered / cached /
+    failed counts.
+    """
+    thumbs_dir = os.path.join(gallery_dir, THUMBS_DIR)
+    os.makedirs(thumbs_dir, exist_ok=True)
+    existing = _existing_thumbnails(thumbs_dir)
+
+    case_dirs = sorted(case_dirs, key=os.path.basename)
+    entries: List[Tuple[str, str]] = []
+    todo: List[Tuple[str, str]] = []
+    for case_dir in case_dirs:
+        case_name = os.path.basename(case_dir)
+        file_name = f"{case_name}-{case_fingerprint(case_dir, size)}.png"
+        entries.append((case_name, file_name))
+        stale = [n for n in existing.get(case_name, []) if n != file_name]
+        for name in stale:
+            os.remove(os.path.join(thumbs_dir, name))
+        if file_name not in existing.get(case_name, []):
+            todo.append((case_dir, os.path.join(thumbs_dir, file_name)))
+    # Thumbnails of deleted or renamed case folders
+    current = {case_name for case_name, _ in entries}
+    for case_name, names in existing.items():
+        if case_name not in current:
+            for name in names:
+                os.remove(os.path.join(thumbs_dir, name))
+
+    failed: Dict[str, str] = {}
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            errors = pool.map(
+                render_thumbnail_file,
+                [d for d, _ in todo], [p for _, p in todo], [size] * len(todo),
+                chunksize=max(1, len(todo) // ((workers or os.cpu_count() or 1) * 4))
+            )
+            for (case_dir, _), error in zip(todo, errors):
+                if error is not None:
+                    failed[os.path.basename(case_dir)] = error
+
+    pages = write_gallery_pages(entries, gallery_dir, page_size, failed)
+    return {
+        "pages": pages,
+        "page_size": page_size,
+        "cases": len(entries),
+        "rendered": len(todo) - len(failed),
+        "cached": len(entries) - len(todo),
+        "failed": len(failed),
+    }
+
+def write_gallery_pages(
+    entries: List[Tuple[str, str]],
+    gallery_dir: str,
+    page_size: int = 100,
+    failed: Optional[Dict[str, str]] = None
+) -> List[str]:
+    """
+    Writes page_NNNN.md files of page_size thumbnails each (a COLUMNS-wide
+    table with previous/next links). Returns the page file names.
+    """
+    failed = failed or {}
+    chunks = [entries[i:i + page_size] for i in range(0, len(entries), page_size)]
+    pages = [f"page_{i + 1:04d}.md" for i in range(len(chunks))]
+    for i, chunk in enumerate(chunks):
+        lines = [f"# Case Gallery ({i + 1}/{len(chunks)})", ""]
+        nav = []
+        if i > 0:
+            nav.append(f"[Previous]({pages[i - 1]})")
+        if i + 1 < len(chunks):
+            nav.append(f"[Next]({pages[i + 1]})")
+        if nav:
+            lines += [" | ".join(nav), ""]
+        lines.append("|" + " |" * COLUMNS)
+        lines.append("|" + "---|" * COLUMNS)
+        for row in range(0, len(chunk), COLUMNS):
+            cells = []
+            for case_name, file_name in chunk[row:row + COLUMNS]:
+                if case_name in failed:
+                    cells.append(f"{case_name}<br>_render failed: {failed[case_name].replace('|', '/')}_")
+                else:
+                    cells.append(f"![{case_name}]({THUMBS_DIR}/{file_name})<br>{case_name}")
+            cells += [""] * (COLUMNS - len(cells))
+            lines.append("| " + " | ".join(cells) + " |")
+        with open(os.path.join(gallery_dir, pages[i]), "w") as f:
+            f.write("\n".join(lines) + "\n")
+
+    # Pages left over from a larger earlier run
+    for name in os.listdir(gallery_dir):
+        if name.startswith("page_") and name.endswith(".md") and name not in pages:
+            os.remove(os.path.join(gallery_dir, name))
+    return pages
@@ -0,0 +1,201 @@
+import glob
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from functools import partial
+from typing import List, Optional
+from .models import Case
+from .parsers import parse_dental_project_bytes, parse_construction_info_bytes
+from .tracing import get_tracer, run_traced
+
+@dataclass
+class RawCase:
+    """Raw inputs of one case folder, as read by the I/O stage."""
+    case_name: str
+    project_stem: Optional[str] = None          # None: no .dentalProject in the folder
+    project_data: Optional[bytes] = None        # None with a stem: unreadable
+    has_construction: bool = False
+    construction_data: Optional[bytes] = None
+    has_stl: bool = False
+    stl_size: Optional[int] = None              # None with has_stl: stat failed
+
+def _read_bytes(path: str) -> Optional[bytes]:
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+def read_case(case_dir: str) -> RawCase:
+    """
+    I/O stage: lists the case folder, reads the XML files and stats the STLs.
+    """
+    tracer = get_tracer()
+    case_name = os.path.basename(case_dir)
+    with tracer.span("case.glob", case=case_name):
+        dental_project_files = glob.glob(os.path.join(case_dir, "*.dentalProject"))
+        construction_files = glob.glob(os.path.join(case_dir, "*.constructionInfo"))
+        stl_files = glob.glob(os.path.join(case_dir, "*.stl"))
+
+    raw = RawCase(case_name=case_name)
+    if not dental_project_files:
+        return raw
+
+    with tracer.span("case.read", case=case_name):
+        raw.project_stem = os.path.splitext(os.path.basename(dental_project_files[0]))[0]
+        raw.project_data = _read_bytes(dental_project_files[0])
+        if construction_files:
+            raw.has_construction = True
+            raw.construction_data = _read_bytes(construction_files[0])
+
+    if stl_files:
+        raw.has_stl = True
+        try:
+            with tracer.span("case.stl_stat", case=case_name):
+                raw.stl_size = sum(os.path.getsize(f) for f in stl_files)
+        except OSError:
+            pass
+    return raw
+
+def parse_case(raw: RawCase) -> Case:
+    """
+    CPU stage: builds the Case from in-memory file contents.
+    """
+    tracer = get_tracer()
+    case_name = raw.case_name
+    if raw.project_stem is None:
+        return Case(id=case_name, missing_files=["dentalProject"])
+
+    margins = {}
+    if raw.has_construction:
+        with tracer.span("case.parse_construction_info", case=case_name):
+            margins = parse_construction_info_bytes(raw.construction_data) if raw.construction_data else {}
+
+    try:
+        with tracer.span("case.parse_dental_project", case=case_name):
+            if raw.project_data is None:
+                raise ValueError(f"Unreadable: {case_name}")
+            case = parse_dental_project_bytes(raw.project_data, raw.project_stem, margins)
+    except Exception:
+        return Case(id=case_name, missing_files=["dentalProject_corrupt"])
+
+    if not raw.has_construction:
+        case.missing_files.append("constructionInfo")
+
+    if not raw.has_stl:
+        case.missing_files.append("scan_stl")
+    elif raw.stl_size is not None:
+        case.file_size_mb = raw.stl_size / (1024 * 1024)
+
+    return case
+
+def run_staged(
+    case_dirs: List[str],
+    io_workers: int = 8,
+    cpu_workers: Optional[int] = None,
+    queue_size: int = 64
+) -> List[Case]:
+    """
+    Staged ingest: io_workers threads read raw bytes into a bounded queue, a
+    process pool of cpu_workers parses them, and the calling thread aggregates.
+    The queue and the in-flight limit bound memory; results keep case_dirs order.
+    """
+    tracer = get_tracer()
+    cpu_workers = cpu_workers or os.cpu_count() or 1
+    raw_queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+    indices = iter(range(len(case_dirs)))
+    indices_lock = threading.Lock()
+
+    def reader():
+        while True:
+            with indices_lock:
+                index = next(indices, None)
+            if index is None:
+                return
+            try:
+                raw_queue.put((index, read_case(case_dirs[index])))
+            except Exception as e:
+                raw_queue.put((index, e))
+
+    readers = [threading.Thread(target=reader, daemon=True) for _ in range(max(1, io_workers))]
+    for thread in readers:
+        thread.start()
+
+    worker = partial(run_traced, parse_case, trace_memory=tracer.trace_memory) if tracer.enabled else parse_case
+    # Enough parse tasks queued to keep every CPU worker busy, without draining the I/O queue
+    max_in_flight = cpu_workers * 2
+    results: List[Optional[Case]] = [None] * len(case_dirs)
+
+    def collect(done):
+        for future in done:
+            result = future.result()
+            if tracer.enabled:
+                result, events = result
+                tracer.merge(events)
+            results[future.index] = result
+
+    with ProcessPoolExecutor(max_workers=cpu_workers) as pool:
+        in_flight = set()
+        for _ in range(len(case_dirs)):
+            index, raw = raw_queue.get()
+            if isinstance(raw, Exception):
+                raise raw
+            future = pool.submit(worker, raw)
+            future.index = index
+            in_flight.add(future)
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+        collect(wait(in_flight)[0])
+
+    for thread in readers:
+        thread.join()
+    return results
+
+def process_case(case_dir: str) -> Case:
+    """
+    Worker function to process a single case folder.
+    """
+    tracer = get_tracer()
+    with tracer.span("process_case", case=os.path.basename(case_dir)):
+        return parse_case(read_case(case_dir))
+
+def find_case_dirs(data_dir: str) -> List[str]:
+    """Lists the case folders directly under data_dir."""
+    all_items = [os.path.join(data_dir, d) for d in os.listdir(data_dir)]
+    return [d for d in all_items if os.path.isdir(d)]
+
+def process_cases(
+    case_dirs: List[str],
+    executor: str = "thread",
+    workers: Optional[int] = None,
+    io_workers: int = 8,
+    queue_size: int = 64
+) -> List[Case]:
+    """
+    Runs process_case over all case folders.
+    executor="thread" suits I/O-bound storage, "process" sidesteps the GIL for XML parsing,
+    "staged" overlaps both: io_workers reader threads feed `workers` parser processes.
+    """
+    if executor == "staged":
+        return run_staged(case_dirs, io_workers=io_workers, cpu_workers=workers, queue_size=queue_size)
+
+    if executor == "process":
+        n_workers = workers or os.cpu_count() or 1
+        chunksize = max(1, len(case_dirs) // (n_workers * 4))
+        tracer = get_tracer()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            if not tracer.enabled:
+                return list(pool.map(process_case, case_dirs, chunksize=chunksize))
+            worker = partial(run_traced, process_case, trace_memory=tracer.trace_memory)
+            cases = []
+            for case, events in pool.map(worker, case_dirs, chunksize=chunksize):
+                tracer.merge(events)
+                cases.append(case)
+            return cases
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(process_case, case_dirs)
+        return list(results)
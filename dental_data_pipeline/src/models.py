@@ -3,6 +3,9 @@ from pydantic import BaseModel, Field
 from typing import List, Tuple, Optional
 from enum import Enum
 
+# Minimum margin points of a crown to be a valid training sample
+VALID_TRAINING_MIN_POINTS = 51
+
 class ReconstructionType(str, Enum):
     CROWN = "AnatomicWaxup"
     PONTIC = "WaxupPontic"
@@ -20,10 +23,31 @@ class Tooth(BaseModel):
     reconstruction_type: ReconstructionType
     margin_points: List[Tuple[float, float, float]] = Field(default_factory=list)
 
+    @classmethod
+    def trusted(
+        cls,
+        number: int,
+        reconstruction_type: ReconstructionType,
+        margin_points: Optional[List[Tuple[float, float, float]]] = None
+    ) -> "Tooth":
+        """
+        Fast path for parser output: validates the scalar fields but attaches
+        margin_points as-is, skipping per-point validation. Data leaving the
+        pipeline (catalog rows) goes through Case.validated().
+        (model_construct is slower here: it re-inspects default factories per call.)
+        """
+        tooth = cls(number=number, reconstruction_type=reconstruction_type)
+        if margin_points:
+            tooth.margin_points = margin_points
+        return tooth
+
     @property
     def is_valid_training_sample(self) -> bool:
         """Returns True if it's a Crown and has >50 margin points."""
-        return self.reconstruction_type == ReconstructionType.CROWN and len(self.margin_points) > 50
+        return (
+            self.reconstruction_type == ReconstructionType.CROWN
+            and len(self.margin_points) >= VALID_TRAINING_MIN_POINTS
+        )
 
 class Case(BaseModel):
     id: str
@@ -32,3 +56,7 @@ class Case(BaseModel):
     missing_files: List[str] = Field(default_factory=list) # e.g. ["constructionInfo", "scan_stl"]
     scan_vertex_count: int = 0
     file_size_mb: float = 0.0
+
+    def validated(self) -> "Case":
+        """Fully re-validated copy, including every margin point (for data leaving the pipeline)."""
+        return type(self).model_validate(self.model_dump(warnings=False))
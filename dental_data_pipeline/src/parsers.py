@@ -12,9 +12,16 @@ def get_xml_root(file_path: str) -> Optional[ET.Element]:
     except (ET.ParseError, FileNotFoundError):
         return None
 
-def parse_dental_project(path: str) -> Case:
+def get_xml_root_from_bytes(data: bytes) -> Optional[ET.Element]:
+    try:
+        return ET.fromstring(data)
+    except ET.ParseError:
+        return None
+
+def parse_dental_project(path: str, margins: Optional[Dict[int, List[Tuple[float, float, float]]]] = None) -> Case:
     """
     Parses a .dentalProject file to extract Case metadata and Tooth definitions.
+    margins ({tooth_number: points}, from parse_construction_info) are attached as the teeth are built.
     """
     if not os.path.exists(path):
         raise FileNotFoundError(f"File not found: {path}")
@@ -26,7 +33,32 @@ def parse_dental_project(path: str) -> Case:
     # Extract Case ID from filename or XML
     # Usually filename is "ProjectName.dentalProject"
     case_id = Path(path).stem
+    return case_from_project_root(root, case_id, margins)
+
+def parse_dental_project_bytes(
+    data: bytes,
+    case_id: str,
+    margins: Optional[Dict[int, List[Tuple[float, float, float]]]] = None
+) -> Case:
+    """
+    Same as parse_dental_project, from file contents already in memory.
+    """
+    root = get_xml_root_from_bytes(data)
+    if root is None:
+        raise ValueError(f"Invalid XML: {case_id}")
+    return case_from_project_root(root, case_id, margins)
 
+def case_from_project_root(
+    root: ET.Element,
+    case_id: str,
+    margins: Optional[Dict[int, List[Tuple[float, float, float]]]] = None
+) -> Case:
+    """
+    Builds the Case from a parsed .dentalProject root, with each tooth's margin
+    points (if any) attached at construction. Parser output is trusted:
+    margins skip per-point validation (see Case.validated()).
+    """
+    margins = margins or {}
     teeth_list = []
     
     # <Teeth> <Tooth> ... </Tooth> </Teeth>
@@ -47,8 +79,7 @@ def parse_dental_project(path: str) -> Case:
                     except ValueError:
                         rec_type = ReconstructionType.OTHER
 
-                    # We initialize with empty margin points; those come from ConstructionInfo
-                    teeth_list.append(Tooth(number=t_num, reconstruction_type=rec_type))
+                    teeth_list.append(Tooth.trusted(t_num, rec_type, margins.get(t_num)))
             except (ValueError, AttributeError):
                 continue
 
@@ -78,7 +109,21 @@ def parse_construction_info(path: str) -> Dict[int, List[Tuple[float, float, flo
     root = get_xml_root(path)
     if root is None:
         return {}
+    return margins_from_root(root)
+
+def parse_construction_info_bytes(data: bytes) -> Dict[int, List[Tuple[float, float, float]]]:
+    """
+    Same as parse_construction_info, from file contents already in memory.
+    """
+    root = get_xml_root_from_bytes(data)
+    if root is None:
+        return {}
+    return margins_from_root(root)
 
+def margins_from_root(root: ET.Element) -> Dict[int, List[Tuple[float, float, float]]]:
+    """
+    Extracts {tooth_number: [(x,y,z), ...]} from a parsed .constructionInfo root.
+    """
     margins = {}
     
     teeth_node = root.find("Teeth")
@@ -0,0 +1,119 @@
+import cProfile
+import csv
+import os
+import pstats
+from typing import Callable, Dict, List, Any
+from .models import Case
+from .tracing import Tracer, set_tracer
+
+# process_case sub-span -> per-case CSV column
+STAGE_COLUMNS = {
+    "case.glob": "glob_s",
+    "case.read": "read_s",
+    "case.parse_dental_project": "xml_parse_s",
+    "case.parse_construction_info": "margin_parse_s",
+    "case.stl_stat": "stl_stat_s",
+}
+
+# File suffix -> per-case CSV size column
+SIZE_COLUMNS = {
+    ".dentalProject": "dental_project_bytes",
+    ".constructionInfo": "construction_info_bytes",
+    ".stl": "stl_bytes",
+}
+
+PROFILE_COLUMNS = (
+    ["case", "total_s"] + list(STAGE_COLUMNS.values()) + list(SIZE_COLUMNS.values())
+    + ["teeth", "margin_points", "missing_files"]
+)
+
+def case_timings(events: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """Groups traced process_case spans by case name: {case: {total_s, glob_s, ...}}."""
+    timings: Dict[str, Dict[str, float]] = {}
+    for e in events:
+        case_name = e["attrs"].get("case")
+        if case_name is None:
+            continue
+        column = "total_s" if e["name"] == "process_case" else STAGE_COLUMNS.get(e["name"])
+        if column is None:
+            continue
+        row = timings.setdefault(case_name, {})
+        row[column] = row.get(column, 0.0) + e["dur_ns"] / 1e9
+    # The staged executor has no enclosing process_case span: total = stage time
+    for row in timings.values():
+        if "total_s" not in row:
+            row["total_s"] = sum(row.values())
+    return timings
+
+def input_sizes(case_dir: str) -> Dict[str, int]:
+    """Total bytes per input kind in a case folder."""
+    sizes = dict.fromkeys(SIZE_COLUMNS.values(), 0)
+    try:
+        entries = list(os.scandir(case_dir))
+    except OSError:
+        return sizes
+    for entry in entries:
+        column = SIZE_COLUMNS.get(os.path.splitext(entry.name)[1])
+        if column is not None and entry.is_file():
+            sizes[column] += entry.stat().st_size
+    return sizes
+
+def build_case_profile(case_dirs: List[str], cases: List[Case], events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    One row per case (PROFILE_COLUMNS), slowest first.
+    cases must be in case_dirs order, as process_cases returns them.
+    """
+    timings = case_timings(events)
+    rows = []
+    for case_dir, case in zip(case_dirs, cases):
+        name = os.path.basename(case_dir)
+        row = {column: 0.0 for column in ["total_s"] + list(STAGE_COLUMNS.values())}
+        row.update(timings.get(name, {}))
+        row.update(input_sizes(case_dir))
+        row["case"] = name
+        row["teeth"] = len(case.teeth)
+        row["margin_points"] = sum(len(t.margin_points) for t in case.teeth)
+        row["missing_files"] = ";".join(case.missing_files)
+        rows.append(row)
+    rows.sort(key=lambda r: r["total_s"], reverse=True)
+    return rows
+
+def write_case_profile_csv(rows: List[Dict[str, Any]], path: str):
+    """Full per-case profile as CSV."""
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=PROFILE_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def dump_case_cprofiles(case_dirs: List[str], process_fn: Callable[[str], Case], output_dir: str) -> List[str]:
+    """
+    Re-runs process_fn on each case under cProfile and writes <case>.prof plus a
+    <case>.txt cumulative-time listing. Note the re-run sees a warm page cache.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    # Keep the re-runs out of the main trace
+    previous = set_tracer(Tracer(enabled=False))
+    paths = []
+    try:
+        for case_dir in case_dirs:
+            name = os.path.basename(case_dir)
+            profiler = cProfile.Profile()
+            profiler.runcall(process_fn, case_dir)
+            prof_path = os.path.join(output_dir, f"{name}.prof")
+            profiler.dump_stats(prof_path)
+            with open(os.path.join(output_dir, f"{name}.txt"), "w") as f:
+                pstats.Stats(profiler, stream=f).sort_stats("cumulative").print_stats(25)
+            paths.append(prof_path)
+    finally:
+        set_tracer(previous)
+    return paths
+
+def slowest_cases_payload(rows: List[Dict[str, Any]], n: int) -> Dict[str, Any]:
+    """Report payload: the n slowest rows and their share of total case time."""
+    total = sum(r["total_s"] for r in rows)
+    top = rows[:n]
+    return {
+        "rows": top,
+        "share": sum(r["total_s"] for r in top) / total if total > 0 else 0.0,
+        "total_s": total,
+    }
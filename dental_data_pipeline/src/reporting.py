@@ -1,11 +1,24 @@
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import os
 
-def generate_markdown_report(stats: Dict[str, Any], plots_dir: str = "plots") -> str:
+def _percentile_line(dist: Dict[str, Any], fmt: str = ".0f") -> str:
+    return ", ".join(f"{k}: {dist[k]:{fmt}}" for k in ("p50", "p90", "p99") if k in dist)
+
+def _histogram_table(histogram: List, fmt: str = ".0f", width: int = 30) -> List[str]:
+    """Markdown table of [lo, hi, count] bins with a bar per bin."""
+    if not histogram:
+        return []
+    peak = max(count for _, _, count in histogram) or 1
+    lines = ["| Range | Count | |", "|---|---|---|"]
+    for lo, hi, count in histogram:
+        lines.append(f"| {lo:{fmt}} - {hi:{fmt}} | {count} | {'#' * round(width * count / peak)} |")
+    return lines
+
+def generate_markdown_report(stats: Dict[str, Any], plots_dir: Optional[str] = "plots") -> str:
     """
     Generates a comprehensive Markdown report from statistics dictionary.
-    Includes links to plots generated in plots_dir.
+    Includes links to plots generated in plots_dir (omitted when plots_dir is None).
     """
     
     report = ["# Dental Data Analysis Report", ""]
@@ -25,7 +38,8 @@ def generate_markdown_report(stats: Dict[str, Any], plots_dir: str = "plots") ->
     jaws = stats.get("jaw_dist", {})
     if jaws:
         report.append("\n## Jaw Distribution")
-        report.append(f"![Jaw Distribution]({plots_dir}/jaw_distribution.png)")
+        if plots_dir:
+            report.append(f"![Jaw Distribution]({plots_dir}/jaw_distribution.png)")
         for k, v in jaws.items():
             report.append(f"- **{k}**: {v}")
 
@@ -33,7 +47,8 @@ def generate_markdown_report(stats: Dict[str, Any], plots_dir: str = "plots") ->
     rec = stats.get("reconstruction_stats", {})
     if rec:
         report.append("\n## Reconstruction Types (Tooth Level)")
-        report.append(f"![Reconstruction Types]({plots_dir}/reconstruction_types.png)")
+        if plots_dir:
+            report.append(f"![Reconstruction Types]({plots_dir}/reconstruction_types.png)")
         for k, v in rec.items():
             report.append(f"- {k}: {v}")
 
@@ -41,7 +56,8 @@ def generate_markdown_report(stats: Dict[str, Any], plots_dir: str = "plots") ->
     clin = stats.get("clinical_types", {})
     if clin:
         report.append("\n## Clinical Case Classification")
-        report.append(f"![Clinical Case Types]({plots_dir}/clinical_case_types.png)")
+        if plots_dir:
+            report.append(f"![Clinical Case Types]({plots_dir}/clinical_case_types.png)")
         for k, v in clin.items():
             if v > 0:
                 report.append(f"- **{k}**: {v}")
@@ -53,12 +69,27 @@ def generate_markdown_report(stats: Dict[str, Any], plots_dir: str = "plots") ->
         report.append(f"- Mean Points: {margins.get('mean', 0):.1f}")
         report.append(f"- Min Points: {margins.get('min', 0)}")
         report.append(f"- Max Points: {margins.get('max', 0)}")
+        if "p50" in margins:
+            report.append(f"- Percentiles: {_percentile_line(margins)}")
+            report.extend(["", *_histogram_table(margins.get("histogram", []))])
+        per_tooth = stats.get("points_per_tooth", {})
+        if per_tooth and any("p50" in v for v in per_tooth.values()):
+            report.append("\n### Margin Points per Tooth Number")
+            report.append("| Tooth # | Teeth | Mean | P50 | P90 | P99 |")
+            report.append("|---|---|---|---|---|---|")
+            for number in sorted(k for k in per_tooth if isinstance(k, int)):
+                v = per_tooth[number]
+                report.append(
+                    f"| {number} | {v.get('count', 0)} | {v.get('mean', 0):.1f} | "
+                    f"{v.get('p50', 0):.0f} | {v.get('p90', 0):.0f} | {v.get('p99', 0):.0f} |"
+                )
 
     # 7. Histograms (Teeth per Case)
     hist_tpc = stats.get("hist_teeth_per_case", {})
     if hist_tpc:
         report.append("\n## Teeth Per Case Histogram")
-        report.append(f"![Teeth Per Case]({plots_dir}/teeth_per_case.png)")
+        if plots_dir:
+            report.append(f"![Teeth Per Case]({plots_dir}/teeth_per_case.png)")
         report.append("| Bucket | Count |")
         report.append("|---|---|")
         for bucket, count in hist_tpc.items():
@@ -68,7 +99,8 @@ def generate_markdown_report(stats: Dict[str, Any], plots_dir: str = "plots") ->
     freq = stats.get("crown_counts", {})
     if freq:
         report.append("\n## Tooth Frequency Heatmap")
-        report.append(f"![Tooth Frequency]({plots_dir}/tooth_frequency.png)")
+        if plots_dir:
+            report.append(f"![Tooth Frequency]({plots_dir}/tooth_frequency.png)")
         report.append("| Tooth # | Count |")
         report.append("|---|---|")
         valid_keys = sorted([k for k in freq.keys() if isinstance(k, int)])
@@ -82,7 +114,70 @@ def generate_markdown_report(stats: Dict[str, Any], plots_dir: str = "plots") ->
     report.append("\n## Scan Specifications")
     if file_stats:
         report.append(f"- **Mean File Size**: {file_stats.get('mean', 0):.2f} MB")
+        if "p50" in file_stats:
+            report.append(f"- **File Size Percentiles (MB)**: {_percentile_line(file_stats, '.2f')}")
     if scan_stats and scan_stats.get("mean", 0) > 0:
         report.append(f"- **Mean Vertices**: {scan_stats.get('mean', 0):.0f}")
+        if "p50" in scan_stats:
+            report.append(f"- **Vertex Count Percentiles**: {_percentile_line(scan_stats)}")
+    if file_stats.get("histogram"):
+        report.extend(["\n### File Size (MB)", *_histogram_table(file_stats["histogram"], ".2f")])
+    if scan_stats.get("histogram") and scan_stats.get("mean", 0) > 0:
+        report.extend(["\n### Scan Vertex Count", *_histogram_table(scan_stats["histogram"])])
+
+    # 10. Duplicates (only with --find-duplicates / --dedupe)
+    dups = stats.get("duplicates", {})
+    if dups:
+        report.append("\n## Duplicate Scans")
+        report.append(f"- Files Fingerprinted: {dups.get('files', 0)}")
+        report.append(f"- Duplicate Scan Groups: {len(dups.get('scan_groups', []))}")
+        report.append(f"- Redundant Cases: {dups.get('dropped', 0)}" + (" (skipped by --dedupe)" if dups.get("deduped") else ""))
+        report.append(f"- Fully Identical Case Groups: {len(dups.get('case_groups', []))}")
+        groups = dups.get("scan_groups", [])
+        if groups:
+            report.append("| Kept Case | Duplicates |")
+            report.append("|---|---|")
+            for group in groups[:20]:
+                report.append(f"| {group[0]} | {', '.join(group[1:])} |")
+            if len(groups) > 20:
+                report.append(f"\n_{len(groups) - 20} more groups not shown._")
+
+    # 11. Slowest Cases (only with --profile-cases)
+    slow = stats.get("slowest_cases", {})
+    if slow and slow.get("rows"):
+        report.append("\n## Slowest Cases")
+        report.append(
+            f"Top {len(slow['rows'])} cases take {slow.get('share', 0) * 100:.1f}% "
+            f"of {slow.get('total_s', 0):.2f}s total case processing time."
+        )
+        report.append("| Case | Total (s) | Glob (s) | Read (s) | XML Parse (s) | Margin Parse (s) | STL Stat (s) | XML (KB) | STL (MB) | Teeth | Margin Points |")
+        report.append("|---|---|---|---|---|---|---|---|---|---|---|")
+        for r in slow["rows"]:
+            xml_kb = (r.get("dental_project_bytes", 0) + r.get("construction_info_bytes", 0)) / 1024
+            report.append(
+                f"| {r['case']} | {r['total_s']:.3f} | {r.get('glob_s', 0):.3f} | {r.get('read_s', 0):.3f} | {r.get('xml_parse_s', 0):.3f} | "
+                f"{r.get('margin_parse_s', 0):.3f} | {r.get('stl_stat_s', 0):.3f} | {xml_kb:.0f} | "
+                f"{r.get('stl_bytes', 0) / 2**20:.1f} | {r.get('teeth', 0)} | {r.get('margin_points', 0)} |"
+            )
+
+    # 12. Case Gallery (only with --gallery); thumbnails live on separate pages
+    gallery = stats.get("gallery", {})
+    if gallery and gallery.get("pages"):
+        gallery_dir = gallery.get("dir", "gallery")
+        pages = gallery["pages"]
+        per_page = gallery.get("page_size", 100)
+        report.append("\n## Case Gallery")
+        report.append(
+            f"{gallery.get('cases', 0)} case thumbnails (upper | lower jaw, occlusal view; "
+            f"teeth ivory, gum pink, margins blue) on {len(pages)} pages. "
+            f"Rendered: {gallery.get('rendered', 0)}, cached: {gallery.get('cached', 0)}, "
+            f"failed: {gallery.get('failed', 0)}."
+        )
+        links = [
+            f"[{i * per_page + 1}-{min((i + 1) * per_page, gallery.get('cases', 0))}]({gallery_dir}/{page})"
+            for i, page in enumerate(pages)
+        ]
+        for row in range(0, len(links), 10):
+            report.append("- " + " · ".join(links[row:row + 10]))
 
     return "\n".join(report)
@@ -0,0 +1,272 @@
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingMixIn, UnixStreamServer
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+import numpy as np
+from .case_table import (
+    CaseTable, build_case_table, concat_case_tables, table_stats, JAW_TYPES, RECONSTRUCTION_TYPES, INCOMPLETE
+)
+from .catalog import tooth_numbers, TOOTH_CLASSES, ARCH_QUADRANTS
+from .ingest import process_cases
+from .models import Case, ReconstructionType, VALID_TRAINING_MIN_POINTS
+
+_CROWN = RECONSTRUCTION_TYPES.index(ReconstructionType.CROWN)
+_TYPE_VALUES = {t.value: code for code, t in enumerate(RECONSTRUCTION_TYPES)}
+
+def case_summary(case_dir: str, case: Case) -> Dict[str, Any]:
+    """JSON-ready case record: margin points are reduced to their count, so the trusted case is used as-is."""
+    return {
+        "name": os.path.basename(case_dir),
+        "case_dir": case_dir,
+        "id": case.id,
+        "jaw_type": case.jaw_type,
+        "missing_files": list(case.missing_files),
+        "scan_vertex_count": case.scan_vertex_count,
+        "file_size_mb": case.file_size_mb,
+        "teeth": [
+            {
+                "number": t.number,
+                "reconstruction_type": t.reconstruction_type.value,
+                "margin_points": len(t.margin_points),
+                "valid_training_sample": t.is_valid_training_sample,
+            }
+            for t in case.teeth
+        ],
+    }
+
+class IndexSnapshot:
+    """
+    Immutable in-memory index over all cases (sorted by folder): the merged
+    CaseTable plus the per-tooth case column and per-missing-file masks, so
+    filters are a few vectorised comparisons. Replaced, never mutated, on
+    refresh, so readers need no lock.
+    """
+
+    def __init__(self, rows: Dict[str, Tuple[CaseTable, Dict[str, Any]]], version: int = 0):
+        self.version = version
+        self.case_dirs = sorted(rows)
+        self.summaries = [rows[d][1] for d in self.case_dirs]
+        self.by_name = {s["name"]: i for i, s in enumerate(self.summaries)}
+        self.table = concat_case_tables([rows[d][0] for d in self.case_dirs])
+        self.case_of_tooth = np.repeat(np.arange(len(self.table)), np.diff(self.table.tooth_offsets))
+        self.missing: Dict[str, np.ndarray] = {}
+        for i, s in enumerate(self.summaries):
+            for name in s["missing_files"]:
+                self.missing.setdefault(name, np.zeros(len(self.table), dtype=bool))[i] = True
+        self._stats = None
+
+    def __len__(self) -> int:
+        return len(self.case_dirs)
+
+    def stats(self) -> Dict[str, Any]:
+        """The compute_stats() payload (computed once per snapshot)."""
+        if self._stats is None:
+            self._stats = table_stats(self.table)
+        return self._stats
+
+    def query(
+        self,
+        teeth: Optional[Iterable[int]] = None,
+        reconstruction_type: Optional[str] = None,
+        min_margin_points: Optional[int] = None,
+        valid_training: bool = False,
+        jaw_type: Optional[str] = None,
+        complete: bool = False,
+        missing: Optional[str] = None
+    ) -> List[str]:
+        """
+        Case folders matching all filters, sorted (catalog.query_case_dirs
+        semantics: tooth filters must hold for the same tooth). missing
+        selects cases lacking that file kind, e.g. "constructionInfo".
+        """
+        table = self.table
+        case_ok = np.ones(len(table), dtype=bool)
+        if jaw_type:
+            case_ok &= table.jaw_code == (JAW_TYPES.index(jaw_type) if jaw_type in JAW_TYPES else -1)
+        if complete:
+            case_ok &= (table.flags & INCOMPLETE) == 0
+        if missing:
+            case_ok &= self.missing.get(missing, np.zeros(len(table), dtype=bool))
+
+        tooth_ok = None
+        def tooth_filter(mask):
+            nonlocal tooth_ok
+            tooth_ok = mask if tooth_ok is None else tooth_ok & mask
+        if teeth is not None:
+            tooth_filter(np.isin(table.tooth_number, list(teeth)))
+        if reconstruction_type:
+            tooth_filter(table.tooth_type == _TYPE_VALUES.get(reconstruction_type, -1))
+        if min_margin_points is not None:
+            tooth_filter(table.margin_count >= min_margin_points)
+        if valid_training:
+            tooth_filter((table.tooth_type == _CROWN) & (table.margin_count >= VALID_TRAINING_MIN_POINTS))
+        if tooth_ok is not None:
+            has_tooth = np.zeros(len(table), dtype=bool)
+            has_tooth[self.case_of_tooth[tooth_ok]] = True
+            case_ok &= has_tooth
+        return [self.case_dirs[i] for i in np.flatnonzero(case_ok)]
+
+    def case(self, name: str) -> Optional[Dict[str, Any]]:
+        """Case record by folder name, None if unknown."""
+        i = self.by_name.get(name)
+        return None if i is None else self.summaries[i]
+
+class CaseService:
+    """
+    Resident case index over a data directory. Cases are parsed once; a
+    CaseWatcher (see watch.py) reports new, changed and removed folders, and
+    only those are re-parsed before a new snapshot is swapped in.
+    """
+
+    def __init__(self, data_dir: str, executor: str = "thread", workers: Optional[int] = None,
+                 use_inotify: bool = True):
+        from .watch import CaseWatcher
+
+        self.data_dir = os.path.abspath(data_dir)
+        self.executor = executor
+        self.workers = workers
+        self.watcher = CaseWatcher(self.data_dir, use_inotify=use_inotify)
+        self.snapshot = IndexSnapshot({})
+        self._rows: Dict[str, Tuple[CaseTable, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.started = time.time()
+
+    def refresh(self, timeout: float = 0.0) -> Tuple[int, int]:
+        """One watcher poll; re-parses changed folders. Returns (changed, removed)."""
+        with self._lock:
+            changed, removed = self.watcher.poll(timeout)
+            if not changed and not removed:
+                return 0, 0
+            for case_dir in removed:
+                self._rows.pop(case_dir, None)
+            for case_dir, case in zip(changed, process_cases(changed, self.executor, self.workers)):
+                self._rows[case_dir] = (build_case_table([case]), case_summary(case_dir, case))
+            self.snapshot = IndexSnapshot(self._rows, self.snapshot.version + 1)
+            return len(changed), len(removed)
+
+    def load(self):
+        """Initial full load (the watcher reports existing folders on its second poll)."""
+        self.refresh()
+        self.refresh()
+
+    def start_refresh(self, interval: float = 2.0):
+        """Keeps refreshing from disk in a daemon thread; a failed poll is logged and retried."""
+        def loop():
+            while not self._stop.is_set():
+                try:
+                    self.refresh(interval)
+                except Exception as e:
+                    print(f"Refresh failed: {type(e).__name__}: {e}", file=sys.stderr)
+                    self._stop.wait(interval)
+        self._thread = threading.Thread(target=loop, name="case-refresh", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.watcher.close()
+
+    def handle(self, path: str, params: Dict[str, List[str]]) -> Tuple[int, Any]:
+        """Routes one GET request to (HTTP status, JSON-ready body)."""
+        snapshot = self.snapshot
+        if path == "/health":
+            return 200, {
+                "cases": len(snapshot), "version": snapshot.version, "watch": self.watcher.mode,
+                "uptime_s": time.time() - self.started,
+            }
+        if path == "/stats":
+            return 200, snapshot.stats()
+        if path == "/cases":
+            filters = _query_filters(params)
+            limit = int(_param(params, "limit", "0"))
+            case_dirs = snapshot.query(**filters)
+            body = {"count": len(case_dirs)}
+            if _param(params, "count", "0") not in ("1", "true"):
+                body["cases"] = case_dirs[:limit] if limit > 0 else case_dirs
+            return 200, body
+        if path.startswith("/case/"):
+            case = snapshot.case(unquote(path[len("/case/"):]))
+            return (200, case) if case is not None else (404, {"error": "unknown case"})
+        return 404, {"error": f"unknown path {path}"}
+
+def _param(params: Dict[str, List[str]], key: str, default: Optional[str] = None) -> Optional[str]:
+    values = params.get(key)
+    return values[-1] if values else default
+
+def _query_filters(params: Dict[str, List[str]]) -> Dict[str, Any]:
+    """/cases query string -> IndexSnapshot.query keyword arguments (query.py's options)."""
+    teeth = None
+    if "teeth" in params:
+        teeth = [int(t) for value in params["teeth"] for t in value.split(",") if t]
+    arch, tooth_class = _param(params, "arch"), _param(params, "tooth_class")
+    if arch and arch not in ARCH_QUADRANTS or tooth_class and tooth_class not in TOOTH_CLASSES:
+        raise ValueError("unknown arch or tooth_class")
+    if arch or tooth_class:
+        selected = tooth_numbers(arch, tooth_class)
+        teeth = [t for t in teeth if t in selected] if teeth else selected
+    min_points = _param(params, "min_margin_points")
+    flag = lambda key: _param(params, key, "0") in ("1", "true")
+    return {
+        "teeth": teeth,
+        "reconstruction_type": _param(params, "type"),
+        "min_margin_points": int(min_points) if min_points is not None else None,
+        "valid_training": flag("valid_training"),
+        "jaw_type": _param(params, "jaw"),
+        "complete": flag("complete"),
+        "missing": _param(params, "missing"),
+    }
+
+class _Handler(BaseHTTPRequestHandler):
+    """JSON over HTTP/1.1 keep-alive; the service is attached to the server."""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        try:
+            status, body = self.server.service.handle(url.path, parse_qs(url.query))
+        except ValueError as e:
+            status, body = 400, {"error": str(e)}
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+class _TCPHandler(_Handler):
+    # Headers and body are separate writes: without TCP_NODELAY, Nagle plus
+    # delayed ACKs add ~40 ms to every keep-alive response
+    disable_nagle_algorithm = True
+
+class _TCPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+class _UnixServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        conn, _ = self.socket.accept()
+        # BaseHTTPRequestHandler expects a (host, port) client address
+        return conn, ("local", 0)
+
+def make_server(service: CaseService, host: str = "127.0.0.1", port: int = 8765, socket_path: Optional[str] = None):
+    """HTTP server on a Unix socket (if socket_path) or host:port (port 0: any free port)."""
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = _UnixServer(socket_path, _Handler)
+    else:
+        server = _TCPServer((host, port), _TCPHandler)
+    server.service = service
+    return server
@@ -0,0 +1,161 @@
+import math
+from fractions import Fraction
+from typing import Any, Dict, Iterable, List, Union
+import numpy as np
+
+# Quantiles are within 1% of the true value; buckets cover ~17 decades before collapsing
+RELATIVE_ACCURACY = 0.01
+MAX_BUCKETS = 2048
+HISTOGRAM_BINS = 10
+QUANTILES = {"p50": 0.5, "p90": 0.9, "p99": 0.99}
+
+def _exact_sum(values: np.ndarray) -> Union[int, Fraction]:
+    """Exact sum of integer or float64 values (independent of order and chunking)."""
+    if values.dtype.kind in "iub":
+        return int(values.sum(dtype=np.int64))
+    mantissa, exponent = np.frexp(values.astype(np.float64))
+    mantissa = np.ldexp(mantissa, 53).astype(np.int64)
+    exponent = exponent - 53
+    # 26-bit halves: group sums stay exact in int64 for up to 2^36 values
+    high, low = mantissa >> 26, mantissa & ((1 << 26) - 1)
+    total = Fraction(0)
+    for e in np.unique(exponent):
+        group = exponent == e
+        s = (int(high[group].sum()) << 26) + int(low[group].sum())
+        total += Fraction(s, 1 << -int(e)) if e < 0 else Fraction(s << int(e))
+    return total
+
+class QuantileSketch:
+    """
+    Mergeable streaming quantile sketch for non-negative metrics.
+
+    Log-spaced buckets (DDSketch style): a value x > 0 is counted in bucket
+    ceil(log_gamma(x)) with gamma = (1 + a) / (1 - a), so every quantile is
+    returned within relative error a, and memory is bounded by max_buckets
+    whatever the number of values. Values <= 0 share one zero bucket.
+
+    Bucket counts, count, min, max and the (exact) sum only ever add up, so
+    sketches built per worker or per chunk merge into exactly the sketch of
+    the whole stream: same quantiles, histogram and mean in any order.
+    """
+
+    def __init__(self, relative_accuracy: float = RELATIVE_ACCURACY, max_buckets: int = MAX_BUCKETS):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.max_buckets = max_buckets
+        self.offset = 0                                 # bucket index of counts[0]
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.zero_count = 0
+        self.count = 0
+        self.sum: Union[int, Fraction] = 0
+        self.min: Any = math.inf
+        self.max: Any = -math.inf
+
+    @classmethod
+    def of(cls, values: Iterable, **kwargs) -> "QuantileSketch":
+        sketch = cls(**kwargs)
+        sketch.update(values)
+        return sketch
+
+    def _add_buckets(self, offset: int, counts: np.ndarray):
+        if not len(counts):
+            return
+        if not len(self.counts):
+            self.offset, self.counts = offset, counts.astype(np.int64)
+        else:
+            lo = min(self.offset, offset)
+            hi = max(self.offset + len(self.counts), offset + len(counts))
+            merged = np.zeros(hi - lo, dtype=np.int64)
+            merged[self.offset - lo:self.offset - lo + len(self.counts)] += self.counts
+            merged[offset - lo:offset - lo + len(counts)] += counts
+            self.offset, self.counts = lo, merged
+        if len(self.counts) > self.max_buckets:
+            # Collapse the lowest buckets: only the smallest quantiles lose accuracy
+            extra = len(self.counts) - self.max_buckets
+            self.counts[extra] += self.counts[:extra].sum()
+            self.offset += extra
+            self.counts = self.counts[extra:]
+
+    def update(self, values: Iterable):
+        """Adds a batch of values (any iterable or array)."""
+        values = np.asarray(values if isinstance(values, np.ndarray) else list(values)).ravel()
+        if not values.size:
+            return
+        self.count += int(values.size)
+        self.sum += _exact_sum(values)
+        self.min = min(self.min, values.min().item())
+        self.max = max(self.max, values.max().item())
+        positive = values[values > 0].astype(np.float64)
+        self.zero_count += int(values.size - positive.size)
+        if positive.size:
+            index = np.ceil(np.log(positive) / self._log_gamma).astype(np.int64)
+            lo = int(index.min())
+            self._add_buckets(lo, np.bincount(index - lo))
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Adds another sketch (same relative accuracy) into this one."""
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.zero_count += other.zero_count
+        self._add_buckets(other.offset, other.counts)
+        return self
+
+    @property
+    def mean(self) -> float:
+        return float(self.sum / self.count) if self.count else 0.0
+
+    def _bucket_values(self) -> np.ndarray:
+        """Representative value of each bucket (relative error <= a within the bucket)."""
+        index = self.offset + np.arange(len(self.counts))
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def quantile(self, q: float) -> float:
+        """Value at quantile q in [0, 1] (0.0 for an empty sketch)."""
+        if not self.count:
+            return 0.0
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            value = 0.0
+        else:
+            i = int(np.searchsorted(np.cumsum(self.counts), rank - self.zero_count, side="right"))
+            value = float(self._bucket_values()[min(i, len(self.counts) - 1)])
+        return float(min(max(value, self.min), self.max))
+
+    def histogram(self, bins: int = HISTOGRAM_BINS) -> List[List]:
+        """[lo, hi, count] over equal-width bins from min to max (bucket-resolution edges)."""
+        if not self.count:
+            return []
+        lo, hi = float(self.min), float(self.max)
+        if hi <= lo:
+            return [[lo, hi, self.count]]
+        edges = np.linspace(lo, hi, bins + 1)
+        values = np.clip(np.r_[0.0, self._bucket_values()], lo, hi)
+        weights = np.r_[self.zero_count, self.counts]
+        which = np.clip(np.searchsorted(edges, values, side="right") - 1, 0, bins - 1)
+        counts = np.bincount(which, weights=weights, minlength=bins).astype(np.int64)
+        return [[float(edges[i]), float(edges[i + 1]), int(counts[i])] for i in range(bins)]
+
+def sketch_summary(sketch: QuantileSketch, bins: int = HISTOGRAM_BINS) -> Dict[str, Any]:
+    """Report payload of a non-empty sketch: exact count/mean/min/max, p50/p90/p99, histogram."""
+    return {
+        "count": sketch.count, "mean": sketch.mean, "min": sketch.min, "max": sketch.max,
+        **quantile_fields(sketch), "histogram": sketch.histogram(bins),
+    }
+
+def grouped_sketches(keys: np.ndarray, values: np.ndarray, **kwargs) -> Dict[int, QuantileSketch]:
+    """One sketch per distinct key (e.g. FDI number), in key order."""
+    keys, values = np.asarray(keys), np.asarray(values)
+    order = np.argsort(keys, kind="stable")
+    keys, values = keys[order], values[order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else np.zeros(0, dtype=np.int64)
+    ends = np.r_[starts[1:], len(keys)]
+    return {int(keys[s]): QuantileSketch.of(values[s:e], **kwargs) for s, e in zip(starts, ends)}
+
+def quantile_fields(sketch: QuantileSketch) -> Dict[str, float]:
+    """{"p50": ..., "p90": ..., "p99": ...} of a sketch."""
+    return {name: sketch.quantile(q) for name, q in QUANTILES.items()}
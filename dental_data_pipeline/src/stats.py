@@ -3,6 +3,14 @@ from typing import List, Dict, Tuple
 import numpy as np
 from collections import defaultdict
 from .models import Case, Tooth, ReconstructionType
+from . import case_table
+
+# Report statistics over a list of Cases are thin wrappers: each metric is
+# implemented once, over the CaseTable (case_table.py), which compute_stats()
+# and catalog_stats() use directly.
+
+def _over_table(fn_name: str, cases: List[Case]):
+    return getattr(case_table, fn_name)(case_table.build_case_table(cases))
 
 def calculate_arc_length(points: List[Tuple[float, float, float]]) -> float:
     if len(points) < 2:
@@ -39,72 +47,22 @@ def calculate_z_range(points: List[Tuple[float, float, float]]) -> float:
     return float(np.max(z_values) - np.min(z_values))
 
 def calculate_margin_point_counts(cases: List[Case]) -> Dict:
-    counts = []
-    for c in cases:
-        for t in c.teeth:
-            if t.margin_points:
-                counts.append(len(t.margin_points))
-    
-    if not counts:
-        return {"counts": [], "min": 0, "max": 0, "mean": 0}
-
-    return {
-        "counts": counts, 
-        "min": min(counts), 
-        "max": max(counts), 
-        "mean": float(np.mean(counts))
-    }
+    return _over_table("calculate_margin_point_counts", cases)
 
 def calculate_jaw_distribution(cases: List[Case]) -> Dict[str, int]:
-    dist = {"Upper": 0, "Lower": 0, "Mixed": 0}
-    for c in cases:
-        if c.jaw_type in dist:
-            dist[c.jaw_type] += 1
-        else:
-            # Handle unknown or other strings
-             # Fallback logic if needed
-            pass
-    return dist
+    return _over_table("calculate_jaw_distribution", cases)
 
 def calculate_completeness_stats(cases: List[Case]) -> Dict[str, int]:
-    stats = {"missing_labels": 0, "missing_scans": 0, "complete": 0}
-    for c in cases:
-        if not c.missing_files:
-            stats["complete"] += 1
-        else:
-            if "constructionInfo" in c.missing_files:
-                stats["missing_labels"] += 1
-            if "scan_stl" in c.missing_files:
-                stats["missing_scans"] += 1
-    return stats
+    return _over_table("calculate_completeness_stats", cases)
 
 def get_tooth_frequency(cases: List[Case]) -> Dict[int, int]:
-    freq = defaultdict(int)
-    for c in cases:
-        for t in c.teeth:
-            freq[t.number] += 1
-    return freq
+    return defaultdict(int, _over_table("get_tooth_frequency", cases))
 
 def get_cases_size_histogram(cases: List[Case]) -> Dict[str, int]:
-    hist = {"1_unit": 0, "2_5_units": 0, "6_9_units": 0, "10_plus_units": 0}
-    for c in cases:
-        count = len(c.teeth)
-        if count == 1:
-            hist["1_unit"] += 1
-        elif 2 <= count <= 5:
-            hist["2_5_units"] += 1
-        elif 6 <= count <= 9:
-            hist["6_9_units"] += 1
-        elif count >= 10:
-            hist["10_plus_units"] += 1
-    return hist
+    return _over_table("get_cases_size_histogram", cases)
 
 def get_reconstruction_stats(cases: List[Case]) -> Dict[ReconstructionType, int]:
-    stats = defaultdict(int)
-    for c in cases:
-        for t in c.teeth:
-            stats[t.reconstruction_type] += 1
-    return stats
+    return defaultdict(int, _over_table("get_reconstruction_stats", cases))
 
 def count_missing_margins(teeth: List[Tooth]) -> int:
     """Counts crowns that are expected to have margins but have 0 points."""
@@ -139,56 +97,13 @@ def is_geometric_outlier(points: List[Tuple[float, float, float]]) -> bool:
     return False
 
 def calculate_case_types(cases: List[Case]) -> Dict[str, int]:
-    stats = {"Implant": 0, "Veneer": 0, "Crown": 0, "PonticOnly": 0}
-    for c in cases:
-        types = set(t.reconstruction_type for t in c.teeth)
-        if ReconstructionType.IMPLANT in types:
-            stats["Implant"] += 1
-        elif ReconstructionType.VENEER in types:
-            stats["Veneer"] += 1
-        elif ReconstructionType.CROWN in types:
-            stats["Crown"] += 1
-        else:
-            stats["PonticOnly"] += 1
-    return stats
+    return _over_table("calculate_case_types", cases)
 
 def calculate_scan_resolution(cases: List[Case]) -> Dict:
-    resolutions = [c.scan_vertex_count for c in cases]
-    if not resolutions:
-         return {"mean": 0, "max": 0}
-    return {
-        "mean": float(np.mean(resolutions)),
-        "max": max(resolutions),
-        "min": min(resolutions),
-        "total_scanned_vertices": sum(resolutions)
-    }
+    return _over_table("calculate_scan_resolution", cases)
 
 def calculate_file_size_stats(cases: List[Case]) -> Dict:
-    sizes = [c.file_size_mb for c in cases]
-    if not sizes:
-        return {"mean": 0.0, "max": 0.0, "min": 0.0}
-    return {
-        "mean": float(np.mean(sizes)),
-        "max": max(sizes),
-        "min": min(sizes)
-    }
+    return _over_table("calculate_file_size_stats", cases)
 
 def calculate_points_per_tooth_type(cases: List[Case]) -> Dict[int, Dict]:
-    """Returns {tooth_num: {mean: x, min: y, max: z} }"""
-    points_map = defaultdict(list)
-    
-    for c in cases:
-        for t in c.teeth:
-            if t.margin_points: # Only count if exists
-                points_map[t.number].append(len(t.margin_points))
-                
-    stats = {}
-    for t_num, counts in points_map.items():
-        if not counts: continue
-        stats[t_num] = {
-            "mean": float(np.mean(counts)),
-            "min": min(counts),
-            "max": max(counts),
-            "count": len(counts)
-        }
-    return stats
+    return _over_table("calculate_points_per_tooth_type", cases)
@@ -0,0 +1,211 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Any
+
+# Shared no-op context returned by disabled tracers (no allocation per span)
+_NULL_SPAN = nullcontext()
+
+class Tracer:
+    """
+    Collects timed spans: wall time, CPU time and tracemalloc peak.
+    When disabled, span() returns a shared no-op context so instrumented code
+    pays a single attribute check.
+
+    tracemalloc has one process-wide peak, so only spans on the thread that
+    created the tracer (the main thread, or a worker process's) reset and
+    read it; their peak covers the allocations of every thread. Spans on
+    other threads record peak_bytes None ("n/a"). Likewise, main-thread
+    spans measure process CPU time (including worker threads) and other
+    spans their own thread's CPU time.
+    """
+
+    def __init__(self, enabled: bool = False, trace_memory: bool = True):
+        self.enabled = enabled
+        self.trace_memory = trace_memory and enabled
+        self.events: List[Dict[str, Any]] = []
+        # Forked workers inherit this object; they must not reuse its events
+        self.pid = os.getpid()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._owner = threading.get_ident()
+        self._started_tracemalloc = self.trace_memory and not tracemalloc.is_tracing()
+        if self._started_tracemalloc:
+            tracemalloc.start()
+
+    def close(self):
+        """Stops tracemalloc if this tracer started it."""
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def span(self, name: str, **attrs):
+        """Context manager timing the enclosed block as one span."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._span(name, attrs)
+
+    @contextmanager
+    def _span(self, name: str, attrs: Dict[str, Any]):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        on_owner = threading.get_ident() == self._owner
+        cpu_clock = time.process_time_ns if on_owner else time.thread_time_ns
+        # Child spans report their peak to the parent, since reset_peak() is global
+        frame = {"child_peak": 0}
+        stack.append(frame)
+        if self.trace_memory and on_owner:
+            tracemalloc.reset_peak()
+        start_ns = time.perf_counter_ns()
+        cpu_start_ns = cpu_clock()
+        try:
+            yield
+        finally:
+            dur_ns = time.perf_counter_ns() - start_ns
+            cpu_ns = cpu_clock() - cpu_start_ns
+            if not self.trace_memory:
+                peak = 0
+            elif on_owner:
+                peak = max(tracemalloc.get_traced_memory()[1], frame["child_peak"])
+            else:
+                peak = None
+            stack.pop()
+            if stack and peak is not None:
+                stack[-1]["child_peak"] = max(stack[-1]["child_peak"], peak)
+            event = {
+                "name": name,
+                # perf_counter is system-wide monotonic, so worker processes share the timeline
+                "start_ns": start_ns,
+                "dur_ns": dur_ns,
+                "cpu_ns": cpu_ns,
+                "peak_bytes": peak,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "depth": len(stack),
+                "attrs": attrs,
+            }
+            with self._lock:
+                self.events.append(event)
+
+    def merge(self, events: List[Dict[str, Any]]):
+        """Adds events recorded elsewhere (e.g. in a worker process)."""
+        with self._lock:
+            self.events.extend(events)
+
+    def reset(self):
+        """Drops the recorded events (e.g. after each export of a long-running process)."""
+        with self._lock:
+            self.events = []
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per span name: count, total/mean/max wall seconds, CPU seconds, peak bytes (None: n/a)."""
+        groups = defaultdict(list)
+        for e in self.events:
+            groups[e["name"]].append(e)
+
+        summary = {}
+        for name, events in groups.items():
+            walls = [e["dur_ns"] / 1e9 for e in events]
+            peaks = [e["peak_bytes"] for e in events if e["peak_bytes"] is not None]
+            summary[name] = {
+                "count": len(events),
+                "wall_s": sum(walls),
+                "mean_wall_s": sum(walls) / len(walls),
+                "max_wall_s": max(walls),
+                "cpu_s": sum(e["cpu_ns"] for e in events) / 1e9,
+                "peak_bytes": max(peaks) if peaks else None,
+            }
+        return summary
+
+    def write_summary(self, path: str):
+        """JSON summary of all span names."""
+        with open(path, "w") as f:
+            json.dump({"spans": self.summary()}, f, indent=2)
+
+    def write_chrome_trace(self, path: str):
+        """Chrome trace-event file (open in chrome://tracing or Perfetto)."""
+        origin_ns = min((e["start_ns"] for e in self.events), default=0)
+        trace_events = [
+            {
+                "name": e["name"],
+                "ph": "X",
+                "ts": (e["start_ns"] - origin_ns) / 1000,
+                "dur": e["dur_ns"] / 1000,
+                "pid": e["pid"],
+                "tid": e["tid"],
+                "args": {
+                    "cpu_ms": e["cpu_ns"] / 1e6,
+                    **({"peak_kb": e["peak_bytes"] / 1024} if e["peak_bytes"] is not None else {}),
+                    **e["attrs"],
+                },
+            }
+            for e in self.events
+        ]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, f)
+
+    def write_prometheus(self, path: str, prefix: str = "dental_pipeline"):
+        """Prometheus textfile-collector metrics, one series per span name."""
+        metrics = [
+            ("span_count", "Number of times the span ran", "count"),
+            ("span_wall_seconds", "Total wall time of the span", "wall_s"),
+            ("span_cpu_seconds", "Total CPU time of the span (process CPU on the main thread)", "cpu_s"),
+            ("span_peak_bytes", "Peak traced Python memory during the span", "peak_bytes"),
+        ]
+        summary = self.summary()
+        lines = []
+        for metric, help_text, key in metrics:
+            lines.append(f"# HELP {prefix}_{metric} {help_text}")
+            lines.append(f"# TYPE {prefix}_{metric} gauge")
+            for name in sorted(summary):
+                if summary[name][key] is None:
+                    continue
+                lines.append(f'{prefix}_{metric}{{span="{name}"}} {summary[name][key]:g}')
+        # Write then rename so the collector never reads a partial file
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+
+    def export(self, output_dir: str) -> Dict[str, str]:
+        """Writes summary JSON, Chrome trace and Prometheus textfile into output_dir."""
+        os.makedirs(output_dir, exist_ok=True)
+        paths = {
+            "summary": os.path.join(output_dir, "trace_summary.json"),
+            "chrome": os.path.join(output_dir, "trace.json"),
+            "prometheus": os.path.join(output_dir, "pipeline.prom"),
+        }
+        self.write_summary(paths["summary"])
+        self.write_chrome_trace(paths["chrome"])
+        self.write_prometheus(paths["prometheus"])
+        return paths
+
+_tracer = Tracer(enabled=False)
+
+def get_tracer() -> Tracer:
+    """The process-wide tracer (disabled unless set_tracer() installed one)."""
+    return _tracer
+
+def set_tracer(tracer: Tracer) -> Tracer:
+    """Installs a process-wide tracer and returns the previous one."""
+    global _tracer
+    previous, _tracer = _tracer, tracer
+    return previous
+
+def run_traced(fn, arg, trace_memory: bool = True):
+    """
+    Process-pool helper: runs fn(arg) under a worker-local tracer and returns
+    (result, recorded events) so the parent can merge() them.
+    """
+    tracer = get_tracer()
+    if not tracer.enabled or tracer.pid != os.getpid():
+        tracer = Tracer(enabled=True, trace_memory=trace_memory)
+        set_tracer(tracer)
+    result = fn(arg)
+    events, tracer.events = tracer.events, []
+    return result, events
@@ -5,6 +5,7 @@ matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import os
 from typing import Dict, Any
+from .tracing import get_tracer
 
 def save_plot(filename: str, output_dir: str):
     """Helper to save and clear plot."""
@@ -91,8 +92,8 @@ def generate_plots(stats: Dict, output_dir: str):
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
         
-    plot_jaw_distribution(stats, output_dir)
-    plot_teeth_histogram(stats, output_dir)
-    plot_tooth_frequency(stats, output_dir)
-    plot_reconstruction_types(stats, output_dir)
-    plot_clinical_case_types(stats, output_dir)
+    tracer = get_tracer()
+    for plot_fn in (plot_jaw_distribution, plot_teeth_histogram, plot_tooth_frequency,
+                    plot_reconstruction_types, plot_clinical_case_types):
+        with tracer.span(f"plot.{plot_fn.__name__}"):
+            plot_fn(stats, output_dir)
@@ -0,0 +1,182 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+# inotify(7) event bits
+IN_MODIFY = 0x002
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_Q_OVERFLOW = 0x4000
+ROOT_EVENTS = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_ATTRIB
+CASE_EVENTS = IN_CLOSE_WRITE | IN_MODIFY | IN_ATTRIB | IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF
+_EVENT_HEADER = struct.Struct("iIII")
+
+# (name, size, mtime_ns) of every file in a case folder
+Signature = Tuple[Tuple[str, int, int], ...]
+
+def case_signature(case_dir: str) -> Optional[Signature]:
+    """File stats of a case folder (one scandir, no reads); None if it is gone."""
+    try:
+        with os.scandir(case_dir) as it:
+            entries = []
+            for e in it:
+                if e.is_file():
+                    st = e.stat()
+                    entries.append((e.name, st.st_size, st.st_mtime_ns))
+    except OSError:
+        return None
+    return tuple(sorted(entries))
+
+class _Inotify:
+    """Minimal ctypes binding of Linux inotify (no third-party dependency)."""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, path: str, mask: int) -> int:
+        """Watch descriptor, or -1 if the path cannot be watched (e.g. already removed)."""
+        return self._add_watch(self.fd, os.fsencode(path), mask)
+
+    def read(self, timeout: float) -> List[Tuple[int, int, str]]:
+        """(wd, mask, name) events, waiting up to timeout seconds for the first one."""
+        if not select.select([self.fd], [], [], max(timeout, 0))[0]:
+            return []
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return events
+            pos = 0
+            while pos < len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, pos)
+                pos += _EVENT_HEADER.size
+                name = os.fsdecode(data[pos:pos + length].rstrip(b"\0"))
+                pos += length
+                events.append((wd, mask, name))
+
+    def close(self):
+        os.close(self.fd)
+
+def inotify_available() -> bool:
+    return sys.platform.startswith("linux") and hasattr(ctypes.CDLL(None), "inotify_init1")
+
+class CaseWatcher:
+    """
+    Detects new, changed and removed case folders under data_dir.
+
+    The signature (file names, sizes, mtimes) of every case is cached;
+    poll() reports a case once its signature differs from the last reported
+    one and has been stable for one poll, so folders still being written by
+    the exporter are picked up on the next poll instead of half-copied.
+
+    Polling mode re-stats every case folder each poll. With inotify (Linux),
+    poll() blocks on file events instead and only re-stats the folders they
+    name (a folder is stable once a poll saw no events for it), falling back
+    to a full rescan if the kernel event queue overflows.
+    """
+
+    def __init__(self, data_dir: str, use_inotify: bool = True):
+        self.data_dir = data_dir
+        self.reported: Dict[str, Signature] = {}
+        self._pending: Dict[str, Signature] = {}
+        self._rescan = True
+        self._inotify = None
+        self._wd_case: Dict[int, str] = {}
+        self._watched: Set[str] = set()
+        if use_inotify and inotify_available():
+            try:
+                self._inotify = _Inotify()
+            except OSError:
+                self._inotify = None
+        if self._inotify is not None:
+            self._root_wd = self._inotify.add_watch(data_dir, ROOT_EVENTS)
+
+    @property
+    def mode(self) -> str:
+        return "inotify" if self._inotify is not None else "polling"
+
+    def _case_dirs(self) -> List[str]:
+        with os.scandir(self.data_dir) as it:
+            return [e.path for e in it if e.is_dir()]
+
+    def _watch_case(self, case_dir: str):
+        if case_dir not in self._watched:
+            wd = self._inotify.add_watch(case_dir, CASE_EVENTS)
+            if wd >= 0:
+                self._wd_case[wd] = case_dir
+                self._watched.add(case_dir)
+
+    def _collect_events(self, timeout: float) -> Set[str]:
+        """Case folders named by inotify events (waits up to timeout)."""
+        dirty = set()
+        for wd, mask, name in self._inotify.read(timeout):
+            if mask & IN_Q_OVERFLOW:
+                self._rescan = True
+            elif wd == self._root_wd:
+                if name:
+                    dirty.add(os.path.join(self.data_dir, name))
+            elif wd in self._wd_case:
+                dirty.add(self._wd_case[wd])
+                if mask & IN_DELETE_SELF:
+                    self._watched.discard(self._wd_case.pop(wd))
+        return dirty
+
+    def poll(self, timeout: float = 1.0) -> Tuple[List[str], List[str]]:
+        """
+        Waits up to timeout seconds and returns the (changed, removed) case
+        folders, sorted. The first poll returns at once; every existing case
+        is reported by the second.
+        """
+        # Folders with file events since the last poll are not stable yet
+        events = set()
+        if self._inotify is None:
+            if not self._rescan:
+                time.sleep(timeout)
+            candidates = set(self._case_dirs()) | set(self.reported)
+        else:
+            events = self._collect_events(0 if self._rescan else timeout)
+            candidates = set(events)
+            if self._rescan:
+                candidates |= set(self._case_dirs()) | set(self.reported)
+        candidates |= set(self._pending)
+        self._rescan = False
+
+        changed, removed, pending = [], [], {}
+        for case_dir in candidates:
+            signature = case_signature(case_dir)
+            if signature is None:
+                if self.reported.pop(case_dir, None) is not None:
+                    removed.append(case_dir)
+                continue
+            if self._inotify is not None:
+                self._watch_case(case_dir)
+            if signature == self.reported.get(case_dir):
+                continue
+            if self._pending.get(case_dir) == signature and case_dir not in events:
+                self.reported[case_dir] = signature
+                changed.append(case_dir)
+            else:
+                pending[case_dir] = signature
+        self._pending = pending
+        return sorted(changed), sorted(removed)
+
+    def close(self):
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
@@ -0,0 +1,60 @@
+from dental_data_pipeline.src.case_table import STATS_FUNCTIONS
+from dental_data_pipeline.src import stats, case_table
+from dental_data_pipeline.src.case_table import build_case_table, count_adjacency, bridge_spans, classify_jaws, JAW_TYPES
+from dental_data_pipeline.src.models import Case, Tooth, ReconstructionType
+
+def _cases():
+    points = [(float(i), 0.0, 1.0) for i in range(60)]
+    return [
+        Case(id="a", jaw_type="Lower", teeth=[
+            Tooth.trusted(36, ReconstructionType.CROWN, points),
+            Tooth.trusted(35, ReconstructionType.PONTIC),
+            Tooth.trusted(34, ReconstructionType.CROWN, points[:30]),
+        ]),
+        Case(id="b", jaw_type="Mixed", missing_files=["scan_stl"], teeth=[
+            Tooth.trusted(11, ReconstructionType.IMPLANT, points),
+            Tooth.trusted(21, ReconstructionType.CROWN, points[:20]),
+            Tooth.trusted(46, ReconstructionType.CROWN, points[:20]),
+        ], scan_vertex_count=1000, file_size_mb=3.5),
+        Case(id="c", jaw_type="Upper", file_size_mb=12.5, teeth=[
+            Tooth.trusted(13, ReconstructionType.VENEER, points[:55]),
+            Tooth.trusted(15, ReconstructionType.PONTIC),
+        ]),
+        Case(id="d", missing_files=["constructionInfo", "scan_stl"]),
+        Case(id="e", jaw_type="Upper", teeth=[Tooth.trusted(n, ReconstructionType.CROWN) for n in range(11, 19)]),
+    ]
+
+def test_table_stats_match_stats_module():
+    cases = _cases()
+    table = build_case_table(cases)
+    for fn_name in STATS_FUNCTIONS.values():
+        assert getattr(case_table, fn_name)(table) == getattr(stats, fn_name)(cases), fn_name
+
+def test_empty_case_list():
+    table = build_case_table([])
+    for fn_name in STATS_FUNCTIONS.values():
+        assert getattr(case_table, fn_name)(table) == getattr(stats, fn_name)([]), fn_name
+
+def test_adjacency_matches_per_case_counts():
+    cases = _cases()
+    counts = count_adjacency(build_case_table(cases))
+    expected = [stats.count_adjacency(c.teeth)[t.number] for c in cases for t in c.teeth]
+    assert counts.tolist() == expected
+
+def test_jaws_from_bitmask():
+    cases = _cases()
+    codes = classify_jaws(build_case_table(cases))
+    assert [JAW_TYPES[c] for c in codes] == ["Lower", "Mixed", "Upper", "Unknown", "Upper"]
+
+def test_bridge_spans():
+    cases = _cases() + [Case(id="f", teeth=[
+        Tooth.trusted(12, ReconstructionType.CROWN),
+        Tooth.trusted(11, ReconstructionType.PONTIC),
+        Tooth.trusted(21, ReconstructionType.CROWN),
+        Tooth.trusted(41, ReconstructionType.CROWN),
+    ])]
+    spans = bridge_spans(build_case_table(cases))
+    # a: 34-35-36 with a pontic; b: 11-21 across the midline; c: 13 _ 15 is no span; f: 12-11-21 bridge, 41 alone
+    assert spans["spans"].tolist() == [1, 1, 0, 0, 1, 1]
+    assert spans["longest_span"].tolist() == [3, 2, 1, 0, 8, 3]
+    assert spans["bridges"].tolist() == [1, 0, 0, 0, 0, 1]
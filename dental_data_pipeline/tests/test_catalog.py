@@ -0,0 +1,56 @@
+import os
+from dental_data_pipeline.main import compute_stats
+from dental_data_pipeline.src.models import Case, Tooth, ReconstructionType
+import numpy as np
+from dental_data_pipeline.src.case_table import build_case_table
+from dental_data_pipeline.src.catalog import build_catalog, catalog_stats, catalog_table, query_case_dirs, tooth_numbers
+
+def _cases():
+    crown_points = [(float(i), 0.0, 1.0) for i in range(60)]
+    return [
+        Case(id="a", jaw_type="Lower", teeth=[
+            Tooth.trusted(36, ReconstructionType.CROWN, crown_points),
+            Tooth.trusted(35, ReconstructionType.PONTIC),
+        ]),
+        Case(id="b", jaw_type="Mixed", missing_files=["scan_stl"], file_size_mb=0.0, teeth=[
+            Tooth.trusted(46, ReconstructionType.CROWN, crown_points[:20]),
+            Tooth.trusted(11, ReconstructionType.IMPLANT, crown_points),
+        ], scan_vertex_count=1000),
+        Case(id="c", jaw_type="Upper", file_size_mb=12.5, teeth=[
+            Tooth.trusted(26, ReconstructionType.VENEER, crown_points[:55]),
+        ]),
+        Case(id="d", missing_files=["constructionInfo", "scan_stl"]),
+    ]
+
+def test_catalog_stats_match_compute_stats(tmp_path):
+    cases = _cases()
+    path = str(tmp_path / "catalog.sqlite")
+    build_catalog(path, [str(tmp_path / c.id) for c in cases], cases)
+    assert catalog_stats(path) == compute_stats(cases)
+
+def test_catalog_table_round_trip(tmp_path):
+    cases = _cases()
+    path = str(tmp_path / "catalog.sqlite")
+    build_catalog(path, [str(tmp_path / c.id) for c in cases], cases)
+    expected, table = build_case_table(cases), catalog_table(path)
+    for name in expected.__dataclass_fields__:
+        np.testing.assert_array_equal(getattr(table, name), getattr(expected, name), err_msg=name)
+
+def test_query_filters(tmp_path):
+    cases = _cases()
+    case_dirs = [str(tmp_path / c.id) for c in cases]
+    path = str(tmp_path / "catalog.sqlite")
+    build_catalog(path, case_dirs, cases)
+
+    def names(**filters):
+        return [os.path.basename(d) for d in query_case_dirs(path, **filters)]
+
+    lower_molars = tooth_numbers("lower", "molar")
+    assert 36 in lower_molars and 26 not in lower_molars
+    assert names(teeth=lower_molars) == ["a", "b"]
+    # Tooth filters hold for the same tooth: b's lower molar has only 20 points
+    assert names(teeth=lower_molars, reconstruction_type="AnatomicWaxup", min_margin_points=51) == ["a"]
+    assert names(valid_training=True) == ["a"]
+    assert names(complete=True) == ["a", "c"]
+    assert names(jaw_type="Mixed") == ["b"]
+    assert names() == ["a", "b", "c", "d"]
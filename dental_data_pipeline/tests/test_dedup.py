@@ -0,0 +1,44 @@
+import os
+from dental_data_pipeline.src.dedup import find_duplicates, SAMPLE_BLOCK
+
+def _write_case(root, name, stl_bytes, xml_text="<Project/>"):
+    case_dir = root / name
+    case_dir.mkdir()
+    (case_dir / f"{name}.dentalProject").write_text(xml_text)
+    (case_dir / f"{name}-UpperJaw.stl").write_bytes(stl_bytes)
+    return str(case_dir)
+
+def test_duplicate_scans_grouped_and_dropped(tmp_path):
+    scan = os.urandom(10000)
+    dirs = [
+        _write_case(tmp_path, "case_a", scan),
+        _write_case(tmp_path, "case_b", scan),
+        _write_case(tmp_path, "case_c", os.urandom(10000)),
+    ]
+    result = find_duplicates(dirs)
+    assert result["scan_groups"] == [["case_a", "case_b"]]
+    # Identical XML too, so a and b are fully identical cases
+    assert result["case_groups"] == [["case_a", "case_b"]]
+    assert result["dropped"] == 1
+    assert [os.path.basename(d) for d in result["unique_case_dirs"]] == ["case_a", "case_c"]
+
+def test_full_hash_only_on_sample_collision(tmp_path):
+    """Large files equal in size and sampled blocks are told apart by the full hash."""
+    base = bytearray(os.urandom(SAMPLE_BLOCK * 6))
+    other = bytearray(base)
+    other[SAMPLE_BLOCK + 10] ^= 0xFF  # outside the sampled first/middle/last blocks
+    dirs = [
+        _write_case(tmp_path, "case_a", bytes(base), "<A/>"),
+        _write_case(tmp_path, "case_b", bytes(other), "<B/>"),
+        _write_case(tmp_path, "case_c", bytes(base), "<C/>"),
+    ]
+    index_path = str(tmp_path / "index.sqlite")
+    result = find_duplicates(dirs, index_path)
+    assert result["scan_groups"] == [["case_a", "case_c"]]
+    assert result["case_groups"] == []
+    assert result["full_hashed"] == 3
+
+    # Second run is served from the persistent index
+    again = find_duplicates(dirs, index_path)
+    assert again["scan_groups"] == result["scan_groups"]
+    assert again["sample_hashed"] == 0 and again["full_hashed"] == 0
@@ -11,7 +11,7 @@ def test_main_cli_execution_valid_path(tmp_path):
     test_args = ["main.py", "--data-dir", str(d)]
     
     with patch("sys.argv", test_args):
-        with patch("dental_data_pipeline.main.ThreadPoolExecutor") as mock_executor:
+        with patch("dental_data_pipeline.src.ingest.ThreadPoolExecutor") as mock_executor:
             mock_executor.return_value.__enter__.return_value.map.return_value = []
             try:
                 main()
@@ -24,3 +24,44 @@ def test_main_cli_no_args():
     with patch("sys.argv", ["main.py"]):
         with pytest.raises(SystemExit):
              main()
+
+def test_process_cases_executors_agree(tmp_path, mock_dental_project_xml, mock_construction_info_xml):
+    """All executors produce the same cases in the same order."""
+    from dental_data_pipeline.main import compute_stats
+    from dental_data_pipeline.src.ingest import find_case_dirs, process_cases
+    for name in ["case_a", "case_b"]:
+        case_dir = tmp_path / name
+        case_dir.mkdir()
+        (case_dir / f"{name}.dentalProject").write_text(mock_dental_project_xml)
+        (case_dir / f"{name}.constructionInfo").write_text(mock_construction_info_xml)
+
+    case_dirs = sorted(find_case_dirs(str(tmp_path)))
+    threaded = process_cases(case_dirs, "thread", 2)
+    processed = process_cases(case_dirs, "process", 2)
+    staged = process_cases(case_dirs, "staged", 2, io_workers=2, queue_size=1)
+
+    assert [c.id for c in threaded] == ["case_a", "case_b"]
+    assert [c.model_dump() for c in threaded] == [c.model_dump() for c in processed]
+    assert [c.model_dump() for c in threaded] == [c.model_dump() for c in staged]
+    assert compute_stats(threaded)["total_cases"] == 2
+
+def test_main_no_plots(tmp_path, mock_dental_project_xml, mock_construction_info_xml):
+    """--no-plots skips the plot stage and leaves image links out of the report."""
+    data = tmp_path / "data"
+    case_dir = data / "case_a"
+    case_dir.mkdir(parents=True)
+    (case_dir / "case_a.dentalProject").write_text(mock_dental_project_xml)
+    (case_dir / "case_a.constructionInfo").write_text(mock_construction_info_xml)
+    report = tmp_path / "report.md"
+    plots = tmp_path / "plots"
+    test_args = ["main.py", "--data-dir", str(data), "--output", str(report),
+                 "--plots-dir", str(plots), "--no-plots"]
+
+    with patch("sys.argv", test_args):
+        main()
+
+    assert not plots.exists()
+    text = report.read_text()
+    assert "## Jaw Distribution" in text
+    assert "![" not in text
+
@@ -0,0 +1,98 @@
+import os
+import struct
+from dental_data_pipeline.src.gallery import case_fingerprint, build_gallery, write_gallery_pages
+from dental_data_pipeline.src.reporting import generate_markdown_report
+
+def _write_stl(path, triangles):
+    """Binary STL of (a, b, c) vertex triples."""
+    with open(path, "wb") as f:
+        f.write(b"test".ljust(80, b" "))
+        f.write(struct.pack("<I", len(triangles)))
+        for tri in triangles:
+            f.write(struct.pack("<12fH", 0, 0, 0, *[c for v in tri for c in v], 0))
+
+def _make_case(root, name, mock_dental_project_xml, mock_construction_info_xml, stl=True):
+    case_dir = root / name
+    case_dir.mkdir()
+    (case_dir / f"{name}.dentalProject").write_text(mock_dental_project_xml)
+    (case_dir / f"{name}.constructionInfo").write_text(mock_construction_info_xml)
+    if stl:
+        _write_stl(case_dir / f"{name}-UpperJaw.stl", [
+            ((0, 0, 0), (10, 0, 0), (10, 10, 1)),
+            ((0, 0, 0), (10, 10, 1), (0, 10, 0)),
+        ])
+    else:
+        (case_dir / f"{name}-LowerJaw.stl").write_bytes(b"not an stl")
+    return str(case_dir)
+
+def test_fingerprint_tracks_inputs(tmp_path, mock_dental_project_xml, mock_construction_info_xml):
+    case_dir = _make_case(tmp_path, "case_a", mock_dental_project_xml, mock_construction_info_xml)
+    key = case_fingerprint(case_dir, 128)
+    assert case_fingerprint(case_dir, 128) == key
+    assert case_fingerprint(case_dir, 64) != key
+
+    # The dentalProject does not affect the thumbnail, the constructionInfo does
+    (tmp_path / "case_a" / "case_a.dentalProject").write_text("<Project/>")
+    assert case_fingerprint(case_dir, 128) == key
+    (tmp_path / "case_a" / "case_a.constructionInfo").write_text("<ConstructionInfo/>")
+    assert case_fingerprint(case_dir, 128) != key
+
+def test_build_gallery_caches_and_reports_failures(tmp_path, mock_dental_project_xml, mock_construction_info_xml):
+    data = tmp_path / "data"
+    data.mkdir()
+    case_dirs = [
+        _make_case(data, "case_a", mock_dental_project_xml, mock_construction_info_xml),
+        _make_case(data, "case_b", mock_dental_project_xml, mock_construction_info_xml, stl=False),
+    ]
+    gallery_dir = str(tmp_path / "gallery")
+
+    first = build_gallery(case_dirs, gallery_dir, size=32, workers=1)
+    assert (first["cases"], first["rendered"], first["cached"], first["failed"]) == (2, 1, 0, 1)
+    thumbs = os.listdir(os.path.join(gallery_dir, "thumbs"))
+    assert len(thumbs) == 1 and thumbs[0].startswith("case_a-")
+    with open(os.path.join(gallery_dir, "thumbs", thumbs[0]), "rb") as f:
+        assert f.read(8) == b"\x89PNG\r\n\x1a\n"
+    page = open(os.path.join(gallery_dir, first["pages"][0])).read()
+    assert f"thumbs/{thumbs[0]}" in page
+    assert "case_b<br>_render failed" in page
+
+    # Unchanged case is served from the cache; the failed one is retried
+    second = build_gallery(case_dirs, gallery_dir, size=32, workers=1)
+    assert (second["rendered"], second["cached"], second["failed"]) == (0, 1, 1)
+
+def test_build_gallery_removes_thumbnails_of_deleted_cases(tmp_path, mock_dental_project_xml, mock_construction_info_xml):
+    data = tmp_path / "data"
+    data.mkdir()
+    case_dirs = [
+        _make_case(data, name, mock_dental_project_xml, mock_construction_info_xml) for name in ["case_a", "case_b"]
+    ]
+    gallery_dir = str(tmp_path / "gallery")
+    build_gallery(case_dirs, gallery_dir, size=32, workers=1)
+    assert len(os.listdir(os.path.join(gallery_dir, "thumbs"))) == 2
+
+    build_gallery(case_dirs[:1], gallery_dir, size=32, workers=1)
+    thumbs = os.listdir(os.path.join(gallery_dir, "thumbs"))
+    assert len(thumbs) == 1 and thumbs[0].startswith("case_a-")
+
+def test_gallery_pages_paginate(tmp_path):
+    entries = [(f"case_{i}", f"case_{i}-0.png") for i in range(7)]
+    pages = write_gallery_pages(entries, str(tmp_path), page_size=3)
+    assert pages == ["page_0001.md", "page_0002.md", "page_0003.md"]
+    middle = (tmp_path / "page_0002.md").read_text()
+    assert "[Previous](page_0001.md) | [Next](page_0003.md)" in middle
+    assert "case_3" in middle and "case_6" not in middle
+
+    # A smaller re-run removes the pages it no longer needs
+    assert write_gallery_pages(entries[:2], str(tmp_path), page_size=3) == ["page_0001.md"]
+    assert not (tmp_path / "page_0002.md").exists()
+
+def test_report_gallery_section():
+    stats = {
+        "total_cases": 7,
+        "gallery": {"pages": ["page_0001.md", "page_0002.md", "page_0003.md"], "page_size": 3,
+                    "cases": 7, "rendered": 2, "cached": 5, "failed": 0, "dir": "gallery"},
+    }
+    report = generate_markdown_report(stats, plots_dir=None)
+    assert "## Case Gallery" in report
+    assert "[1-3](gallery/page_0001.md) · [4-6](gallery/page_0002.md) · [7-7](gallery/page_0003.md)" in report
+    assert "## Case Gallery" not in generate_markdown_report({"total_cases": 0}, plots_dir=None)
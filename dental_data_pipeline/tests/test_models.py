@@ -33,3 +33,21 @@ def test_tooth_invalid_not_enough_points():
         margin_points=points
     )
     assert t.is_valid_training_sample is False
+
+def test_tooth_trusted_matches_validated():
+    """The trusted fast path builds the same model as full validation."""
+    points = [(float(i), 1.0, 2.0) for i in range(60)]
+    trusted = Tooth.trusted(11, ReconstructionType.CROWN, points)
+    validated = Tooth(number=11, reconstruction_type=ReconstructionType.CROWN, margin_points=points)
+    assert trusted.model_dump() == validated.model_dump()
+    assert Tooth.trusted(12, ReconstructionType.PONTIC).margin_points == []
+
+def test_case_validated_checks_margin_points():
+    """validated() re-checks points that the trusted path attached unchecked."""
+    from dental_data_pipeline.src.models import Case
+    case = Case(id="c", teeth=[Tooth.trusted(11, ReconstructionType.CROWN, [(0.0, 1.0, 2.0)])])
+    assert case.validated().model_dump() == case.model_dump()
+
+    case.teeth[0].margin_points = [(0.0, 1.0)]
+    with pytest.raises(ValueError):
+        case.validated()
@@ -42,3 +42,52 @@ def test_parse_construction_info_valid(tmp_path, mock_construction_info_xml):
 def test_parse_missing_file():
     with pytest.raises(FileNotFoundError):
         parse_dental_project("/non/existent/path.xml")
+
+def test_parse_from_bytes_matches_files(tmp_path, mock_dental_project_xml, mock_construction_info_xml):
+    """The in-memory parsers used by the staged executor agree with the file parsers."""
+    from dental_data_pipeline.src.parsers import parse_dental_project_bytes, parse_construction_info_bytes
+    project = tmp_path / "test.dentalProject"
+    project.write_text(mock_dental_project_xml)
+    construction = tmp_path / "test.constructionInfo"
+    construction.write_text(mock_construction_info_xml)
+
+    from_bytes = parse_dental_project_bytes(project.read_bytes(), "test")
+    assert from_bytes.model_dump() == parse_dental_project(str(project)).model_dump()
+    assert parse_construction_info_bytes(construction.read_bytes()) == parse_construction_info(str(construction))
+
+    with pytest.raises(ValueError):
+        parse_dental_project_bytes(b"<Project><Teeth>", "broken")
+    assert parse_construction_info_bytes(b"not xml") == {}
+
+def test_staged_read_and_parse_missing_files(tmp_path, mock_dental_project_xml):
+    """read_case/parse_case report missing inputs like process_case."""
+    from dental_data_pipeline.src.ingest import read_case, parse_case
+    empty = tmp_path / "empty"
+    empty.mkdir()
+    assert parse_case(read_case(str(empty))).missing_files == ["dentalProject"]
+
+    only_project = tmp_path / "only_project"
+    only_project.mkdir()
+    (only_project / "only_project.dentalProject").write_text(mock_dental_project_xml)
+    case = parse_case(read_case(str(only_project)))
+    assert case.id == "only_project"
+    assert case.missing_files == ["constructionInfo", "scan_stl"]
+
+    corrupt = tmp_path / "corrupt"
+    corrupt.mkdir()
+    (corrupt / "corrupt.dentalProject").write_text("<Project>")
+    assert parse_case(read_case(str(corrupt))).missing_files == ["dentalProject_corrupt"]
+
+def test_parse_dental_project_attaches_margins(tmp_path, mock_dental_project_xml, mock_construction_info_xml):
+    """Margins passed to the parser are attached as the teeth are built."""
+    project = tmp_path / "test.dentalProject"
+    project.write_text(mock_dental_project_xml)
+    construction = tmp_path / "test.constructionInfo"
+    construction.write_text(mock_construction_info_xml)
+
+    margins = parse_construction_info(str(construction))
+    case = parse_dental_project(str(project), margins)
+    by_number = {t.number: t for t in case.teeth}
+    assert by_number[26].margin_points == margins[26]
+    assert by_number[25].margin_points == []
+    assert case.validated().model_dump() == case.model_dump()
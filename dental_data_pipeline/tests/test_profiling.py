@@ -0,0 +1,64 @@
+import csv
+from dental_data_pipeline.src.ingest import find_case_dirs, process_case, process_cases
+from dental_data_pipeline.src.tracing import Tracer, set_tracer
+from dental_data_pipeline.src.reporting import generate_markdown_report
+from dental_data_pipeline.src.profiling import (
+    PROFILE_COLUMNS,
+    build_case_profile,
+    write_case_profile_csv,
+    dump_case_cprofiles,
+    slowest_cases_payload
+)
+
+def _make_cases(root, mock_dental_project_xml, mock_construction_info_xml):
+    for name in ["case_a", "case_b", "case_c"]:
+        case_dir = root / name
+        case_dir.mkdir()
+        (case_dir / f"{name}.dentalProject").write_text(mock_dental_project_xml)
+        if name != "case_c":
+            (case_dir / f"{name}.constructionInfo").write_text(mock_construction_info_xml)
+    return sorted(find_case_dirs(str(root)))
+
+def test_case_profile_rows_and_csv(tmp_path, mock_dental_project_xml, mock_construction_info_xml):
+    data = tmp_path / "data"
+    data.mkdir()
+    case_dirs = _make_cases(data, mock_dental_project_xml, mock_construction_info_xml)
+
+    tracer = Tracer(enabled=True, trace_memory=False)
+    previous = set_tracer(tracer)
+    try:
+        cases = process_cases(case_dirs, "thread", 2)
+    finally:
+        set_tracer(previous)
+
+    rows = build_case_profile(case_dirs, cases, tracer.events)
+    assert sorted(r["case"] for r in rows) == ["case_a", "case_b", "case_c"]
+    assert [r["total_s"] for r in rows] == sorted((r["total_s"] for r in rows), reverse=True)
+    by_case = {r["case"]: r for r in rows}
+    assert by_case["case_a"]["total_s"] >= by_case["case_a"]["margin_parse_s"] > 0
+    assert by_case["case_a"]["construction_info_bytes"] == len(mock_construction_info_xml)
+    assert by_case["case_c"]["margin_parse_s"] == 0.0
+    assert "constructionInfo" in by_case["case_c"]["missing_files"]
+
+    csv_path = tmp_path / "profile.csv"
+    write_case_profile_csv(rows, str(csv_path))
+    with open(csv_path) as f:
+        reader = csv.DictReader(f)
+        assert reader.fieldnames == PROFILE_COLUMNS
+        assert len(list(reader)) == 3
+
+    payload = slowest_cases_payload(rows, 2)
+    assert len(payload["rows"]) == 2
+    assert 0 < payload["share"] <= 1
+    report = generate_markdown_report({"total_cases": 3, "slowest_cases": payload})
+    assert "## Slowest Cases" in report
+    assert f"| {rows[0]['case']} |" in report
+
+def test_dump_case_cprofiles(tmp_path, mock_dental_project_xml, mock_construction_info_xml):
+    data = tmp_path / "data"
+    data.mkdir()
+    case_dirs = _make_cases(data, mock_dental_project_xml, mock_construction_info_xml)
+
+    paths = dump_case_cprofiles(case_dirs[:1], process_case, str(tmp_path / "prof"))
+    assert [p.endswith("case_a.prof") for p in paths] == [True]
+    assert "process_case" in (tmp_path / "prof" / "case_a.txt").read_text()
@@ -0,0 +1,103 @@
+import json
+import os
+import threading
+import urllib.request
+from dental_data_pipeline.main import compute_stats
+from dental_data_pipeline.src.case_table import build_case_table
+from dental_data_pipeline.src.catalog import build_catalog, query_case_dirs, tooth_numbers
+from dental_data_pipeline.src.service import IndexSnapshot, CaseService, case_summary, make_server
+from dental_data_pipeline.tests.test_catalog import _cases
+
+def _snapshot(tmp_path):
+    cases = _cases()
+    case_dirs = [str(tmp_path / c.id) for c in cases]
+    rows = {d: (build_case_table([c]), case_summary(d, c)) for d, c in zip(case_dirs, cases)}
+    return IndexSnapshot(rows), case_dirs, cases
+
+def test_query_matches_catalog(tmp_path):
+    snapshot, case_dirs, cases = _snapshot(tmp_path)
+    path = str(tmp_path / "catalog.sqlite")
+    build_catalog(path, case_dirs, cases)
+    lower_molars = tooth_numbers("lower", "molar")
+    for filters in [
+        {},
+        {"teeth": lower_molars},
+        {"teeth": lower_molars, "reconstruction_type": "AnatomicWaxup", "min_margin_points": 51},
+        {"valid_training": True},
+        {"complete": True},
+        {"jaw_type": "Mixed"},
+        {"reconstruction_type": "NoSuchType"},
+    ]:
+        assert snapshot.query(**filters) == query_case_dirs(path, **filters), filters
+    assert [os.path.basename(d) for d in snapshot.query(missing="constructionInfo")] == ["d"]
+    assert snapshot.stats() == compute_stats(cases)
+
+def test_case_lookup(tmp_path):
+    snapshot, _, _ = _snapshot(tmp_path)
+    case = snapshot.case("a")
+    assert case["teeth"][0] == {"number": 36, "reconstruction_type": "AnatomicWaxup", "margin_points": 60,
+                                "valid_training_sample": True}
+    assert snapshot.case("zzz") is None
+
+def test_http_service_refreshes(tmp_path, mock_dental_project_xml, mock_construction_info_xml):
+    def make(name):
+        case_dir = tmp_path / name
+        case_dir.mkdir()
+        (case_dir / f"{name}.dentalProject").write_text(mock_dental_project_xml)
+
+    make("case_a")
+    service = CaseService(str(tmp_path), use_inotify=False)
+    service.load()
+    server = make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = "http://%s:%d" % server.server_address[:2]
+
+    def get(path):
+        try:
+            with urllib.request.urlopen(base + path) as r:
+                return r.status, json.loads(r.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    try:
+        assert get("/health")[1]["cases"] == 1
+        assert get("/cases?missing=constructionInfo&count=1") == (200, {"count": 1})
+        assert get("/stats")[1]["total_cases"] == 1
+        assert get("/case/case_a")[1]["missing_files"] == ["constructionInfo", "scan_stl"]
+        assert get("/case/nope")[0] == 404
+        assert get("/cases?min_margin_points=x")[0] == 400
+
+        # Only the new folder is parsed; it shows up after it is stable for one poll
+        make("case_b")
+        service.refresh()
+        assert service.refresh() == (1, 0)
+        status, body = get("/cases")
+        assert [os.path.basename(d) for d in body["cases"]] == ["case_a", "case_b"]
+        assert get("/health")[1]["version"] == 2
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+def test_refresh_thread_survives_failed_poll(tmp_path, capsys):
+    service = CaseService(str(tmp_path), use_inotify=False)
+    service.load()
+    calls = []
+    polled = threading.Event()
+
+    def refresh(timeout=0.0):
+        calls.append(timeout)
+        if len(calls) == 1:
+            raise OSError("data dir unavailable")
+        polled.set()
+        service._stop.wait(timeout)
+        return 0, 0
+
+    service.refresh = refresh
+    service.start_refresh(interval=0.01)
+    try:
+        assert polled.wait(5)
+        assert service._thread.is_alive()
+    finally:
+        service.close()
+    assert "Refresh failed: OSError: data dir unavailable" in capsys.readouterr().err
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from dental_data_pipeline.src.sketches import QuantileSketch, sketch_summary, grouped_sketches, RELATIVE_ACCURACY
+from dental_data_pipeline.src.reporting import generate_markdown_report
+
+def test_quantiles_within_relative_error():
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(mean=5.0, sigma=1.0, size=20000)
+    sketch = QuantileSketch.of(values)
+    for q in (0.01, 0.5, 0.9, 0.99):
+        exact = np.quantile(values, q, method="lower")
+        assert abs(sketch.quantile(q) - exact) <= 2 * RELATIVE_ACCURACY * exact
+    assert sketch.count == len(values)
+    assert (sketch.min, sketch.max) == (values.min(), values.max())
+    assert sketch.mean == pytest.approx(values.mean(), rel=1e-12)
+    # Memory is the bucket array, not the values
+    assert len(sketch.counts) < 1000
+
+def test_merge_is_exact():
+    rng = np.random.default_rng(1)
+    values = np.r_[rng.exponential(3.0, 5000), np.zeros(50)]
+    whole = QuantileSketch.of(values)
+    # Per-worker sketches over shuffled shards merge to the same sketch
+    shards = np.array_split(rng.permutation(values), 7)
+    merged = QuantileSketch()
+    for shard in shards[::-1]:
+        merged.merge(QuantileSketch.of(shard))
+    assert sketch_summary(merged) == sketch_summary(whole)
+    np.testing.assert_array_equal(merged.counts, whole.counts)
+    assert merged.sum == whole.sum
+
+    with pytest.raises(ValueError):
+        merged.merge(QuantileSketch(relative_accuracy=0.05))
+
+def test_integers_zeros_and_histogram():
+    sketch = QuantileSketch.of([0, 0, 10, 20, 30, 40])
+    assert sketch.quantile(0.0) == 0
+    assert sketch.quantile(1.0) == 40
+    assert isinstance(sketch.max, int) and sketch.sum == 100
+    histogram = sketch.histogram(4)
+    assert [h[:2] for h in histogram] == [[0, 10], [10, 20], [20, 30], [30, 40]]
+    assert sum(h[2] for h in histogram) == 6
+    assert QuantileSketch.of([7, 7]).histogram() == [[7.0, 7.0, 2]]
+    assert QuantileSketch().quantile(0.5) == 0.0
+
+def test_grouped_sketches():
+    sketches = grouped_sketches(np.array([36, 11, 36, 11, 36]), np.array([60, 20, 80, 30, 70]))
+    assert list(sketches) == [11, 36]
+    assert (sketches[36].count, sketches[36].min, sketches[36].max) == (3, 60, 80)
+
+def test_report_percentiles_and_histograms():
+    margins = QuantileSketch.of(np.arange(50, 150))
+    sizes = QuantileSketch.of([2.5, 10.5])
+    report = generate_markdown_report({
+        "total_cases": 2,
+        "margin_stats": sketch_summary(margins),
+        "file_size_stats": sketch_summary(sizes),
+        "points_per_tooth": {36: {"count": 100, "mean": 99.5, "min": 50, "max": 149, "p50": 99, "p90": 139, "p99": 148}},
+    }, plots_dir=None)
+    assert "- Percentiles: p50: " in report
+    assert "### Margin Points per Tooth Number" in report
+    assert "| 36 | 100 | 99.5 | 99 | 139 | 148 |" in report
+    assert "### File Size (MB)" in report
+    assert "| Range | Count | |" in report
@@ -0,0 +1,91 @@
+import json
+import threading
+import tracemalloc
+from dental_data_pipeline.src.tracing import Tracer, _NULL_SPAN
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer(enabled=False)
+    assert tracer.span("anything") is _NULL_SPAN
+    with tracer.span("anything"):
+        pass
+    assert tracer.events == []
+
+def test_nested_spans_and_summary():
+    tracer = Tracer(enabled=True)
+    try:
+        for _ in range(2):
+            with tracer.span("outer"):
+                with tracer.span("inner", case="c1"):
+                    data = [0] * 100000
+                del data
+    finally:
+        tracer.close()
+    assert not tracemalloc.is_tracing()
+
+    summary = tracer.summary()
+    assert summary["outer"]["count"] == 2
+    assert summary["inner"]["count"] == 2
+    # Child allocations count towards the parent's peak
+    assert summary["outer"]["peak_bytes"] >= summary["inner"]["peak_bytes"] > 0
+    inner = [e for e in tracer.events if e["name"] == "inner"]
+    assert all(e["depth"] == 1 and e["attrs"] == {"case": "c1"} for e in inner)
+
+def test_export_writes_all_formats(tmp_path):
+    tracer = Tracer(enabled=True, trace_memory=False)
+    with tracer.span("stage"):
+        pass
+    paths = tracer.export(str(tmp_path))
+
+    summary = json.loads(open(paths["summary"]).read())
+    assert summary["spans"]["stage"]["count"] == 1
+    chrome = json.loads(open(paths["chrome"]).read())
+    assert chrome["traceEvents"][0]["ph"] == "X"
+    prom = open(paths["prometheus"]).read()
+    assert 'dental_pipeline_span_count{span="stage"} 1' in prom
+
+def test_worker_thread_spans_do_not_reset_peak(tmp_path):
+    tracer = Tracer(enabled=True)
+    started, release = threading.Event(), threading.Event()
+
+    def worker():
+        with tracer.span("case"):
+            started.set()
+            release.wait()
+
+    try:
+        with tracer.span("processing"):
+            thread = threading.Thread(target=worker)
+            thread.start()
+            started.wait()
+            data = bytearray(10 * 2**20)
+            del data
+            release.set()
+            thread.join()
+    finally:
+        tracer.close()
+
+    summary = tracer.summary()
+    # The worker's span cannot attribute the global peak: n/a, not a wrong value
+    assert summary["case"]["peak_bytes"] is None
+    assert summary["processing"]["peak_bytes"] >= 10 * 2**20
+    prom = open(tracer.export(str(tmp_path))["prometheus"]).read()
+    assert 'span_peak_bytes{span="case"}' not in prom
+    assert 'span_peak_bytes{span="processing"}' in prom
+
+def test_main_thread_span_counts_worker_cpu():
+    tracer = Tracer(enabled=True, trace_memory=False)
+
+    def spin():
+        with tracer.span("case"):
+            sum(i * i for i in range(300000))
+
+    with tracer.span("processing"):
+        threads = [threading.Thread(target=spin) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    tracer.close()
+
+    summary = tracer.summary()
+    assert summary["processing"]["cpu_s"] >= 0.9 * summary["case"]["cpu_s"] > 0
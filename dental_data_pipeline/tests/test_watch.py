@@ -0,0 +1,100 @@
+import argparse
+import os
+import shutil
+import pytest
+from unittest.mock import patch
+from dental_data_pipeline.main import main, watch_cases, compute_stats
+from dental_data_pipeline.src.ingest import process_cases
+from dental_data_pipeline.src.case_table import build_case_table, concat_case_tables
+from dental_data_pipeline.src.tracing import Tracer
+from dental_data_pipeline.src.watch import CaseWatcher, inotify_available
+from dental_data_pipeline.tests.test_case_table import _cases
+
+def _make_case(root, name, mock_dental_project_xml, mock_construction_info_xml):
+    case_dir = root / name
+    case_dir.mkdir()
+    (case_dir / f"{name}.dentalProject").write_text(mock_dental_project_xml)
+    (case_dir / f"{name}.constructionInfo").write_text(mock_construction_info_xml)
+    return str(case_dir)
+
+def test_concat_matches_full_table():
+    cases = _cases()
+    full = build_case_table(cases)
+    stacked = concat_case_tables([build_case_table([c]) for c in cases])
+    for field in full.__dataclass_fields__:
+        assert (getattr(stacked, field) == getattr(full, field)).all(), field
+    assert len(concat_case_tables([])) == 0
+
+@pytest.mark.parametrize("use_inotify", [False, True])
+def test_watcher_reports_stable_changes(tmp_path, use_inotify, mock_dental_project_xml, mock_construction_info_xml):
+    if use_inotify and not inotify_available():
+        pytest.skip("inotify not available")
+    a = _make_case(tmp_path, "case_a", mock_dental_project_xml, mock_construction_info_xml)
+    watcher = CaseWatcher(str(tmp_path), use_inotify=use_inotify)
+    assert watcher.mode == ("inotify" if use_inotify else "polling")
+    try:
+        # Reported once its stats are stable for one poll
+        assert watcher.poll(0) == ([], [])
+        assert watcher.poll(0) == ([a], [])
+        assert watcher.poll(0) == ([], [])
+
+        b = _make_case(tmp_path, "case_b", mock_dental_project_xml, mock_construction_info_xml)
+        assert watcher.poll(0.2) == ([], [])
+        assert watcher.poll(0) == ([b], [])
+
+        # Edited files are picked up again, deleted folders reported as removed
+        with open(os.path.join(a, "case_a-UpperJaw.stl"), "wb") as f:
+            f.write(b"solid")
+        shutil.rmtree(b)
+        assert watcher.poll(0.2) == ([], [b])
+        assert watcher.poll(0) == ([a], [])
+    finally:
+        watcher.close()
+
+def test_watch_cases_writes_report(tmp_path, mock_dental_project_xml, mock_construction_info_xml):
+    data = tmp_path / "data"
+    data.mkdir()
+    for name in ["case_a", "case_b"]:
+        _make_case(data, name, mock_dental_project_xml, mock_construction_info_xml)
+    report = tmp_path / "report.md"
+    args = argparse.Namespace(
+        data_dir=str(data), output=str(report), plots_dir=str(tmp_path / "plots"), no_plots=True,
+        executor="thread", workers=2, io_workers=2, queue_size=4,
+        watch_interval=0, watch_polling=True, report_interval=0, trace=False,
+    )
+    watch_cases(args, Tracer(enabled=False), max_polls=2)
+    assert "**Total Cases**: 2" in report.read_text()
+
+def test_watch_stats_match_batch(tmp_path, monkeypatch, mock_dental_project_xml, mock_construction_info_xml):
+    """Stats built from cached per-case rows equal a full batch run."""
+    case_dirs = [_make_case(tmp_path, n, mock_dental_project_xml, mock_construction_info_xml) for n in ["a", "b", "c"]]
+    payloads = []
+    monkeypatch.setattr("dental_data_pipeline.main.write_outputs", lambda payload, *_: payloads.append(payload))
+    args = argparse.Namespace(
+        data_dir=str(tmp_path), executor="thread", workers=2, io_workers=2, queue_size=4,
+        watch_interval=0, watch_polling=True, report_interval=0, trace=False,
+    )
+    watch_cases(args, Tracer(enabled=False), max_polls=2)
+    assert payloads == [compute_stats(process_cases(sorted(case_dirs)))]
+
+def test_watch_rejects_batch_only_options(tmp_path, capsys):
+    for extra in (["--dedupe"], ["--catalog", "c.sqlite"], ["--profile-cases", "3", "--gallery"]):
+        with patch("sys.argv", ["main.py", "--data-dir", str(tmp_path), "--watch"] + extra):
+            with pytest.raises(SystemExit):
+                main()
+        assert "--watch cannot be combined with" in capsys.readouterr().err
+
+def test_watch_exports_and_resets_trace(tmp_path, mock_dental_project_xml, mock_construction_info_xml):
+    data = tmp_path / "data"
+    data.mkdir()
+    _make_case(data, "case_a", mock_dental_project_xml, mock_construction_info_xml)
+    trace_dir = tmp_path / "trace"
+    args = argparse.Namespace(
+        data_dir=str(data), output=str(tmp_path / "report.md"), plots_dir=str(tmp_path / "plots"), no_plots=True,
+        executor="thread", workers=2, io_workers=2, queue_size=4,
+        watch_interval=0, watch_polling=True, report_interval=0, trace=True, trace_dir=str(trace_dir),
+    )
+    tracer = Tracer(enabled=True, trace_memory=False)
+    watch_cases(args, tracer, max_polls=2)
+    assert 'dental_pipeline_span_count{span="processing"} 1' in (trace_dir / "pipeline.prom").read_text()
+    assert tracer.events == []
@@ -8,17 +8,51 @@ Usage:
     python analyze_stl_color.py [path_to_stl_or_case_folder]
     
 If no path provided, analyzes all cases in the data folder.
+
+Survey mode (whole data directory, parallel, summary table):
+    python analyze_stl_color.py --survey data/ --output stl_survey.csv --workers 8
+
+The survey reads binary STLs through mmap: the header ("COLOR=" /
+"MATERIAL=" markers) and the per-face 16-bit attribute words are enough to
+tell whether a scan carries color, without parsing geometry. Only ASCII or
+malformed files fall back to a full trimesh load (--full-fallback).
 """
 
+import argparse
+import csv
+import mmap
+import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-import trimesh
 import numpy as np
 
 # Add parent scripts folder to path
 sys.path.insert(0, str(Path(__file__).parent))
 from dental_utils import load_mesh
 
+STL_HEADER_SIZE = 84  # 80-byte header + uint32 face count
+STL_RECORD = np.dtype([
+    ("normal", "<f4", (3,)),
+    ("vertices", "<f4", (3, 3)),
+    ("attr", "<u2"),
+])
+
+
+def count_unique_colors(colors: np.ndarray) -> int:
+    """
+    Count distinct RGB colors.
+
+    Packs each row into one uint32 (0xRRGGBB) so the count is a 1D unique
+    instead of a row-wise np.unique(axis=0).
+    """
+    if len(colors) == 0:
+        return 0
+    rgb = np.asarray(colors)[:, :3].astype(np.uint32)
+    packed = (rgb[:, 0] << 16) | (rgb[:, 1] << 8) | rgb[:, 2]
+    return int(np.unique(packed).size)
+
 
 def analyze_stl_properties(stl_path: Path) -> dict:
     """
@@ -31,6 +65,8 @@ def analyze_stl_properties(stl_path: Path) -> dict:
         - color_stats: dict with color statistics if present
         - mesh_stats: dict with basic mesh info
     """
+    # The binary survey path never needs trimesh; load it only for full inspection
+    import trimesh
     mesh = trimesh.load(str(stl_path))
     
     result = {
@@ -72,7 +108,7 @@ def analyze_stl_properties(stl_path: Path) -> dict:
                 # Analyze color distribution
                 if len(vc.shape) >= 2 and vc.shape[1] >= 3:
                     # Check if colors vary or are uniform
-                    unique_colors = len(np.unique(vc[:, :3], axis=0))
+                    unique_colors = count_unique_colors(vc)
                     result["unique_vertex_colors"] = unique_colors
                     result["color_variance"] = float(np.var(vc[:, :3]))
                     
@@ -90,7 +126,7 @@ def analyze_stl_properties(stl_path: Path) -> dict:
             if fc is not None and len(fc) > 0:
                 result["has_face_colors"] = True
                 result["face_colors_shape"] = fc.shape
-                unique_fc = len(np.unique(fc[:, :3], axis=0))
+                unique_fc = count_unique_colors(fc)
                 result["unique_face_colors"] = unique_fc
             else:
                 result["has_face_colors"] = False
@@ -163,10 +199,174 @@ def print_analysis(result: dict):
         print("  VERDICT: ✗ This STL is geometry-only (no color/texture)")
 
 
+def inspect_binary_stl(stl_path: Path) -> dict:
+    """
+    Inspect an STL for color without parsing geometry.
+
+    Memory-maps the file and reads only the header and the per-face 16-bit
+    attribute words. Two color conventions exist for binary STL:
+        - Materialise: header contains "COLOR=" (default RGBA) and a face
+          has its own RGB555 color when bit 15 of its attribute is CLEAR
+        - VisCAM/SolidView: a face has RGB555 color when bit 15 is SET
+
+    Returns dict with "format" ("binary", "ascii" or "invalid") and, for
+    binary files, face count, header color marker and attribute statistics.
+    """
+    size = stl_path.stat().st_size
+    result = {"format": "invalid", "num_faces": 0}
+    if size < STL_HEADER_SIZE:
+        return result
+
+    with open(stl_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        header = bytes(mm[:80])
+        num_faces = int(np.frombuffer(mm, dtype="<u4", count=1, offset=80)[0])
+
+        if size != STL_HEADER_SIZE + num_faces * STL_RECORD.itemsize:
+            if header.lstrip().lower().startswith(b"solid"):
+                result["format"] = "ascii"
+            return result
+
+        records = np.frombuffer(mm, dtype=STL_RECORD, count=num_faces, offset=STL_HEADER_SIZE)
+        attr = records["attr"].copy()
+        del records
+
+    result["format"] = "binary"
+    result["num_faces"] = num_faces
+
+    color_pos = header.find(b"COLOR=")
+    result["header_color"] = color_pos >= 0
+    result["header_material"] = b"MATERIAL=" in header
+    if color_pos >= 0 and color_pos + 10 <= len(header):
+        result["header_rgba"] = tuple(header[color_pos + 6:color_pos + 10])
+
+    result["faces_with_attr"] = int(np.count_nonzero(attr))
+    if result["header_color"]:
+        result["color_convention"] = "materialise"
+        colored = attr[(attr & 0x8000) == 0]
+    elif result["faces_with_attr"] and np.any(attr & 0x8000):
+        result["color_convention"] = "viscam"
+        colored = attr[(attr & 0x8000) != 0]
+    else:
+        result["color_convention"] = "none"
+        colored = attr[:0]
+    result["colored_faces"] = int(len(colored))
+    # RGB555 words: one bincount over the 15 color bits gives the palette
+    palette = np.bincount(colored & 0x7FFF, minlength=0x8000)
+    result["unique_colors"] = int(np.count_nonzero(palette))
+    return result
+
+
+def survey_stl(stl_path: Path, full_fallback: bool = False) -> dict:
+    """
+    Survey one STL for color: fast attribute inspection first, full load only
+    for non-binary files (if full_fallback).
+
+    Returns a flat dict (one summary row).
+    """
+    row = {
+        "case": stl_path.parent.name,
+        "filename": stl_path.name,
+        "file_size_mb": stl_path.stat().st_size / (1024 * 1024),
+        "method": "header",
+    }
+    try:
+        info = inspect_binary_stl(stl_path)
+    except (OSError, ValueError) as e:
+        row.update({"format": "invalid", "error": str(e)})
+        return row
+    row.update(info)
+
+    if info["format"] != "binary" and full_fallback:
+        try:
+            full = analyze_stl_properties(stl_path)
+        except Exception as e:
+            row["error"] = str(e)
+        else:
+            row["method"] = "full"
+            row["num_faces"] = full.get("num_faces", 0)
+            row["unique_colors"] = max(full.get("unique_vertex_colors", 0), full.get("unique_face_colors", 0))
+            row["colored_faces"] = row["num_faces"] if full.get("has_face_colors") else 0
+
+    # trimesh reports a default uniform color for every mesh: require variation
+    row["has_color"] = row.get("colored_faces", 0) > 0 and row.get("unique_colors", 0) > 1
+    return row
+
+
+def find_stl_files(data_dir: Path) -> list[Path]:
+    """All STL files below data_dir (any case, any depth)."""
+    return sorted(p for p in data_dir.rglob("*") if p.suffix.lower() == ".stl" and p.is_file())
+
+
+def survey_directory(data_dir: Path, workers: int = None, full_fallback: bool = False) -> list[dict]:
+    """Survey every STL under data_dir in a process pool."""
+    stl_files = find_stl_files(data_dir)
+    if not stl_files:
+        return []
+    full_flags = [full_fallback] * len(stl_files)
+    chunksize = max(1, len(stl_files) // ((workers or os.cpu_count() or 1) * 8))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(survey_stl, stl_files, full_flags, chunksize=chunksize))
+
+
+SURVEY_COLUMNS = [
+    "case", "filename", "file_size_mb", "format", "method", "num_faces",
+    "header_color", "header_material", "header_rgba", "color_convention",
+    "faces_with_attr", "colored_faces", "unique_colors", "has_color", "error",
+]
+
+
+def write_survey(rows: list[dict], output: Path):
+    """Write survey rows to CSV, or Parquet if output ends with .parquet (needs pandas)."""
+    if output.suffix.lower() == ".parquet":
+        import pandas as pd
+        df = pd.DataFrame(rows, columns=SURVEY_COLUMNS)
+        df["header_rgba"] = df["header_rgba"].astype(str)
+        df.to_parquet(output, index=False)
+        return
+
+    with open(output, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SURVEY_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def run_survey(data_dir: Path, output: Path, workers: int = None, full_fallback: bool = False):
+    """Survey a data directory, write the summary and print totals."""
+    t_start = time.time()
+    rows = survey_directory(data_dir, workers, full_fallback)
+    write_survey(rows, output)
+    elapsed = time.time() - t_start
+
+    n_color = sum(1 for r in rows if r.get("has_color"))
+    n_full = sum(1 for r in rows if r.get("method") == "full")
+    n_skipped = sum(1 for r in rows if r.get("format") != "binary" and r.get("method") != "full")
+    print(f"Surveyed {len(rows)} STL files in {elapsed:.1f}s")
+    print(f"  With color: {n_color}")
+    print(f"  Full loads: {n_full}, not inspected (ASCII/invalid): {n_skipped}")
+    print(f"  Summary written to: {output}")
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Analyze STL files for color/texture data")
+    parser.add_argument("target", nargs="?", default=None,
+                        help="STL file or case folder (default: first case in data/)")
+    parser.add_argument("--survey", type=str, default=None,
+                        help="Survey every STL under this data directory")
+    parser.add_argument("--output", type=str, default="stl_survey.csv",
+                        help="Survey summary file (.csv or .parquet)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Survey worker processes (default: CPU count)")
+    parser.add_argument("--full-fallback", action="store_true",
+                        help="Fully load STLs that cannot be inspected from attribute bytes")
+    args = parser.parse_args()
+
+    if args.survey:
+        run_survey(Path(args.survey), Path(args.output), args.workers, args.full_fallback)
+        return
+
     # Determine what to analyze
-    if len(sys.argv) > 1:
-        target = Path(sys.argv[1])
+    if args.target:
+        target = Path(args.target)
     else:
         # Default: analyze first case in data folder
         data_dir = Path(__file__).parent.parent / "data"
@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+Case Dataset - Streaming Loader over Preprocessed Case Arrays
+=============================================================
+Framework-agnostic iterable dataset for training. Cases are exported once
+(STL + XML parsed, margins moved to Scanner Space, vertices labelled) to
+one directory of plain .npy arrays per jaw, which are then read back
+memory-mapped - no XML or STL parsing during training.
+
+On-disk layout:
+    <root>/index.json                  sample list + point counts
+    <root>/<case>__<jaw>/points.npy    (N, 3) float32 vertices
+    <root>/<case>__<jaw>/faces.npy     (F, 3) int32
+    <root>/<case>__<jaw>/labels.npy    (N,) int8 (0=Jaw, 1=Tooth, 2=Gum)
+    <root>/<case>__<jaw>/margins.npy   (M, 3) float32, all teeth concatenated
+    <root>/<case>__<jaw>/margin_offsets.npy  (T+1,) int64 CSR offsets
+    <root>/<case>__<jaw>/tooth_numbers.npy   (T,) int32
+    <root>/<case>__<jaw>/knn_k{k}_d{d}.npy   (N, k) int32, optional (knn_utils.py)
+
+Usage:
+    # Export raw cases
+    python case_dataset.py export data/ preprocessed/
+
+    # Measure loader throughput (samples/s)
+    python case_dataset.py benchmark preprocessed/ --workers 4 --batch-size 8
+
+    # In a training script
+    from case_dataset import CaseArrayDataset, collate_point_sets
+    ds = CaseArrayDataset("preprocessed/", shuffle_buffer=64, num_workers=4)
+    for batch in ds.batches(8):
+        ...
+"""
+
+import argparse
+import json
+import mmap
+import multiprocessing
+import queue
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add scripts directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from margin_utils import resample_margins
+
+INDEX_FILE = "index.json"
+INDEX_VERSION = 1
+DEFAULT_FIELDS = ("points", "labels", "margins", "margin_offsets", "tooth_numbers")
+# Neighbour graph of a field (knn_utils.ensure_knn): "knn_k8_d1" for points, "<field>_knn_k8_d1" otherwise
+KNN_KEY = re.compile(r"^(?:(?P<field>.+)_)?knn_k\d+_d\d+$")
+
+
+# =============================================================================
+# Export
+# =============================================================================
+
+def write_sample(out_dir: Path, arrays: dict) -> None:
+    """Write one sample as a directory of .npy files."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for name, arr in arrays.items():
+        np.save(out_dir / f"{name}.npy", np.ascontiguousarray(arr))
+
+
+def export_case(case_dir: Path, out_root: Path) -> list[dict]:
+    """
+    Export both jaws of a raw case folder to per-jaw array directories.
+
+    Returns the index entries ({"id", "num_points"}) of the written samples.
+    """
+    from dental_utils import load_teeth, load_mesh, transform_points, classify_vertices
+
+    case_name = case_dir.name
+    xml_file = case_dir / f"{case_name}.constructionInfo"
+    if not xml_file.exists():
+        return []
+    teeth = [t for t in load_teeth(str(xml_file)) if len(t["margin_points"]) > 0]
+
+    entries = []
+    for jaw, stl_name in (("upper", "UpperJaw"), ("lower", "LowerJaw")):
+        stl_file = case_dir / f"{case_name}-{stl_name}.stl"
+        jaw_teeth = [t for t in teeth if t["jaw"] == jaw]
+        if not stl_file.exists() or not jaw_teeth:
+            continue
+
+        mesh = load_mesh(str(stl_file))
+        margins = [
+            transform_points(t["margin_points"], np.linalg.inv(t["transform_matrix"]))
+            for t in jaw_teeth
+        ]
+        offsets = np.concatenate([[0], np.cumsum([len(m) for m in margins])])
+
+        sample_id = f"{case_name}__{jaw}"
+        write_sample(out_root / sample_id, {
+            "points": np.asarray(mesh.vertices, dtype=np.float32),
+            "faces": np.asarray(mesh.faces, dtype=np.int32),
+            "labels": classify_vertices(mesh, jaw_teeth).astype(np.int8),
+            "margins": np.vstack(margins).astype(np.float32),
+            "margin_offsets": offsets.astype(np.int64),
+            "tooth_numbers": np.array([t["number"] for t in jaw_teeth], dtype=np.int32),
+        })
+        entries.append({"id": sample_id, "num_points": len(mesh.vertices)})
+    return entries
+
+
+def write_index(out_root: Path, entries: list[dict]) -> None:
+    """Write the sample index for a preprocessed root."""
+    entries = sorted(entries, key=lambda e: e["id"])
+    with open(out_root / INDEX_FILE, "w") as f:
+        json.dump({"version": INDEX_VERSION, "samples": entries}, f, indent=1)
+
+
+def read_index(root: Path) -> list[dict]:
+    """Read the sample index, or rebuild it from sample folders if missing."""
+    index_path = root / INDEX_FILE
+    if index_path.exists():
+        with open(index_path) as f:
+            return json.load(f)["samples"]
+    return [{"id": d.name, "num_points": None} for d in sorted(root.iterdir()) if d.is_dir()]
+
+
+# =============================================================================
+# Loading
+# =============================================================================
+
+def load_sample(sample_dir: Path, fields=DEFAULT_FIELDS, mmap: bool = True) -> dict:
+    """Load one sample; arrays are memory-mapped unless mmap=False."""
+    sample = {"id": sample_dir.name}
+    for name in fields:
+        sample[name] = np.load(sample_dir / f"{name}.npy", mmap_mode="r" if mmap else None)
+    return sample
+
+
+def prefault(sample: dict) -> dict:
+    """
+    Fault in the pages of a sample's memory-mapped arrays (madvise WILLNEED,
+    then one read per page), so the I/O happens in the prefetch worker
+    rather than in the consumer's collate.
+    """
+    for arr in sample.values():
+        if not isinstance(arr, np.memmap) or not arr.size:
+            continue
+        if hasattr(arr._mmap, "madvise") and hasattr(mmap, "MADV_WILLNEED"):
+            arr._mmap.madvise(mmap.MADV_WILLNEED)
+        flat = np.asarray(arr).reshape(-1).view(np.uint8)
+        int(flat[::mmap.PAGESIZE].sum())
+    return sample
+
+
+def _put(out_queue, item, stop) -> bool:
+    """Blocking put that gives up once stop is set (thread workers); False if stopped."""
+    if stop is None:
+        out_queue.put(item)
+        return True
+    while not stop.is_set():
+        try:
+            out_queue.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _worker_loop(sample_dirs: list, fields: tuple, mmap: bool, out_queue, stop=None) -> None:
+    """
+    Load a fixed shard in order, then signal completion with None.
+    Memory-mapped samples are prefaulted before they are queued; with stop
+    (a threading.Event), the worker exits once the consumer has gone away.
+    """
+    try:
+        for sample_dir in sample_dirs:
+            sample = load_sample(Path(sample_dir), fields, mmap)
+            if mmap:
+                prefault(sample)
+            if not _put(out_queue, sample, stop):
+                return
+    except Exception as e:
+        if not _put(out_queue, e, stop):
+            return
+    _put(out_queue, None, stop)
+
+
+def collate_point_sets(samples: list[dict], pad: bool = False, margin_k: int = None) -> dict:
+    """
+    Collate variable-size samples into one batch.
+
+    Per-point fields ("points", "labels", ...) are concatenated with a
+    "point_offsets" (B+1,) CSR array and a per-point "batch" index.
+    Neighbour graphs of the points ("knn_k{k}_d{d}") are re-based onto the
+    concatenated points; padded, they keep per-sample indices and pad rows
+    are -1. Graphs of other fields ("<field>_knn_k{k}_d{d}") are always
+    concatenated, re-based by the row count of that field's graph.
+    Margins are concatenated with per-batch tooth offsets. With pad=True,
+    per-point fields are instead padded to (B, N_max, ...) with a "mask".
+    With margin_k, margins are also resampled to a dense (T, margin_k, 3)
+    "margin_curves" array (see margin_utils.resample_margins).
+    """
+    batch = {"ids": [s["id"] for s in samples]}
+    sizes = np.array([len(s["points"]) for s in samples], dtype=np.int64)
+    graphs = {k: m.group("field") or "points" for k in samples[0] for m in [KNN_KEY.match(k)] if m}
+    point_fields = [k for k in samples[0] if k in ("points", "labels") or graphs.get(k) == "points"]
+
+    if pad:
+        n_max = int(sizes.max()) if len(sizes) else 0
+        batch["mask"] = np.arange(n_max)[None, :] < sizes[:, None]
+        for key in point_fields:
+            first = samples[0][key]
+            out = np.full((len(samples), n_max) + first.shape[1:], -1 if key in graphs else 0, dtype=first.dtype)
+            for i, s in enumerate(samples):
+                out[i, :len(s[key])] = s[key]
+            batch[key] = out
+    else:
+        batch["point_offsets"] = np.concatenate([[0], np.cumsum(sizes)])
+        batch["batch"] = np.repeat(np.arange(len(samples)), sizes)
+        for key in point_fields:
+            if key not in graphs:
+                batch[key] = np.concatenate([s[key] for s in samples])
+
+    for key in graphs:
+        if key in batch:
+            continue
+        # One graph row per element of its field, so the row counts give the field offsets
+        bases = np.concatenate([[0], np.cumsum([len(s[key]) for s in samples])[:-1]])
+        batch[key] = np.concatenate([np.asarray(s[key]) + s[key].dtype.type(base) for s, base in zip(samples, bases)])
+
+    if "margins" in samples[0]:
+        batch["margins"] = np.concatenate([s["margins"] for s in samples])
+        # Re-base each sample's tooth offsets onto the concatenated margins
+        offsets, base = [np.zeros(1, dtype=np.int64)], 0
+        for s in samples:
+            offsets.append(np.asarray(s["margin_offsets"][1:]) + base)
+            base += len(s["margins"])
+        batch["margin_offsets"] = np.concatenate(offsets)
+        if margin_k:
+            batch["margin_curves"] = resample_margins(
+                batch["margins"], batch["margin_offsets"], k=margin_k
+            ).astype(np.float32)
+    if "tooth_numbers" in samples[0]:
+        batch["tooth_numbers"] = np.concatenate([s["tooth_numbers"] for s in samples])
+    return batch
+
+
+class CaseArrayDataset:
+    """
+    Iterable dataset over a preprocessed root with prefetching workers.
+
+    Sample order is fully deterministic for a given (seed, epoch):
+        1. the sample list is permuted with the epoch seed (if shuffle)
+        2. the shard for this rank is taken (shard_index::num_shards)
+        3. each worker gets a fixed sub-shard (worker::num_workers) and the
+           outputs are interleaved round-robin
+        4. a seeded shuffle buffer mixes the stream
+
+    Args:
+        root: Preprocessed root (see export)
+        fields: Which arrays to load per sample
+        shuffle: Permute the sample order each epoch
+        shuffle_buffer: Size of the streaming shuffle buffer (0 = off)
+        seed: Base seed; epoch e uses seed + e
+        num_workers: Prefetch workers (0 = load in the calling thread)
+        worker_type: "thread" (zero-copy memmaps) or "process"
+        prefetch: Max samples queued per worker
+        shard_index, num_shards: Rank-level sharding (e.g. distributed training)
+    """
+
+    def __init__(
+        self,
+        root,
+        fields=DEFAULT_FIELDS,
+        shuffle: bool = True,
+        shuffle_buffer: int = 0,
+        seed: int = 0,
+        num_workers: int = 2,
+        worker_type: str = "thread",
+        prefetch: int = 4,
+        shard_index: int = 0,
+        num_shards: int = 1
+    ):
+        if worker_type not in ("thread", "process"):
+            raise ValueError(f"Unknown worker_type: {worker_type}")
+        if not 0 <= shard_index < num_shards:
+            raise ValueError(f"Invalid shard {shard_index} of {num_shards}")
+
+        self.root = Path(root)
+        self.samples = read_index(self.root)
+        self.fields = tuple(fields)
+        self.shuffle = shuffle
+        self.shuffle_buffer = shuffle_buffer
+        self.seed = seed
+        self.num_workers = num_workers
+        self.worker_type = worker_type
+        self.prefetch = prefetch
+        self.shard_index = shard_index
+        self.num_shards = num_shards
+        self.epoch = 0
+
+    def set_epoch(self, epoch: int) -> None:
+        """Select the epoch used for shuffling (call before each epoch)."""
+        self.epoch = epoch
+
+    def shard_order(self) -> list[str]:
+        """Sample ids this shard will read this epoch, before worker split."""
+        ids = [s["id"] for s in self.samples]
+        if self.shuffle:
+            perm = np.random.default_rng(self.seed + self.epoch).permutation(len(ids))
+            ids = [ids[i] for i in perm]
+        return ids[self.shard_index::self.num_shards]
+
+    def __len__(self) -> int:
+        return len(self.shard_order())
+
+    def _stream(self):
+        """Yield samples in deterministic worker round-robin order."""
+        dirs = [str(self.root / sid) for sid in self.shard_order()]
+        # Process workers cannot share memmaps; load into memory instead
+        mmap = self.worker_type == "thread"
+
+        if self.num_workers <= 0:
+            for d in dirs:
+                yield load_sample(Path(d), self.fields)
+            return
+
+        n = min(self.num_workers, len(dirs))
+        stop = threading.Event()
+        if self.worker_type == "thread":
+            queues = [queue.Queue(maxsize=self.prefetch) for _ in range(n)]
+            workers = [
+                threading.Thread(
+                    target=_worker_loop, args=(dirs[w::n], self.fields, mmap, queues[w], stop), daemon=True
+                )
+                for w in range(n)
+            ]
+        else:
+            ctx = multiprocessing.get_context()
+            queues = [ctx.Queue(maxsize=self.prefetch) for _ in range(n)]
+            workers = [
+                ctx.Process(target=_worker_loop, args=(dirs[w::n], self.fields, mmap, queues[w]), daemon=True)
+                for w in range(n)
+            ]
+        for w in workers:
+            w.start()
+
+        try:
+            active = list(range(n))
+            while active:
+                for w in list(active):
+                    item = queues[w].get()
+                    if item is None:
+                        active.remove(w)
+                    elif isinstance(item, Exception):
+                        raise item
+                    else:
+                        yield item
+        finally:
+            # Consumer done or gone (break, dropped generator): release blocked workers
+            stop.set()
+            if self.worker_type == "process":
+                for w in workers:
+                    w.terminate()
+
+    def __iter__(self):
+        stream = self._stream()
+        if self.shuffle_buffer <= 1:
+            yield from stream
+            return
+
+        rng = np.random.default_rng(self.seed + self.epoch + 1)
+        buffer = []
+        for item in stream:
+            if len(buffer) < self.shuffle_buffer:
+                buffer.append(item)
+                continue
+            i = int(rng.integers(len(buffer)))
+            yield buffer[i]
+            buffer[i] = item
+        order = rng.permutation(len(buffer))
+        for i in order:
+            yield buffer[i]
+
+    def batches(self, batch_size: int, pad: bool = False, drop_last: bool = False, margin_k: int = None):
+        """Iterate over collated batches (see collate_point_sets)."""
+        pending = []
+        for sample in self:
+            pending.append(sample)
+            if len(pending) == batch_size:
+                yield collate_point_sets(pending, pad=pad, margin_k=margin_k)
+                pending = []
+        if pending and not drop_last:
+            yield collate_point_sets(pending, pad=pad, margin_k=margin_k)
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def benchmark(root: Path, batch_size: int, workers: int, worker_type: str,
+              shuffle_buffer: int, epochs: int) -> float:
+    """Run full passes over the dataset and return samples/s."""
+    ds = CaseArrayDataset(root, num_workers=workers, worker_type=worker_type,
+                          shuffle_buffer=shuffle_buffer)
+    n_samples = 0
+    n_points = 0
+    t_start = time.perf_counter()
+    for epoch in range(epochs):
+        ds.set_epoch(epoch)
+        for batch in ds.batches(batch_size):
+            n_samples += len(batch["ids"])
+            n_points += len(batch["points"])
+    elapsed = time.perf_counter() - t_start
+
+    rate = n_samples / elapsed if elapsed > 0 else 0.0
+    print(f"  Workers: {workers} ({worker_type}), batch size: {batch_size}")
+    print(f"  {n_samples} samples, {n_points:,} points in {elapsed:.2f}s")
+    print(f"  Throughput: {rate:.1f} samples/s ({n_points / max(elapsed, 1e-9):,.0f} points/s)")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export and stream preprocessed case arrays")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_export = sub.add_parser("export", help="Export raw case folders to arrays")
+    p_export.add_argument("data_dir", type=str, help="Directory containing case folders")
+    p_export.add_argument("out_dir", type=str, help="Preprocessed output root")
+
+    p_bench = sub.add_parser("benchmark", help="Measure loader throughput")
+    p_bench.add_argument("root", type=str, help="Preprocessed root")
+    p_bench.add_argument("--batch-size", type=int, default=8)
+    p_bench.add_argument("--workers", type=int, default=4)
+    p_bench.add_argument("--worker-type", choices=["thread", "process"], default="thread")
+    p_bench.add_argument("--shuffle-buffer", type=int, default=16)
+    p_bench.add_argument("--epochs", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.command == "export":
+        data_dir, out_dir = Path(args.data_dir), Path(args.out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        entries = []
+        for case_dir in sorted(d for d in data_dir.iterdir() if d.is_dir()):
+            try:
+                written = export_case(case_dir, out_dir)
+            except Exception as e:
+                print(f"  Skipping {case_dir.name}: {e}")
+                continue
+            entries.extend(written)
+            print(f"  {case_dir.name}: {len(written)} jaw(s)")
+        write_index(out_dir, entries)
+        print(f"Exported {len(entries)} samples to {out_dir}")
+    else:
+        benchmark(Path(args.root), args.batch_size, args.workers, args.worker_type,
+                  args.shuffle_buffer, args.epochs)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,285 @@
+"""
+Curve Extraction - Per-Vertex Scores to Ordered Margin Curves
+==============================================================
+Converts model output (one score per jaw vertex) into ordered, closed
+3D margin polylines comparable to the margins returned by load_teeth().
+
+Two extraction methods:
+    - "ridge":     threshold the heatmap, split the band into connected
+                   components and collapse each band to a centre line
+                   (for per-vertex probability / heatmap outputs)
+    - "level_set": trace the iso-contour of the scores on mesh edges
+                   (for distance-field / signed outputs)
+
+Everything is vectorised over the whole jaw; there is no per-vertex
+Python loop, so a full 300k-vertex arch runs in a fraction of a second.
+
+Usage:
+    from curve_utils import extract_margin_curves, match_curves_to_teeth
+"""
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse import csgraph
+
+from dental_utils import transform_points
+from topology_utils import mesh_edges, vertex_adjacency, adjacency_matrix
+
+
+def _order_components(graph: sparse.csr_matrix, labels: np.ndarray, n_components: int) -> list[tuple[np.ndarray, bool]]:
+    """
+    Walk each component of a graph made of simple paths/cycles.
+
+    Returns a list of (ordered node indices, is_closed) per component.
+    """
+    degree = np.diff(graph.indptr)
+    order = np.argsort(labels, kind="stable")
+    bounds = np.searchsorted(labels[order], np.arange(n_components + 1))
+
+    walks = []
+    for c in range(n_components):
+        nodes = order[bounds[c]:bounds[c + 1]]
+        ends = nodes[degree[nodes] == 1]
+        start = ends[0] if len(ends) else nodes[0]
+        # On a path or a cycle, DFS visits nodes in curve order
+        walk = csgraph.depth_first_order(graph, start, directed=False, return_predecessors=False)
+        walks.append((walk, len(ends) == 0 and len(walk) > 2))
+    return walks
+
+
+def extract_level_set(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    scores: np.ndarray,
+    level: float = 0.0,
+    closed_only: bool = True,
+    topology: dict = None
+) -> list[np.ndarray]:
+    """
+    Trace the iso-contour scores == level across the mesh.
+
+    Every mesh edge whose endpoints lie on opposite sides of the level gets
+    one interpolated crossing point; each face crossed by the contour links
+    its two crossing points. Connected chains are returned as ordered Nx3
+    polylines.
+
+    Args:
+        vertices: (N, 3) mesh vertices
+        faces: (F, 3) triangle indices
+        scores: (N,) per-vertex scalar field
+        level: iso value to extract
+        closed_only: drop open chains (contours cut by a mesh boundary)
+        topology: cached topology_utils topology of the mesh (skips edge building)
+
+    Returns:
+        List of (M, 3) ordered polylines, longest first
+    """
+    vertices = np.asarray(vertices, dtype=float)
+    scores = np.asarray(scores, dtype=float)
+    if topology is not None:
+        edges, face_edges = np.asarray(topology["edges"]), np.asarray(topology["face_edges"])
+    else:
+        edges, face_edges = mesh_edges(faces)
+
+    above = scores >= level
+    crossing = above[edges[:, 0]] != above[edges[:, 1]]
+    if not np.any(crossing):
+        return []
+
+    # Interpolated crossing point on each crossed edge
+    cross_idx = np.flatnonzero(crossing)
+    a, b = edges[cross_idx, 0], edges[cross_idx, 1]
+    alpha = (level - scores[a]) / (scores[b] - scores[a])
+    points = vertices[a] + alpha[:, None] * (vertices[b] - vertices[a])
+
+    # A crossed face always has exactly two crossed sides: link them
+    node_of_edge = np.full(len(edges), -1, dtype=np.int64)
+    node_of_edge[cross_idx] = np.arange(len(cross_idx))
+    face_nodes = node_of_edge[face_edges]
+    face_nodes = face_nodes[(face_nodes >= 0).sum(axis=1) == 2]
+    face_nodes = np.sort(face_nodes, axis=1)[:, 1:]
+
+    n = len(cross_idx)
+    graph = sparse.coo_matrix(
+        (np.ones(len(face_nodes), dtype=bool), (face_nodes[:, 0], face_nodes[:, 1])),
+        shape=(n, n)
+    )
+    graph = (graph + graph.T).tocsr()
+    n_components, labels = csgraph.connected_components(graph, directed=False)
+
+    curves = [
+        points[walk]
+        for walk, closed in _order_components(graph, labels, n_components)
+        if closed or not closed_only
+    ]
+    curves.sort(key=len, reverse=True)
+    return curves
+
+
+def extract_ridge_curves(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    scores: np.ndarray,
+    threshold: float = 0.5,
+    n_bins: int = 128,
+    min_vertices: int = 20,
+    topology: dict = None
+) -> list[np.ndarray]:
+    """
+    Collapse thresholded heatmap bands into ordered closed centre lines.
+
+    Vertices with score >= threshold are split into connected components on
+    the mesh graph. Each component (one margin band) is projected onto its
+    best-fit plane, binned by angle around its centroid and reduced to the
+    score-weighted mean position per bin. All components are processed in
+    one batched pass.
+
+    Args:
+        vertices: (N, 3) mesh vertices
+        faces: (F, 3) triangle indices
+        scores: (N,) per-vertex margin score
+        threshold: minimum score for a vertex to belong to a band
+        n_bins: angular resolution of each output loop (max points)
+        min_vertices: ignore bands with fewer vertices (noise)
+        topology: cached topology_utils topology of the mesh (skips adjacency building)
+
+    Returns:
+        List of (M, 3) ordered closed polylines, largest band first
+    """
+    vertices = np.asarray(vertices, dtype=float)
+    scores = np.asarray(scores, dtype=float)
+
+    selected = np.flatnonzero(scores >= threshold)
+    if len(selected) == 0:
+        return []
+
+    adj = adjacency_matrix(topology) if topology is not None else vertex_adjacency(len(vertices), faces)
+    adj = adj[selected][:, selected]
+    n_components, labels = csgraph.connected_components(adj, directed=False)
+
+    sizes = np.bincount(labels, minlength=n_components)
+    keep = sizes >= min_vertices
+    if not np.any(keep):
+        return []
+    remap = np.cumsum(keep) - 1
+    in_kept = keep[labels]
+    labels = remap[labels[in_kept]]
+    n_components = int(keep.sum())
+
+    pts = vertices[selected[in_kept]]
+    w = np.maximum(scores[selected[in_kept]], 1e-12)
+
+    # Weighted centroid per band
+    w_sum = np.bincount(labels, weights=w, minlength=n_components)
+    centroids = np.stack(
+        [np.bincount(labels, weights=w * pts[:, k], minlength=n_components) for k in range(3)],
+        axis=1
+    ) / w_sum[:, None]
+
+    # Batched best-fit plane: smallest eigenvector of each band's covariance
+    centered = pts - centroids[labels]
+    outer = (centered[:, :, None] * centered[:, None, :]).reshape(-1, 9)
+    cov = np.stack(
+        [np.bincount(labels, weights=w * outer[:, k], minlength=n_components) for k in range(9)],
+        axis=1
+    ).reshape(-1, 3, 3)
+    _, eigvecs = np.linalg.eigh(cov)
+    normals = eigvecs[:, :, 0]
+    # Consistent winding: loops run counter-clockwise seen from +Z
+    normals[normals[:, 2] < 0] *= -1
+    u = eigvecs[:, :, 2]
+    v = np.cross(normals, u)
+
+    angles = np.arctan2(
+        np.einsum("ij,ij->i", centered, v[labels]),
+        np.einsum("ij,ij->i", centered, u[labels])
+    )
+    bins = np.minimum(((angles + np.pi) / (2 * np.pi) * n_bins).astype(np.int64), n_bins - 1)
+    slot = labels * n_bins + bins
+
+    n_slots = n_components * n_bins
+    slot_w = np.bincount(slot, weights=w, minlength=n_slots)
+    slot_pts = np.stack(
+        [np.bincount(slot, weights=w * pts[:, k], minlength=n_slots) for k in range(3)],
+        axis=1
+    )
+    filled = slot_w > 0
+    slot_pts[filled] /= slot_w[filled, None]
+
+    slot_pts = slot_pts.reshape(n_components, n_bins, 3)
+    filled = filled.reshape(n_components, n_bins)
+    order = np.argsort(-sizes[keep], kind="stable")
+    return [slot_pts[c][filled[c]] for c in order if filled[c].sum() >= 3]
+
+
+def extract_margin_curves(
+    mesh,
+    scores: np.ndarray,
+    threshold: float = 0.5,
+    method: str = "ridge",
+    transform_matrix: np.ndarray = None,
+    **kwargs
+) -> list[np.ndarray]:
+    """
+    Extract ordered closed margin curves from per-vertex scores on a jaw.
+
+    Args:
+        mesh: Jaw mesh from dental_utils.load_mesh() (Scanner Space)
+        scores: (N,) per-vertex score, one per mesh vertex
+        threshold: Heatmap threshold ("ridge") or iso value ("level_set")
+        method: "ridge" or "level_set"
+        transform_matrix: Optional Scanner -> Design matrix (as in load_teeth);
+                          if given, curves are returned in Design Space
+        **kwargs: Passed to extract_ridge_curves / extract_level_set
+                  (e.g. topology=load_topology(stl_path) to reuse cached connectivity)
+
+    Returns:
+        List of (M, 3) ordered closed curves, largest first
+    """
+    scores = np.asarray(scores)
+    if len(scores) != len(mesh.vertices):
+        raise ValueError(f"Expected {len(mesh.vertices)} scores, got {len(scores)}")
+
+    if method == "ridge":
+        curves = extract_ridge_curves(mesh.vertices, mesh.faces, scores, threshold, **kwargs)
+    elif method == "level_set":
+        curves = extract_level_set(mesh.vertices, mesh.faces, scores, threshold, **kwargs)
+    else:
+        raise ValueError(f"Unknown method: {method}")
+
+    if transform_matrix is not None:
+        curves = [transform_points(c, transform_matrix) for c in curves]
+    return curves
+
+
+def match_curves_to_teeth(curves: list, teeth: list, max_distance: float = 10.0) -> dict:
+    """
+    Assign Scanner Space curves to teeth from load_teeth() by centroid.
+
+    Each tooth gets the curve whose centroid is nearest to its margin
+    centroid, converted to the tooth's Design Space so it can be compared
+    directly with tooth["margin_points"].
+
+    Args:
+        curves: Scanner Space curves from extract_margin_curves()
+        teeth: List of tooth dicts from dental_utils.load_teeth()
+        max_distance: Ignore matches farther than this (mm)
+
+    Returns:
+        Dict {tooth_number: (M, 3) curve in Design Space}
+    """
+    if not curves:
+        return {}
+    curve_centroids = np.array([c.mean(axis=0) for c in curves])
+
+    matches = {}
+    for tooth in teeth:
+        if len(tooth["margin_points"]) < 3:
+            continue
+        inv_mat = np.linalg.inv(tooth["transform_matrix"])
+        centroid = transform_points(tooth["margin_points"].mean(axis=0).reshape(1, 3), inv_mat)[0]
+        dists = np.linalg.norm(curve_centroids - centroid, axis=1)
+        best = int(np.argmin(dists))
+        if dists[best] <= max_distance:
+            matches[tooth["number"]] = transform_points(curves[best], tooth["transform_matrix"])
+    return matches
@@ -9,9 +9,13 @@ Usage:
 """
 
 import numpy as np
-import trimesh
 import xml.etree.ElementTree as ET
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+# trimesh is imported on first mesh load, so XML-only callers start fast
+if TYPE_CHECKING:
+    import trimesh
 
 
 def load_teeth(xml_path: str) -> list[dict]:
@@ -77,12 +81,17 @@ def load_teeth(xml_path: str) -> list[dict]:
     return teeth
 
 
-def load_mesh(stl_path: str) -> trimesh.Trimesh:
-    """Load STL file as trimesh object."""
+def load_mesh(stl_path: str) -> "trimesh.Trimesh":
+    """Load STL file (or its .qmesh conversion, see mesh_format.py) as trimesh object."""
+    import trimesh
+    if str(stl_path).endswith(".qmesh"):
+        from mesh_format import load_qmesh
+        vertices, faces = load_qmesh(stl_path)
+        return trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
     return trimesh.load(str(stl_path))
 
 
-def align_mesh(mesh: trimesh.Trimesh, matrix: np.ndarray) -> trimesh.Trimesh:
+def align_mesh(mesh: "trimesh.Trimesh", matrix: np.ndarray) -> "trimesh.Trimesh":
     """
     Apply transformation matrix to mesh (Scanner Space → Design Space).
     Returns a NEW mesh, does not modify the original.
@@ -92,7 +101,7 @@ def align_mesh(mesh: trimesh.Trimesh, matrix: np.ndarray) -> trimesh.Trimesh:
     return aligned
 
 
-def compute_distances(mesh: trimesh.Trimesh, points: np.ndarray) -> np.ndarray:
+def compute_distances(mesh: "trimesh.Trimesh", points: np.ndarray) -> np.ndarray:
     """
     Compute distance from each point to the nearest mesh surface.
     Returns array of distances (same length as points).
@@ -126,7 +135,7 @@ def transform_points(points: np.ndarray, matrix: np.ndarray) -> np.ndarray:
     return transformed[:, :3]
 
 
-def classify_vertices(mesh: trimesh.Trimesh, teeth: list) -> np.ndarray:
+def classify_vertices(mesh: "trimesh.Trimesh", teeth: list) -> np.ndarray:
     """
     Classify vertices as Gum (0) or Tooth (1) based on margin geometry.
     
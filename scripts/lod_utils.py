@@ -0,0 +1,220 @@
+"""
+Level-of-Detail Utilities - Cached Decimated Jaw Meshes
+=======================================================
+Builds quadric-decimated levels of detail (LODs) for jaw scans and caches
+them on disk, together with the full-resolution vertex labels and margin
+distances derived from them. Once cached, the viewer opens a dense
+intraoral scan at a LOD without parsing the STL; the full-resolution mesh
+is only loaded for a --focus-tooth patch (or to fill a cache miss).
+
+Each LOD stores, besides vertices and faces, the index of the nearest
+full-resolution vertex for every decimated vertex ("source_index"), which
+is what per-vertex labels and colours are transferred through.
+
+Cache files live next to the scans (or in cache_dir) and are keyed by a
+fingerprint of the STL (and XML for labels), so edits invalidate them.
+
+Usage:
+    from lod_utils import load_lods, load_labels, load_distances, transfer_vertex_data, split_focus_region
+"""
+
+import hashlib
+from pathlib import Path
+
+import numpy as np
+import trimesh
+from scipy.spatial import cKDTree
+
+from dental_utils import load_mesh
+
+DEFAULT_RATIOS = (0.25, 0.05)
+CACHE_DIR_NAME = ".lod_cache"
+
+
+def file_fingerprint(path) -> str:
+    """Short fingerprint from file size + modification time."""
+    stat = Path(path).stat()
+    key = f"{Path(path).name}:{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.sha1(key.encode()).hexdigest()[:12]
+
+
+def _cluster_decimate(vertices: np.ndarray, faces: np.ndarray, target_faces: int) -> tuple[np.ndarray, np.ndarray]:
+    """Vertex-clustering fallback when no quadric decimator is installed."""
+    mesh = trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
+    # A regular triangulation has ~2 faces per vertex
+    cell = np.sqrt(mesh.area / max(target_faces / 2, 1))
+    keys = np.floor((vertices - vertices.min(axis=0)) / cell).astype(np.int64)
+    _, cluster, counts = np.unique(keys, axis=0, return_inverse=True, return_counts=True)
+    cluster = cluster.ravel()
+
+    new_vertices = np.zeros((len(counts), 3))
+    np.add.at(new_vertices, cluster, vertices)
+    new_vertices /= counts[:, None]
+
+    new_faces = cluster[faces]
+    keep = (
+        (new_faces[:, 0] != new_faces[:, 1])
+        & (new_faces[:, 1] != new_faces[:, 2])
+        & (new_faces[:, 0] != new_faces[:, 2])
+    )
+    new_faces = np.unique(new_faces[keep], axis=0)
+    return new_vertices, new_faces
+
+
+def decimate(mesh: trimesh.Trimesh, ratio: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Decimate a mesh to about ratio * faces.
+
+    Uses trimesh's quadric decimation (needs the optional
+    `fast_simplification` package) and falls back to vertex clustering.
+    """
+    target_faces = max(int(len(mesh.faces) * ratio), 4)
+    try:
+        simplified = mesh.simplify_quadric_decimation(face_count=target_faces)
+        return np.asarray(simplified.vertices), np.asarray(simplified.faces)
+    except ImportError:
+        return _cluster_decimate(np.asarray(mesh.vertices), np.asarray(mesh.faces), target_faces)
+
+
+def build_lods(mesh: trimesh.Trimesh, ratios=DEFAULT_RATIOS) -> list[dict]:
+    """
+    Build decimated LODs of a mesh.
+
+    Returns a list of dicts (one per ratio, finest first) with keys:
+        - vertices: (n, 3) float32
+        - faces: (m, 3) int32
+        - source_index: (n,) int32, nearest full-resolution vertex
+    """
+    tree = cKDTree(mesh.vertices)
+    lods = []
+    for ratio in ratios:
+        vertices, faces = decimate(mesh, ratio)
+        _, source_index = tree.query(vertices, workers=-1)
+        lods.append({
+            "vertices": vertices.astype(np.float32),
+            "faces": faces.astype(np.int32),
+            "source_index": source_index.astype(np.int32),
+        })
+    return lods
+
+
+def _cache_path(stl_path: Path, cache_dir, suffix: str) -> Path:
+    cache_dir = Path(cache_dir) if cache_dir else stl_path.parent / CACHE_DIR_NAME
+    return cache_dir / f"{stl_path.stem}.{file_fingerprint(stl_path)}.{suffix}.npz"
+
+
+def load_lods(stl_path, ratios=DEFAULT_RATIOS, cache_dir=None, mesh: trimesh.Trimesh = None) -> list[dict]:
+    """
+    Load cached LODs for an STL, building and caching them if missing.
+
+    Args:
+        stl_path: Path to the jaw STL
+        ratios: Face ratios of the LODs (finest first)
+        cache_dir: Cache directory (default: .lod_cache next to the STL)
+        mesh: Already-loaded full-resolution mesh (avoids reloading on a miss)
+
+    Returns:
+        List of LOD dicts (see build_lods)
+    """
+    stl_path = Path(stl_path)
+    ratio_key = "_".join(f"{r:g}" for r in ratios)
+    path = _cache_path(stl_path, cache_dir, f"lod{ratio_key}")
+
+    if path.exists():
+        data = np.load(path)
+        return [
+            {key: data[f"{key}{i}"] for key in ("vertices", "faces", "source_index")}
+            for i in range(len(ratios))
+        ]
+
+    if mesh is None:
+        mesh = load_mesh(str(stl_path))
+    lods = build_lods(mesh, ratios)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez(path, **{f"{key}{i}": lod[key] for i, lod in enumerate(lods) for key in lod})
+    return lods
+
+
+def load_labels(stl_path, xml_path, compute, cache_dir=None) -> np.ndarray:
+    """
+    Load cached full-resolution vertex labels, computing them on a miss.
+
+    Args:
+        stl_path: Jaw STL the labels belong to
+        xml_path: constructionInfo the labels were derived from
+        compute: Zero-argument callable returning the (N,) label array
+        cache_dir: Cache directory (default: .lod_cache next to the STL)
+    """
+    stl_path = Path(stl_path)
+    path = _cache_path(stl_path, cache_dir, f"labels.{file_fingerprint(xml_path)}")
+    if path.exists():
+        return np.load(path)["labels"]
+
+    labels = np.asarray(compute(), dtype=np.int8)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez(path, labels=labels)
+    return labels
+
+
+def load_distances(stl_path, xml_path, compute, cache_dir=None) -> dict:
+    """
+    Load cached margin-to-scan distances, computing them on a miss.
+
+    Args:
+        stl_path: Jaw STL the distances were measured on
+        xml_path: constructionInfo the margins come from
+        compute: Zero-argument callable returning {tooth_number: (K,) distances}
+        cache_dir: Cache directory (default: .lod_cache next to the STL)
+    """
+    stl_path = Path(stl_path)
+    path = _cache_path(stl_path, cache_dir, f"distances.{file_fingerprint(xml_path)}")
+    if path.exists():
+        data = np.load(path)
+        return {int(number): data[number] for number in data.files}
+
+    distances = {int(number): np.asarray(d, dtype=np.float64) for number, d in compute().items()}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez(path, **{str(number): d for number, d in distances.items()})
+    return distances
+
+
+def transfer_vertex_data(values: np.ndarray, lod: dict) -> np.ndarray:
+    """Transfer full-resolution per-vertex values (labels, colors) to a LOD."""
+    return np.asarray(values)[lod["source_index"]]
+
+
+def lod_mesh(lod: dict) -> trimesh.Trimesh:
+    """Wrap a LOD dict as a Trimesh (no processing, indices preserved)."""
+    return trimesh.Trimesh(vertices=lod["vertices"], faces=lod["faces"], process=False)
+
+
+def split_focus_region(
+    coarse: trimesh.Trimesh,
+    full: trimesh.Trimesh,
+    center: np.ndarray,
+    radius: float = 15.0
+) -> tuple[trimesh.Trimesh, trimesh.Trimesh, np.ndarray]:
+    """
+    Replace the coarse mesh by full resolution within radius of center.
+
+    Returns:
+        coarse_rest: coarse mesh with faces near center removed
+        full_patch: full-resolution faces near center
+        patch_index: (k,) full-resolution vertex index of each patch vertex
+                     (use it to slice full-resolution labels/colors)
+    """
+    center = np.asarray(center)
+
+    near_coarse = np.linalg.norm(coarse.triangles_center - center, axis=1) < radius
+    coarse_rest = trimesh.Trimesh(
+        vertices=coarse.vertices, faces=coarse.faces[~near_coarse], process=False
+    )
+
+    near_full = np.linalg.norm(full.triangles_center - center, axis=1) < radius
+    patch_faces = full.faces[near_full]
+    patch_index, remapped = np.unique(patch_faces, return_inverse=True)
+    full_patch = trimesh.Trimesh(
+        vertices=full.vertices[patch_index], faces=remapped.reshape(-1, 3), process=False
+    )
+    return coarse_rest, full_patch, patch_index
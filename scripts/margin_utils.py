@@ -0,0 +1,144 @@
+"""
+Margin Resampling - Ragged Margin Polylines to a Fixed-Size Tensor
+===================================================================
+Margin point counts vary widely per tooth (see the pipeline's
+calculate_margin_point_counts), which forces padding and per-tooth loops
+downstream. This module reparameterises every closed margin polyline by
+arc length to exactly K points, for all teeth at once, giving a dense
+(T, K, 3) array that batched metrics and models can consume directly.
+
+Margins are handled CSR-packed, the layout used by case_dataset.py:
+    points   (M, 3)   all teeth concatenated
+    offsets  (T+1,)   tooth t owns points[offsets[t]:offsets[t + 1]]
+
+Every resampled curve has a canonical orientation:
+    - winding: counter-clockwise when seen from the `up` axis
+    - start:   the input point furthest along `start_dir`
+so point j of one tooth corresponds to point j of another.
+
+Everything is vectorised over the packed arrays (cumulative lengths +
+one searchsorted); there is no per-tooth Python loop.
+
+Usage:
+    from margin_utils import pack_margins, resample_margins
+    points, offsets = pack_margins([t["margin_points"] for t in teeth])
+    curves = resample_margins(points, offsets, k=128)     # (T, 128, 3)
+"""
+
+import numpy as np
+
+# Points per vectorised chunk: keeps the per-point temporaries cache-sized
+CHUNK_POINTS = 1 << 15
+
+
+def pack_margins(margins: list) -> tuple[np.ndarray, np.ndarray]:
+    """
+    CSR-pack a list of (N_i, 3) margin polylines.
+
+    Returns:
+        points: (M, 3) float64, all margins concatenated
+        offsets: (T+1,) int64
+    """
+    sizes = [len(m) for m in margins]
+    offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+    if offsets[-1] == 0:
+        return np.zeros((0, 3)), offsets
+    points = np.vstack([np.asarray(m, dtype=np.float64).reshape(-1, 3) for m in margins])
+    return points, offsets
+
+
+def resample_margins(
+    points: np.ndarray,
+    offsets: np.ndarray,
+    k: int = 128,
+    up=(0.0, 0.0, 1.0),
+    start_dir=(1.0, 0.0, 0.0),
+) -> np.ndarray:
+    """
+    Resample CSR-packed closed polylines to k points equally spaced by arc length.
+
+    Args:
+        points: (M, 3) packed margin points
+        offsets: (T+1,) CSR offsets into points
+        k: Points per resampled curve
+        up: Winding reference axis, (3,) or per tooth (T, 3)
+        start_dir: Start point direction, (3,) or per tooth (T, 3)
+
+    Returns:
+        (T, k, 3) float64. Curves with no points are NaN; curves of a
+        single point (or zero length) repeat their first point.
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    n_teeth = len(offsets) - 1
+    up = np.broadcast_to(np.asarray(up, dtype=np.float64), (n_teeth, 3))
+    start_dir = np.asarray(start_dir, dtype=np.float64)
+    out = np.full((n_teeth, k, 3), np.nan)
+
+    # Whole curves per chunk, about CHUNK_POINTS points each
+    bounds = np.unique(np.r_[0, np.searchsorted(offsets, np.arange(CHUNK_POINTS, offsets[-1], CHUNK_POINTS)), n_teeth])
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        chunk_offsets = offsets[lo:hi + 1] - offsets[lo]
+        out[lo:hi] = _resample_chunk(
+            points[offsets[lo]:offsets[hi]], chunk_offsets, k,
+            up[lo:hi], start_dir if start_dir.ndim == 1 else start_dir[lo:hi],
+        )
+    return out
+
+
+def _resample_chunk(points: np.ndarray, offsets: np.ndarray, k: int, up: np.ndarray, start_dir: np.ndarray) -> np.ndarray:
+    """resample_margins() on one chunk of whole curves (offsets start at 0)."""
+    n_teeth = len(offsets) - 1
+    out = np.full((n_teeth, k, 3), np.nan)
+    nonempty = offsets[:-1] < offsets[1:]
+    if not nonempty.any():
+        return out
+
+    # (3, M) coordinate rows; only non-empty curves take part
+    columns = np.ascontiguousarray(points.T)
+    starts, ends = offsets[:-1][nonempty], offsets[1:][nonempty]
+    sizes = ends - starts
+    up = up[nonempty]
+
+    # Segment i runs from point i to its successor on the closed curve
+    nxt = np.roll(columns, -1, axis=1)
+    nxt[:, ends - 1] = columns[:, starts]
+    delta = nxt - columns
+    seg_len = np.sqrt(np.einsum("ij,ij->j", delta, delta))
+    seg_start = np.cumsum(seg_len) - seg_len        # one global arc coordinate for all curves
+    lengths = np.add.reduceat(seg_len, starts)
+
+    # Winding: sign of the Newell normal (sum of p_i x p_i+1) along up
+    x, y, z = columns
+    nx, ny, nz = nxt
+    normal = np.stack([
+        np.add.reduceat(y * nz - z * ny, starts),
+        np.add.reduceat(z * nx - x * nz, starts),
+        np.add.reduceat(x * ny - y * nx, starts),
+    ], axis=1)
+    step = np.where(np.einsum("ij,ij->i", normal, up) < 0, -1.0, 1.0)
+
+    # Start: first point of each curve furthest along start_dir
+    if start_dir.ndim == 1:
+        proj = start_dir @ columns
+    else:
+        proj = np.einsum("ij,ji->i", np.repeat(start_dir[nonempty], sizes, axis=0), columns)
+    hits = np.flatnonzero(proj == np.repeat(np.maximum.reduceat(proj, starts), sizes))
+    hit_curve = np.searchsorted(starts, hits, side="right") - 1
+    first = hits[np.r_[True, hit_curve[1:] != hit_curve[:-1]]]
+
+    # Target j sits step * j * L / k along the curve from the start point (cyclic)
+    along = (seg_start[first] - seg_start[starts])[:, None] + step[:, None] * lengths[:, None] * (np.arange(k) / k)
+    along = np.where(lengths[:, None] > 0, np.mod(along, np.where(lengths > 0, lengths, 1.0)[:, None]), 0.0)
+    targets = seg_start[starts, None] + along
+
+    seg = np.searchsorted(seg_start, targets, side="right") - 1
+    # Zero-length segments share a start position; keep every target on its own curve
+    seg = np.clip(seg, starts[:, None], ends[:, None] - 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        frac = np.where(seg_len[seg] > 0, (targets - seg_start[seg]) / seg_len[seg], 0.0)
+    frac = np.clip(frac, 0.0, 1.0)
+    out[nonempty] = np.stack([
+        columns[i][seg] + frac * delta[i][seg] for i in range(3)
+    ], axis=-1)
+    return out
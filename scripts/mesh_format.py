@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""
+Quantized Mesh Format - Compact Native Storage for Jaw Scans
+============================================================
+A binary STL stores every triangle corner separately (each vertex ~6 times)
+as float32, plus a normal per face, and loading it through trimesh then has
+to merge the duplicates again. A .qmesh file stores each vertex once:
+
+    - vertices: quantized to `precision` mm (default 0.001, i.e. at most
+      0.0005 mm error per axis, far below the 0.025 mm clinical tolerance),
+      delta-coded along the vertex order
+    - faces: first corner delta-coded against the previous face, the other
+      two as offsets from the first
+    - every stream zigzag-encoded, byte-plane shuffled and zlib-compressed
+      in independent chunks (CHUNK_BYTES of raw data each)
+
+Vertex order:
+    - default: first occurrence in the STL, which is exactly the order
+      load_mesh() (trimesh's vertex merge) produces, so per-vertex labels
+      and caches keyed by vertex index stay valid
+    - --morton: Z-order (Morton) sorted for spatial locality and better
+      compression; faces are then rotated (winding kept) and sorted too
+
+File layout:
+    MAGIC | uint32 header length | JSON header | compressed chunks
+The header holds counts, quantization origin and step, and the
+(raw, compressed) size of every chunk of every stream.
+
+Usage:
+    # Convert every jaw STL of a dataset (writes <stem>.qmesh next to each STL)
+    python mesh_format.py convert data/ --precision 0.001 --workers 4
+
+    # Size and load-time comparison with load_mesh on the first cases
+    python mesh_format.py benchmark data/ --limit 20
+
+    # In code
+    from mesh_format import save_qmesh, load_qmesh
+    save_qmesh("case-UpperJaw.qmesh", mesh.vertices, mesh.faces)
+    vertices, faces = load_qmesh("case-UpperJaw.qmesh")
+    mesh = load_mesh("case-UpperJaw.qmesh")   # dental_utils also reads .qmesh
+"""
+
+import argparse
+import json
+import struct
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+# Add scripts directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+MAGIC = b"QMESH\x00\x01\x00"
+FORMAT_VERSION = 1
+SUFFIX = ".qmesh"
+DEFAULT_PRECISION = 0.001
+CLINICAL_TOLERANCE = 0.025
+CHUNK_BYTES = 1 << 20
+COMPRESSION_LEVEL = 6
+
+STL_RECORD = np.dtype([("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attr", "<u2")])
+
+# Bits per axis that fit a packed int64 key / Morton code
+KEY_BITS = 21
+
+
+# =============================================================================
+# STL input
+# =============================================================================
+
+def read_stl_triangles(stl_path) -> np.ndarray:
+    """
+    Triangle corners of an STL as (F, 3, 3) float64.
+
+    Binary STLs are read directly with NumPy; ASCII STLs go through trimesh.
+    """
+    stl_path = Path(stl_path)
+    size = stl_path.stat().st_size
+    with open(stl_path, "rb") as f:
+        f.seek(80)
+        count = f.read(4)
+    if len(count) == 4 and 84 + 50 * struct.unpack("<I", count)[0] == size:
+        return np.fromfile(stl_path, dtype=STL_RECORD, offset=84)["vertices"].astype(np.float64)
+
+    import trimesh
+    return np.asarray(trimesh.load(str(stl_path), process=False).triangles, dtype=np.float64)
+
+
+# =============================================================================
+# Encoding helpers
+# =============================================================================
+
+def _zigzag(values: np.ndarray) -> np.ndarray:
+    """Signed int64 (int32 range) -> uint32 with small magnitudes mapping to small codes."""
+    if len(values) and (values.min() < -(1 << 31) or values.max() >= 1 << 31):
+        raise ValueError("Delta out of int32 range, cannot be encoded")
+    return ((values << 1) ^ (values >> 63)).astype(np.uint32)
+
+
+def _unzigzag(codes: np.ndarray) -> np.ndarray:
+    codes = codes.astype(np.int64)
+    return (codes >> 1) ^ -(codes & 1)
+
+
+def _shuffle(codes: np.ndarray) -> bytes:
+    """uint32 array -> byte planes (all lowest bytes, then the next, ...)."""
+    return np.ascontiguousarray(codes.astype("<u4").view(np.uint8).reshape(-1, 4).T).tobytes()
+
+
+def _unshuffle(data: bytes, count: int) -> np.ndarray:
+    return np.frombuffer(data, dtype=np.uint8).reshape(4, count).T.copy().view("<u4").ravel()
+
+
+def _compress(data: bytes, level: int) -> tuple[list, list]:
+    """Independently compressed chunks and their (raw, compressed) sizes."""
+    chunks, table = [], []
+    for start in range(0, len(data), CHUNK_BYTES):
+        raw = data[start:start + CHUNK_BYTES]
+        packed = zlib.compress(raw, level)
+        chunks.append(packed)
+        table.append([len(raw), len(packed)])
+    return chunks, table
+
+
+def _spread_bits(values: np.ndarray) -> np.ndarray:
+    """Insert two zero bits between the low KEY_BITS bits of each value."""
+    x = values.astype(np.uint64) & np.uint64((1 << KEY_BITS) - 1)
+    for shift, mask in ((32, 0x1F00000000FFFF), (16, 0x1F0000FF0000FF), (8, 0x100F00F00F00F00F),
+                        (4, 0x10C30C30C30C30C3), (2, 0x1249249249249249)):
+        x = (x | (x << np.uint64(shift))) & np.uint64(mask)
+    return x
+
+
+def morton_codes(quantized: np.ndarray) -> np.ndarray:
+    """Z-order codes of (N, 3) non-negative integer coordinates (top KEY_BITS bits per axis)."""
+    shift = max(int(quantized.max(initial=0)).bit_length() - KEY_BITS, 0)
+    q = quantized >> shift
+    return _spread_bits(q[:, 0]) | (_spread_bits(q[:, 1]) << np.uint64(1)) | (_spread_bits(q[:, 2]) << np.uint64(2))
+
+
+def _morton_reorder(quantized: np.ndarray, faces: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Z-order the vertices; rotate each face to start at its smallest index (keeps winding) and sort faces."""
+    order = np.argsort(morton_codes(quantized), kind="stable")
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    faces = rank[faces]
+    cols = (np.argmin(faces, axis=1)[:, None] + np.arange(3)) % 3
+    faces = np.take_along_axis(faces, cols, axis=1)
+    return quantized[order], faces[np.lexsort((faces[:, 1], faces[:, 0]))]
+
+
+def _quantize(points: np.ndarray, precision: float) -> tuple[np.ndarray, np.ndarray]:
+    """(N, 3) points -> non-negative integer cells of size precision, and the grid origin."""
+    origin = points.min(axis=0) if len(points) else np.zeros(3)
+    q = np.rint((points - origin) / precision).astype(np.int64)
+    # Deltas between cells in [0, 2^31) fit the int32 range of _zigzag
+    if len(q) and q.max() >= 1 << 31:
+        raise ValueError(f"Mesh extent too large for precision {precision} mm")
+    return q, origin
+
+
+def quantize_mesh(vertices: np.ndarray, faces: np.ndarray, precision: float = DEFAULT_PRECISION,
+                  morton: bool = False) -> dict:
+    """
+    Quantize an indexed mesh, keeping its vertex order (unless morton).
+
+    Returns dict with quantized (N, 3) int64, faces (F, 3) int64,
+    origin (3,) and step.
+    """
+    q, origin = _quantize(np.asarray(vertices, dtype=np.float64).reshape(-1, 3), precision)
+    faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+    if morton:
+        q, faces = _morton_reorder(q, faces)
+    return {"quantized": q, "faces": faces, "origin": origin, "step": precision}
+
+
+def quantize_triangles(triangles: np.ndarray, precision: float = DEFAULT_PRECISION,
+                       morton: bool = False) -> dict:
+    """
+    Deduplicate and quantize triangle corners (e.g. from an STL).
+
+    Corners falling into the same precision cell become one vertex; vertices
+    are numbered by first occurrence, as trimesh's vertex merge does.
+
+    Returns the same dict as quantize_mesh().
+    """
+    q, origin = _quantize(np.asarray(triangles, dtype=np.float64).reshape(-1, 3), precision)
+    if len(q) == 0:
+        return {"quantized": q, "faces": np.zeros((0, 3), dtype=np.int64), "origin": origin, "step": precision}
+
+    if q.max() < 1 << KEY_BITS:
+        key = (q[:, 0] << (2 * KEY_BITS)) | (q[:, 1] << KEY_BITS) | q[:, 2]
+        _, first, inverse = np.unique(key, return_index=True, return_inverse=True)
+    else:
+        _, first, inverse = np.unique(q, axis=0, return_index=True, return_inverse=True)
+    order = np.argsort(first, kind="stable")
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    faces = rank[inverse.ravel()].reshape(-1, 3)
+    quantized = q[first[order]]
+    if morton:
+        quantized, faces = _morton_reorder(quantized, faces)
+    return {"quantized": quantized, "faces": faces, "origin": origin, "step": precision}
+
+
+# =============================================================================
+# Save / load
+# =============================================================================
+
+def encode_qmesh(quantized: np.ndarray, faces: np.ndarray, origin, step: float, morton: bool = False,
+                 level: int = COMPRESSION_LEVEL) -> bytes:
+    """Serialise quantized vertices and faces to .qmesh bytes."""
+    quantized = np.asarray(quantized, dtype=np.int64).reshape(-1, 3)
+    faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+
+    # Vertices: per-axis deltas along the vertex order
+    vertex_codes = _zigzag(np.diff(quantized, axis=0, prepend=0).T.ravel())
+    # Faces: first corner against the previous face's, the others against the first
+    face_codes = _zigzag(np.concatenate([
+        np.diff(faces[:, 0], prepend=0),
+        faces[:, 1] - faces[:, 0],
+        faces[:, 2] - faces[:, 0],
+    ]))
+
+    streams = {}
+    body = []
+    for name, codes in (("vertices", vertex_codes), ("faces", face_codes)):
+        chunks, table = _compress(_shuffle(codes), level)
+        streams[name] = table
+        body.extend(chunks)
+
+    header = json.dumps({
+        "version": FORMAT_VERSION,
+        "n_vertices": len(quantized),
+        "n_faces": len(faces),
+        "origin": [float(v) for v in origin],
+        "step": float(step),
+        "morton": bool(morton),
+        "streams": streams,
+    }).encode()
+    return b"".join([MAGIC, struct.pack("<I", len(header)), header] + body)
+
+
+def _write(path, encoded: dict, morton: bool, level: int) -> dict:
+    """Encode and write atomically; returns encoded."""
+    data = encode_qmesh(encoded["quantized"], encoded["faces"], encoded["origin"], encoded["step"], morton, level)
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    tmp.replace(path)
+    return encoded
+
+
+def save_qmesh(path, vertices: np.ndarray, faces: np.ndarray, precision: float = DEFAULT_PRECISION,
+               morton: bool = False, level: int = COMPRESSION_LEVEL) -> dict:
+    """
+    Quantize an indexed mesh and write it as .qmesh.
+
+    Returns the quantize_mesh() result (vertex order of the file).
+    """
+    return _write(path, quantize_mesh(vertices, faces, precision, morton), morton, level)
+
+
+def save_qmesh_triangles(path, triangles: np.ndarray, precision: float = DEFAULT_PRECISION,
+                         morton: bool = False, level: int = COMPRESSION_LEVEL) -> dict:
+    """Deduplicate (F, 3, 3) triangle corners and write them as .qmesh."""
+    return _write(path, quantize_triangles(triangles, precision, morton), morton, level)
+
+
+def _parse_header(data: bytes) -> tuple[dict, int]:
+    """Header of .qmesh bytes and the offset of the first chunk."""
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not a .qmesh file")
+    start = len(MAGIC) + 4
+    (length,) = struct.unpack("<I", data[len(MAGIC):start])
+    header = json.loads(data[start:start + length])
+    if header["version"] > FORMAT_VERSION:
+        raise ValueError(f"Unsupported .qmesh version {header['version']}")
+    return header, start + length
+
+
+def read_header(path) -> dict:
+    """JSON header of a .qmesh file (reads no mesh data)."""
+    with open(path, "rb") as f:
+        prefix = f.read(len(MAGIC) + 4)
+        (length,) = struct.unpack("<I", prefix[len(MAGIC):]) if len(prefix) == len(MAGIC) + 4 else (0,)
+        return _parse_header(prefix + f.read(length))[0]
+
+
+def decode_qmesh(data: bytes) -> tuple[np.ndarray, np.ndarray]:
+    """Decode .qmesh bytes to (vertices (N, 3) float64, faces (F, 3) int64)."""
+    header, pos = _parse_header(data)
+    n_vertices, n_faces = header["n_vertices"], header["n_faces"]
+
+    def stream(name: str, count: int) -> np.ndarray:
+        nonlocal pos
+        parts = []
+        for _, packed in header["streams"][name]:
+            parts.append(zlib.decompress(data[pos:pos + packed]))
+            pos += packed
+        return _unzigzag(_unshuffle(b"".join(parts), count))
+
+    deltas = stream("vertices", 3 * n_vertices).reshape(3, n_vertices)
+    quantized = np.cumsum(deltas, axis=1).T
+    vertices = quantized * header["step"] + np.asarray(header["origin"])
+
+    codes = stream("faces", 3 * n_faces).reshape(3, n_faces)
+    first = np.cumsum(codes[0])
+    faces = np.stack([first, first + codes[1], first + codes[2]], axis=1)
+    return vertices, faces
+
+
+def load_qmesh(path) -> tuple[np.ndarray, np.ndarray]:
+    """Load a .qmesh file as (vertices (N, 3) float64, faces (F, 3) int64)."""
+    return decode_qmesh(Path(path).read_bytes())
+
+
+# =============================================================================
+# Dataset conversion
+# =============================================================================
+
+def qmesh_path(stl_path) -> Path:
+    """<stem>.qmesh next to an STL."""
+    return Path(stl_path).with_suffix(SUFFIX)
+
+
+def convert_stl(stl_path, out_path=None, precision: float = DEFAULT_PRECISION, morton: bool = False) -> dict:
+    """
+    Convert one STL to .qmesh.
+
+    Returns sizes and the maximum quantization error (mm) of the conversion.
+    """
+    stl_path = Path(stl_path)
+    out_path = Path(out_path) if out_path else qmesh_path(stl_path)
+    triangles = read_stl_triangles(stl_path)
+    encoded = save_qmesh_triangles(out_path, triangles, precision, morton)
+    # Every corner is restored to the centre of its precision cell
+    origin, step = encoded["origin"], encoded["step"]
+    restored = np.rint((triangles - origin) / step) * step + origin
+    max_error = float(np.abs(restored - triangles).max()) if len(triangles) else 0.0
+    return {
+        "stl": str(stl_path),
+        "qmesh": str(out_path),
+        "stl_bytes": stl_path.stat().st_size,
+        "qmesh_bytes": out_path.stat().st_size,
+        "vertices": len(encoded["quantized"]),
+        "faces": len(encoded["faces"]),
+        "max_error_mm": max_error,
+    }
+
+
+def _convert_task(args: tuple) -> dict:
+    stl_path, precision, morton = args
+    return convert_stl(stl_path, precision=precision, morton=morton)
+
+
+def find_stls(data_dir, limit: int = None) -> list[Path]:
+    """Jaw STLs of the first `limit` case folders under data_dir."""
+    case_dirs = sorted(d for d in Path(data_dir).iterdir() if d.is_dir())[:limit]
+    return [p for d in case_dirs for p in sorted(d.glob("*.stl"))]
+
+
+def convert_dataset(stl_paths: list, precision: float = DEFAULT_PRECISION, morton: bool = False,
+                    workers: int = 4) -> list[dict]:
+    """Convert STLs to .qmesh next to each file, in a process pool."""
+    tasks = [(str(p), precision, morton) for p in stl_paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_convert_task, tasks))
+
+
+def benchmark_loading(stl_paths: list, repeat: int = 3) -> dict:
+    """Median total load time of all STLs via load_mesh vs their .qmesh files via load_qmesh."""
+    from dental_utils import load_mesh
+
+    def timed(fn) -> float:
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for path in stl_paths:
+                fn(path)
+            times.append(time.perf_counter() - start)
+        return sorted(times)[len(times) // 2]
+
+    stl_s = timed(lambda p: load_mesh(str(p)))
+    qmesh_s = timed(lambda p: load_qmesh(qmesh_path(p)))
+    return {"load_mesh_s": stl_s, "load_qmesh_s": qmesh_s, "speedup": stl_s / qmesh_s if qmesh_s > 0 else 0.0}
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert jaw STLs to the quantized .qmesh format")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name in ("convert", "benchmark"):
+        p = sub.add_parser(name)
+        p.add_argument("data_dir", type=Path, help="Folder of case folders")
+        p.add_argument("--precision", type=float, default=DEFAULT_PRECISION, help="Quantization step in mm")
+        p.add_argument("--morton", action="store_true", help="Morton-order vertices (changes vertex indices)")
+        p.add_argument("--workers", type=int, default=4, help="Conversion processes")
+        p.add_argument("--limit", type=int, default=None, help="Only the first N cases")
+        if name == "benchmark":
+            p.add_argument("--repeat", type=int, default=3, help="Timed load passes")
+    args = parser.parse_args()
+
+    if args.precision > CLINICAL_TOLERANCE / 2:
+        print(f"Warning: precision {args.precision} mm is not well below the {CLINICAL_TOLERANCE} mm clinical tolerance")
+
+    stl_paths = find_stls(args.data_dir, args.limit)
+    results = convert_dataset(stl_paths, args.precision, args.morton, args.workers)
+    stl_bytes = sum(r["stl_bytes"] for r in results)
+    qmesh_bytes = sum(r["qmesh_bytes"] for r in results)
+    print(f"Converted {len(results)} STLs: {stl_bytes / 2**20:.1f} MB -> {qmesh_bytes / 2**20:.1f} MB "
+          f"({stl_bytes / max(qmesh_bytes, 1):.1f}x smaller), "
+          f"max error {max((r['max_error_mm'] for r in results), default=0):.5f} mm")
+
+    if args.command == "benchmark":
+        timing = benchmark_loading(stl_paths, args.repeat)
+        print(f"Load all: load_mesh {timing['load_mesh_s']:.3f}s, load_qmesh {timing['load_qmesh_s']:.3f}s "
+              f"({timing['speedup']:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
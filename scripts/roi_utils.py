@@ -0,0 +1,180 @@
+"""
+Tooth ROI Utilities - Per-Tooth Submesh Crops and Cache
+=======================================================
+A prep and its surroundings are only a few percent of a jaw scan, yet
+margin experiments load and scan the whole arch. This module crops, for
+every tooth from load_teeth(), the submesh within a radius of its margin
+centroid (the same 15 mm region classify_vertices() works in) and caches
+the crops per tooth, so per-tooth work never touches the full jaw.
+
+Each crop is a dict with:
+    - number: FDI tooth number
+    - vertices: (n, 3) float32, in the crop frame
+    - faces: (m, 3) int32, re-indexed into the crop's vertices
+    - vertex_index: (n,) int32, jaw vertex of each crop vertex (slice
+      full-resolution labels/colours with it)
+    - margin: (k, 3) float32, margin points in the crop frame
+    - frame: "scanner" (jaw coordinates) or "design" (canonicalised
+      through the tooth's transform_matrix)
+    - center: (3,) margin centroid in Scanner Space
+    - transform_matrix: (4, 4) Scanner -> Design, as from load_teeth()
+
+Cache: one directory per (STL, XML, radius, frame) fingerprint in
+.lod_cache next to the scan, holding one small .npz per tooth plus an
+index, so loading a tooth reads only that tooth's crop.
+
+Usage:
+    from roi_utils import crop_teeth, load_tooth_crops
+    crops = load_tooth_crops(stl_path, xml_path, numbers=[26], design_space=True)
+    crop = crops[26]
+"""
+
+import json
+import shutil
+from pathlib import Path
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from dental_utils import load_teeth, load_mesh, transform_points
+from lod_utils import file_fingerprint, CACHE_DIR_NAME
+from topology_utils import vertex_faces, incident_faces
+
+DEFAULT_RADIUS = 15.0
+CROP_KEYS = ("vertices", "faces", "vertex_index", "margin", "center", "transform_matrix")
+
+
+def crop_teeth(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    teeth: list,
+    radius: float = DEFAULT_RADIUS,
+    design_space: bool = False,
+    topology: dict = None
+) -> list[dict]:
+    """
+    Crop the jaw around every tooth with margin points.
+
+    Keeps the jaw vertices within radius of the margin centroid and the
+    faces whose three vertices are all kept. One KD-tree and one
+    vertex -> face table serve all teeth.
+
+    Args:
+        vertices: (N, 3) jaw vertices (Scanner Space)
+        faces: (F, 3) jaw faces
+        teeth: Tooth dicts from load_teeth() (margins in Design Space)
+        radius: Crop radius in mm around the margin centroid
+        design_space: Express the crop in Design Space instead of Scanner Space
+        topology: Cached topology_utils topology of the jaw (reuses its vertex -> face table)
+
+    Returns:
+        List of crop dicts (see module docstring), in teeth order
+    """
+    vertices = np.asarray(vertices)
+    faces = np.asarray(faces)
+    teeth = [t for t in teeth if len(t["margin_points"]) > 0]
+    if not teeth:
+        return []
+
+    margins_scanner = [
+        transform_points(t["margin_points"], np.linalg.inv(t["transform_matrix"])) for t in teeth
+    ]
+    centers = np.array([m.mean(axis=0) for m in margins_scanner])
+    balls = cKDTree(vertices).query_ball_point(centers, radius, workers=-1)
+    if topology is not None:
+        vf_offsets, vf_faces = np.asarray(topology["vf_offsets"]), np.asarray(topology["vf_indices"])
+    else:
+        vf_offsets, vf_faces = vertex_faces(faces, len(vertices))
+
+    # Jaw vertex -> crop vertex, reset after each tooth
+    local = np.full(len(vertices), -1, dtype=np.int64)
+    crops = []
+    for tooth, margin_scanner, center, ball in zip(teeth, margins_scanner, centers, balls):
+        vertex_index = np.sort(np.asarray(ball, dtype=np.int64))
+        local[vertex_index] = np.arange(len(vertex_index))
+        candidates = faces[incident_faces(vertex_index, vf_offsets, vf_faces)]
+        crop_faces = local[candidates]
+        crop_faces = crop_faces[(crop_faces >= 0).all(axis=1)]
+        local[vertex_index] = -1
+
+        crop_vertices = vertices[vertex_index]
+        if design_space:
+            crop_vertices = transform_points(crop_vertices, tooth["transform_matrix"])
+            margin = tooth["margin_points"]
+        else:
+            margin = margin_scanner
+        crops.append({
+            "number": tooth["number"],
+            "vertices": np.asarray(crop_vertices, dtype=np.float32),
+            "faces": crop_faces.astype(np.int32),
+            "vertex_index": vertex_index.astype(np.int32),
+            "margin": np.asarray(margin, dtype=np.float32),
+            "frame": "design" if design_space else "scanner",
+            "center": center,
+            "transform_matrix": np.asarray(tooth["transform_matrix"]),
+        })
+    return crops
+
+
+def _crop_cache_dir(stl_path: Path, xml_path: Path, cache_dir, radius: float, design_space: bool) -> Path:
+    cache_dir = Path(cache_dir) if cache_dir else stl_path.parent / CACHE_DIR_NAME
+    frame = "design" if design_space else "scanner"
+    key = f"{stl_path.stem}.{file_fingerprint(stl_path)}.{file_fingerprint(xml_path)}.roi{radius:g}.{frame}"
+    return cache_dir / key
+
+
+def load_tooth_crops(
+    stl_path,
+    xml_path,
+    numbers=None,
+    radius: float = DEFAULT_RADIUS,
+    design_space: bool = False,
+    cache_dir=None,
+    mesh=None
+) -> dict:
+    """
+    Load cached per-tooth crops of a jaw, building and caching all of them on a miss.
+
+    Args:
+        stl_path: Jaw STL (…-UpperJaw.stl or …-LowerJaw.stl)
+        xml_path: constructionInfo with the teeth of the case
+        numbers: Tooth numbers to return (default: all cropped teeth)
+        radius: Crop radius in mm
+        design_space: Crops in Design Space instead of Scanner Space
+        cache_dir: Cache directory (default: .lod_cache next to the STL)
+        mesh: Already-loaded jaw mesh (avoids reloading on a miss)
+
+    Returns:
+        Dict tooth number -> crop dict
+    """
+    stl_path, xml_path = Path(stl_path), Path(xml_path)
+    path = _crop_cache_dir(stl_path, xml_path, cache_dir, radius, design_space)
+
+    if not (path / "index.json").exists():
+        jaw = "upper" if "upper" in stl_path.stem.lower() else "lower"
+        teeth = [t for t in load_teeth(str(xml_path)) if t["jaw"] == jaw]
+        if mesh is None:
+            mesh = load_mesh(str(stl_path))
+        crops = crop_teeth(mesh.vertices, mesh.faces, teeth, radius, design_space)
+
+        # Written to a temporary directory and renamed, so readers never see a partial cache
+        tmp = path.with_name(path.name + ".tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        for crop in crops:
+            np.savez(tmp / f"tooth_{crop['number']}.npz", **{key: crop[key] for key in CROP_KEYS})
+        (tmp / "index.json").write_text(json.dumps({
+            "numbers": [c["number"] for c in crops],
+            "radius": radius,
+            "frame": "design" if design_space else "scanner",
+        }))
+        shutil.rmtree(path, ignore_errors=True)
+        tmp.rename(path)
+
+    index = json.loads((path / "index.json").read_text())
+    wanted = index["numbers"] if numbers is None else [n for n in numbers if n in index["numbers"]]
+    crops = {}
+    for number in wanted:
+        with np.load(path / f"tooth_{number}.npz") as data:
+            crops[number] = {"number": number, "frame": index["frame"], **{key: data[key] for key in CROP_KEYS}}
+    return crops
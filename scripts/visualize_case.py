@@ -20,6 +20,13 @@ Usage:
     
     # Just print report, no visualization
     python visualize_case.py "data/some_case/" --headless
+
+    # Open at a coarse cached LOD, full resolution only around tooth 26
+    python visualize_case.py "data/some_case/" --lod 2 --focus-tooth 26
+
+    # Browse many cases in one window (next cases load in the background)
+    python visualize_case.py "data/case_a/" "data/case_b/" "data/case_c/"
+    python visualize_case.py --manifest cases.txt --prefetch 3
 """
 
 import numpy as np
@@ -27,6 +34,7 @@ from pathlib import Path
 import argparse
 import time
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 # Add scripts directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
@@ -34,9 +42,13 @@ sys.path.insert(0, str(Path(__file__).parent))
 from dental_utils import load_teeth, load_mesh, compute_distances, transform_points, classify_vertices
 from viz_utils import (
     setup_scene, register_jaw, register_margins, 
-    focus_on_margins, show, print_report
+    focus_on_margins, show, print_report, clear_scene, set_callback
 )
 
+JAW_COLOR = np.array([0.7, 0.7, 0.7])    # Gray jaw
+GUM_COLOR = np.array([0.9, 0.6, 0.6])    # Pinkish gum
+TOOTH_COLOR = np.array([0.9, 0.9, 0.2])  # Yellow tooth
+
 
 def find_case_files(case_dir: Path) -> dict:
     """Find XML and STL files in case directory."""
@@ -54,38 +66,108 @@ def find_case_files(case_dir: Path) -> dict:
     }
 
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Visualize dental case with margin alignment",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-    python visualize_case.py "data/lamyaa_ratmi.../" --jaw upper
-    python visualize_case.py "data/steven_mourad.../" --jaw both
-    python visualize_case.py "data/steven_mourad.../" --headless
-        """
-    )
-    parser.add_argument("case_dir", type=str, help="Path to case directory")
-    parser.add_argument("--jaw", choices=["upper", "lower", "both"], default="both",
-                        help="Which jaw to visualize (default: both)")
-    parser.add_argument("--headless", action="store_true", 
-                        help="Print report only, no visualization")
-    parser.add_argument("--screenshot", type=str, default=None,
-                        help="Save screenshot to this path")
-    args = parser.parse_args()
-    
-    case_dir = Path(args.case_dir)
+def labels_to_colors(labels: np.ndarray) -> np.ndarray:
+    """Map classify_vertices labels (0=Jaw, 1=Tooth, 2=Gum) to RGB colors."""
+    colors = np.tile(JAW_COLOR, (len(labels), 1))
+    colors[labels == 1] = TOOTH_COLOR
+    colors[labels == 2] = GUM_COLOR
+    return colors
+
+
+class FullMesh:
+    """Full-resolution jaw mesh, parsed from the STL on first use."""
+
+    def __init__(self, stl_path: Path, mesh=None):
+        self.stl_path = stl_path
+        self.mesh = mesh
+
+    def __call__(self):
+        if self.mesh is None:
+            self.mesh = load_mesh(str(self.stl_path))
+        return self.mesh
+
+
+def register_jaw_lod(name: str, lod_data: dict, full: FullMesh, xml_path: Path, teeth: list,
+                     focus_tooth: int = None, offset: tuple = (0, 0, 0),
+                     cache_dir: str = None, labels: np.ndarray = None):
+    """
+    Register a jaw at a cached LOD, colored by cached vertex labels.
+
+    With focus_tooth, the region around that tooth's margin is swapped in
+    at full resolution (full-resolution labels and colors); only then is
+    the full-resolution mesh loaded.
+    """
+    # scipy/trimesh decimation machinery is only needed with --lod
+    from lod_utils import load_labels, transfer_vertex_data, lod_mesh, split_focus_region
+
+    if labels is None:
+        labels = load_labels(full.stl_path, xml_path, lambda: classify_vertices(full(), teeth), cache_dir)
+    coarse = lod_mesh(lod_data)
+    coarse_colors = labels_to_colors(transfer_vertex_data(labels, lod_data))
+
+    focus = [t for t in teeth if t["number"] == focus_tooth]
+    if not focus:
+        register_jaw(name, coarse, color=(0.7, 0.7, 0.7), offset=offset, vertex_colors=coarse_colors)
+        return
+
+    tooth = focus[0]
+    inv_mat = np.linalg.inv(tooth["transform_matrix"])
+    center = transform_points(tooth["margin_points"], inv_mat).mean(axis=0)
+    coarse_rest, patch, patch_index = split_focus_region(coarse, full(), center)
+
+    register_jaw(name, coarse_rest, color=(0.7, 0.7, 0.7), offset=offset, vertex_colors=coarse_colors)
+    register_jaw(f"{name} (Tooth {focus_tooth}, full res)", patch, color=(0.7, 0.7, 0.7),
+                 offset=offset, vertex_colors=labels_to_colors(labels[patch_index]))
+
+
+def read_manifest(path: Path) -> list[Path]:
+    """Read a case manifest: one case directory per line, '#' starts a comment."""
+    case_dirs = []
+    with open(path) as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                case_dirs.append(Path(line))
+    return case_dirs
+
+
+def jaw_distances(mesh, teeth: list) -> dict:
+    """Margin-to-scan distances {tooth_number: (K,) distances} (inverse transform method)."""
+    distances = {}
+    for tooth in teeth:
+        inv_matrix = np.linalg.inv(tooth["transform_matrix"])
+        margins_scanner = transform_points(tooth["margin_points"], inv_matrix)
+        distances[tooth["number"]] = compute_distances(mesh, margins_scanner)
+    return distances
+
+
+def load_case(case_dir: Path, jaw: str = "both", with_labels: bool = False, verbose: bool = True,
+              lod: int = 0, lod_cache: str = None) -> dict:
+    """
+    Load everything needed to report on / display one case.
+
+    Loads teeth and the requested jaw meshes and computes margin distances.
+    With with_labels, also classifies jaw vertices (so display is instant).
+
+    With lod > 0, the jaw is opened at that cached LOD instead: LODs,
+    labels and distances come from the LOD cache, and the full-resolution
+    mesh is only parsed to fill a cache miss ("upper_mesh"/"lower_mesh"
+    stay None otherwise; "upper_full"/"lower_full" load it on demand).
+
+    Raises:
+        FileNotFoundError: If the case directory or its constructionInfo is missing
+    """
+    log = print if verbose else (lambda *a, **k: None)
+
     if not case_dir.exists():
-        print(f"Error: Case directory not found: {case_dir}")
-        return 1
+        raise FileNotFoundError(f"Case directory not found: {case_dir}")
     
     # === Find files ===
     files = find_case_files(case_dir)
     if files["xml"] is None:
-        print(f"Error: No .constructionInfo file found in {case_dir}")
-        return 1
+        raise FileNotFoundError(f"No .constructionInfo file found in {case_dir}")
     
-    print(f"Case: {files['name']}")
+    log(f"Case: {files['name']}")
     t_start = time.time()
     
     # === Load teeth data ===
@@ -95,131 +177,297 @@ Examples:
     upper_teeth = [t for t in teeth_with_margins if t["jaw"] == "upper"]
     lower_teeth = [t for t in teeth_with_margins if t["jaw"] == "lower"]
     
-    print(f"  Teeth with margins: {len(teeth_with_margins)} "
-          f"(upper: {len(upper_teeth)}, lower: {len(lower_teeth)})")
+    log(f"  Teeth with margins: {len(teeth_with_margins)} "
+        f"(upper: {len(upper_teeth)}, lower: {len(lower_teeth)})")
     
+    data = {
+        "name": files["name"],
+        "files": files,
+        "jaw": jaw,
+        "upper_teeth": upper_teeth,
+        "lower_teeth": lower_teeth,
+        "distances": {},
+    }
+
     # === Load meshes (only what we need) ===
-    upper_mesh = None
-    lower_mesh = None
-    
-    if (args.jaw in ["upper", "both"]) and files["upper_stl"] and upper_teeth:
-        print(f"  Loading UpperJaw...")
-        upper_mesh = load_mesh(str(files["upper_stl"]))
-        print(f"    {len(upper_mesh.vertices):,} vertices")
-    
-    if (args.jaw in ["lower", "both"]) and files["lower_stl"] and lower_teeth:
-        print(f"  Loading LowerJaw...")
-        lower_mesh = load_mesh(str(files["lower_stl"]))
-        print(f"    {len(lower_mesh.vertices):,} vertices")
-    
-    # === Compute distances (inverse transform method) ===
-    print("  Computing distances...")
-    distances = {}
-    
-    for tooth in upper_teeth:
-        if upper_mesh is None:
+    for side, name, jaw_teeth in [("upper", "UpperJaw", upper_teeth), ("lower", "LowerJaw", lower_teeth)]:
+        stl = files[f"{side}_stl"]
+        data[f"{side}_mesh"] = data[f"{side}_labels"] = data[f"{side}_lod"] = data[f"{side}_full"] = None
+        if jaw not in [side, "both"] or stl is None or not jaw_teeth:
             continue
-        inv_matrix = np.linalg.inv(tooth["transform_matrix"])
-        margins_scanner = transform_points(tooth["margin_points"], inv_matrix)
-        distances[tooth["number"]] = compute_distances(upper_mesh, margins_scanner)
-    
-    for tooth in lower_teeth:
-        if lower_mesh is None:
-            continue
-        inv_matrix = np.linalg.inv(tooth["transform_matrix"])
-        margins_scanner = transform_points(tooth["margin_points"], inv_matrix)
-        distances[tooth["number"]] = compute_distances(lower_mesh, margins_scanner)
+
+        full = FullMesh(stl)
+        if lod > 0:
+            from lod_utils import load_lods, load_labels, load_distances
+
+            log(f"  Loading {name} (LOD {lod})...")
+            data["distances"].update(
+                load_distances(stl, files["xml"], lambda: jaw_distances(full(), jaw_teeth), lod_cache)
+            )
+            if with_labels:
+                data[f"{side}_labels"] = load_labels(
+                    stl, files["xml"], lambda: classify_vertices(full(), jaw_teeth), lod_cache
+                )
+            data[f"{side}_lod"] = load_lods(stl, cache_dir=lod_cache, mesh=full.mesh)[lod - 1]
+            log(f"    {len(data[f'{side}_lod']['vertices']):,} vertices"
+                f"{'' if full.mesh is None else ' (cache built from the full-resolution scan)'}")
+        else:
+            log(f"  Loading {name}...")
+            full()
+            log(f"    {len(full.mesh.vertices):,} vertices")
+            # === Compute distances (inverse transform method) ===
+            data["distances"].update(jaw_distances(full.mesh, jaw_teeth))
+            # === Classify vertices (optional, display only) ===
+            if with_labels:
+                data[f"{side}_labels"] = classify_vertices(full.mesh, jaw_teeth)
+        data[f"{side}_mesh"] = full.mesh
+        data[f"{side}_full"] = full
     
     t_compute = time.time()
-    print(f"  Done in {t_compute - t_start:.1f}s")
-    
-    # === Print report ===
+    log(f"  Done in {t_compute - t_start:.1f}s")
+    data["load_time"] = t_compute - t_start
+    return data
+
+
+def report_case(data: dict):
+    """Print the margin alignment report for a loaded case."""
     teeth_to_show = []
-    if args.jaw in ["upper", "both"]:
-        teeth_to_show.extend(upper_teeth)
-    if args.jaw in ["lower", "both"]:
-        teeth_to_show.extend(lower_teeth)
-    
-    print_report(teeth_to_show, distances)
-    
-    # === Visualize ===
-    if args.headless:
-        print("[Headless mode] Skipping visualization.")
-        return 0
-    
-    print("  Preparing visualization...")
-    setup_scene(f"Case: {files['name']}")
+    if data["jaw"] in ["upper", "both"]:
+        teeth_to_show.extend(data["upper_teeth"])
+    if data["jaw"] in ["lower", "both"]:
+        teeth_to_show.extend(data["lower_teeth"])
     
+    print_report(teeth_to_show, data["distances"])
+
+
+def to_scanner_space(teeth: list) -> list:
+    """Copy tooth dicts with margins moved to Scanner Space."""
+    teeth_scanner = []
+    for t in teeth:
+        t_copy = t.copy()
+        inv_mat = np.linalg.inv(t["transform_matrix"])
+        t_copy["margin_points"] = transform_points(t["margin_points"], inv_mat)
+        teeth_scanner.append(t_copy)
+    return teeth_scanner
+
+
+def show_case(data: dict, args):
+    """Register a loaded case with Polyscope (scene must already be set up)."""
+    jaw = data["jaw"]
+    files = data["files"]
+    distances = data["distances"]
+    upper_mesh, lower_mesh = data["upper_mesh"], data["lower_mesh"]
+    upper_teeth, lower_teeth = data["upper_teeth"], data["lower_teeth"]
+
     # Determine offsets for side-by-side layout
     upper_offset = (0, 0, 0)
     lower_offset = (0, 0, 0)
     
-    if args.jaw == "both" and upper_mesh and lower_mesh:
+    if jaw == "both" and data["upper_full"] and data["lower_full"]:
         # Offset lower jaw to the right for side-by-side view
         lower_offset = (70, 0, 0)  # 70mm separation
     
     # Prepare scanner-space teeth for visualization
-    upper_teeth_scanner = []
-    for t in upper_teeth:
-        t_copy = t.copy()
-        inv_mat = np.linalg.inv(t["transform_matrix"])
-        t_copy["margin_points"] = transform_points(t["margin_points"], inv_mat)
-        upper_teeth_scanner.append(t_copy)
+    upper_teeth_scanner = to_scanner_space(upper_teeth)
+    lower_teeth_scanner = to_scanner_space(lower_teeth)
 
-    lower_teeth_scanner = []
-    for t in lower_teeth:
-        t_copy = t.copy()
-        inv_mat = np.linalg.inv(t["transform_matrix"])
-        t_copy["margin_points"] = transform_points(t["margin_points"], inv_mat)
-        lower_teeth_scanner.append(t_copy)
-
-    # Register meshes (Scanner Space)
     # Register meshes (Scanner Space)
-    jaw_color = np.array([0.7, 0.7, 0.7]) # Gray jaw
-    gum_color = np.array([0.9, 0.6, 0.6]) # Pinkish gum
-    tooth_color = np.array([0.9, 0.9, 0.2]) # Yellow tooth
-
-    if upper_mesh and upper_teeth and args.jaw in ["upper", "both"]:
-        # Classify vertices
-        labels = classify_vertices(upper_mesh, upper_teeth)
-        
-        # Create color array
-        # Initialize with Jaw Color (0)
-        colors = np.tile(jaw_color, (len(labels), 1))
-        # Apply Tooth Color (1)
-        colors[labels == 1] = tooth_color
-        # Apply Gum Color (2)
-        colors[labels == 2] = gum_color
-        
-        register_jaw("UpperJaw", upper_mesh, 
-                     color=(0.7, 0.7, 0.7), 
-                     offset=upper_offset,
-                     vertex_colors=colors)
+    if data["upper_full"] and upper_teeth and jaw in ["upper", "both"]:
+        labels = data["upper_labels"]
+        if data["upper_lod"] is not None:
+            register_jaw_lod("UpperJaw", data["upper_lod"], data["upper_full"], files["xml"], upper_teeth,
+                             args.focus_tooth, upper_offset, args.lod_cache, labels)
+        else:
+            if labels is None:
+                labels = classify_vertices(upper_mesh, upper_teeth)
+            register_jaw("UpperJaw", upper_mesh, 
+                         color=(0.7, 0.7, 0.7), 
+                         offset=upper_offset,
+                         vertex_colors=labels_to_colors(labels))
         register_margins(upper_teeth_scanner, distances, offset=upper_offset)
     
-    if lower_mesh and lower_teeth and args.jaw in ["lower", "both"]:
-        # Classify vertices
-        labels = classify_vertices(lower_mesh, lower_teeth)
-        
-        colors = np.tile(jaw_color, (len(labels), 1))
-        colors[labels == 1] = tooth_color
-        colors[labels == 2] = gum_color
-
-        register_jaw("LowerJaw", lower_mesh, 
-                     color=(0.7, 0.7, 0.7), 
-                     offset=lower_offset,
-                     vertex_colors=colors)
+    if data["lower_full"] and lower_teeth and jaw in ["lower", "both"]:
+        labels = data["lower_labels"]
+        if data["lower_lod"] is not None:
+            register_jaw_lod("LowerJaw", data["lower_lod"], data["lower_full"], files["xml"], lower_teeth,
+                             args.focus_tooth, lower_offset, args.lod_cache, labels)
+        else:
+            if labels is None:
+                labels = classify_vertices(lower_mesh, lower_teeth)
+            register_jaw("LowerJaw", lower_mesh, 
+                         color=(0.7, 0.7, 0.7), 
+                         offset=lower_offset,
+                         vertex_colors=labels_to_colors(labels))
         register_margins(lower_teeth_scanner, distances, offset=lower_offset)
+
+    shown = {t["number"] for side in ["upper", "lower"] if data[f"{side}_full"] for t in data[f"{side}_teeth"]}
+    if args.focus_tooth is not None and args.focus_tooth not in shown:
+        print(f"  Warning: --focus-tooth {args.focus_tooth} has no margin in the displayed jaw(s) "
+              f"(teeth: {sorted(shown)}), showing the LOD only")
     
     # Focus camera
-    if args.jaw == "upper":
+    if jaw == "upper":
         focus_on_margins(upper_teeth_scanner)
-    elif args.jaw == "lower":
+    elif jaw == "lower":
         focus_on_margins(lower_teeth_scanner)
     else:
         # For both, focus between them
         all_scanner = upper_teeth_scanner + lower_teeth_scanner
         focus_on_margins(all_scanner, offset=(35, 0, 0))
+
+
+class CaseBrowser:
+    """
+    Navigate a list of cases inside one Polyscope session.
+
+    A background worker loads and pre-computes (meshes, distances, labels)
+    the next `prefetch` cases while the current one is inspected; the
+    previous case is kept as well so stepping back is instant too.
+    """
+
+    def __init__(self, case_dirs: list[Path], args, prefetch: int = 2):
+        self.case_dirs = case_dirs
+        self.args = args
+        self.prefetch = prefetch
+        self.index = 0
+        self.current = None
+        self.error = None
+        # One worker: cases arrive in navigation order and the UI thread stays responsive
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.futures = {}
+
+    def _schedule(self, index: int):
+        """Queue loads for index..index+prefetch and drop cases out of the window."""
+        lo, hi = index - 1, index + self.prefetch
+        for i in list(self.futures):
+            if i < lo or i > hi:
+                self.futures.pop(i).cancel()
+        for i in range(index, min(hi + 1, len(self.case_dirs))):
+            if i not in self.futures:
+                self.futures[i] = self.executor.submit(
+                    load_case, self.case_dirs[i], self.args.jaw, True, False,
+                    self.args.lod, self.args.lod_cache
+                )
+
+    def get(self, index: int) -> dict:
+        """Loaded case at index (blocks only if it is not prefetched yet)."""
+        self._schedule(index)
+        return self.futures[index].result()
+
+    def go(self, index: int, display: bool = True):
+        """Switch to the case at index, re-registering the scene."""
+        self.index = index % len(self.case_dirs)
+        self.error = None
+        t_start = time.time()
+        try:
+            self.current = self.get(self.index)
+        except Exception as e:
+            self.current = None
+            self.error = str(e)
+            print(f"[{self.index + 1}/{len(self.case_dirs)}] Error: {e}")
+            return
+
+        wait = time.time() - t_start
+        print(f"[{self.index + 1}/{len(self.case_dirs)}] {self.current['name']} "
+              f"(load {self.current['load_time']:.1f}s, waited {wait:.2f}s)")
+        report_case(self.current)
+
+        if display:
+            clear_scene()
+            show_case(self.current, self.args)
+
+    def callback(self):
+        """Polyscope UI: case name and previous/next buttons."""
+        import polyscope.imgui as psim
+
+        name = self.current["name"] if self.current else self.error
+        psim.TextUnformatted(f"Case {self.index + 1}/{len(self.case_dirs)}: {name}")
+        if psim.Button("< Previous"):
+            self.go(self.index - 1)
+        psim.SameLine()
+        if psim.Button("Next >"):
+            self.go(self.index + 1)
+        ready = sum(1 for f in self.futures.values() if f.done())
+        psim.TextUnformatted(f"Prefetched: {ready}/{len(self.futures)}")
+
+    def run(self, headless: bool = False):
+        """Report every case (headless) or open the interactive browser."""
+        if headless:
+            for i in range(len(self.case_dirs)):
+                self.go(i, display=False)
+            self.executor.shutdown()
+            return
+
+        setup_scene("Case Browser")
+        self.go(0)
+        set_callback(self.callback)
+        show(screenshot_path=self.args.screenshot)
+        self.executor.shutdown(cancel_futures=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Visualize dental case with margin alignment",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+    python visualize_case.py "data/lamyaa_ratmi.../" --jaw upper
+    python visualize_case.py "data/steven_mourad.../" --jaw both
+    python visualize_case.py "data/steven_mourad.../" --headless
+    python visualize_case.py --manifest cases.txt --prefetch 3
+        """
+    )
+    parser.add_argument("case_dirs", type=str, nargs="*",
+                        help="Path to case directory (several paths open the browser)")
+    parser.add_argument("--manifest", type=str, default=None,
+                        help="File listing case directories, one per line (opens the browser)")
+    parser.add_argument("--prefetch", type=int, default=2,
+                        help="Browser: number of upcoming cases to load in the background")
+    parser.add_argument("--jaw", choices=["upper", "lower", "both"], default="both",
+                        help="Which jaw to visualize (default: both)")
+    parser.add_argument("--headless", action="store_true", 
+                        help="Print report only, no visualization")
+    parser.add_argument("--screenshot", type=str, default=None,
+                        help="Save screenshot to this path")
+    parser.add_argument("--lod", type=int, choices=[0, 1, 2], default=0,
+                        help="Level of detail to open at: 0=full, 1=25%%, 2=5%% of faces (cached)")
+    parser.add_argument("--focus-tooth", type=int, default=None,
+                        help="With --lod, show this tooth's region at full resolution")
+    parser.add_argument("--lod-cache", type=str, default=None,
+                        help="LOD cache directory (default: .lod_cache next to the STLs)")
+    args = parser.parse_args()
+
+    case_dirs = [Path(d) for d in args.case_dirs]
+    if args.manifest:
+        case_dirs += read_manifest(Path(args.manifest))
+    if not case_dirs:
+        parser.error("provide a case directory or --manifest")
+    if args.focus_tooth is not None and args.lod == 0:
+        parser.error("--focus-tooth requires --lod 1 or 2")
+
+    # === Browser mode ===
+    if len(case_dirs) > 1 or args.manifest:
+        CaseBrowser(case_dirs, args, prefetch=args.prefetch).run(headless=args.headless)
+        return 0
+
+    # === Single case ===
+    try:
+        data = load_case(case_dirs[0], args.jaw, lod=args.lod, lod_cache=args.lod_cache)
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        return 1
+    
+    # === Print report ===
+    report_case(data)
+    
+    # === Visualize ===
+    if args.headless:
+        print("[Headless mode] Skipping visualization.")
+        return 0
+    
+    print("  Preparing visualization...")
+    setup_scene(f"Case: {data['name']}")
+    show_case(data, args)
     
     print(f"\n  Launching viewer (jaw: {args.jaw})...")
     show(screenshot_path=args.screenshot)
@@ -9,12 +9,15 @@ Usage:
 """
 
 import numpy as np
-import polyscope as ps
 import colorsys
 
+# polyscope is imported inside the functions that draw, so headless runs
+# (print_report, --headless) never load it
+
 
 def setup_scene(title: str = "Dental Visualization"):
     """Initialize Polyscope with standard dental visualization settings."""
+    import polyscope as ps
     ps.init()
     ps.set_up_dir("z_up")
     ps.set_ground_plane_mode("none")
@@ -42,6 +45,7 @@ def register_jaw(
     Returns:
         Polyscope mesh object
     """
+    import polyscope as ps
     vertices = mesh.vertices.copy()
     
     if offset != (0, 0, 0):
@@ -87,6 +91,7 @@ def register_margins(
     Returns:
         List of Polyscope curve objects
     """
+    import polyscope as ps
     curves = []
     offset_arr = np.array(offset)
     
@@ -133,6 +138,7 @@ def register_margins(
 
 def focus_on_margins(teeth: list, offset: tuple = (0, 0, 0)):
     """Set camera to focus on the margin points."""
+    import polyscope as ps
     all_points = []
     for tooth in teeth:
         if len(tooth["margin_points"]) > 0:
@@ -146,6 +152,18 @@ def focus_on_margins(teeth: list, offset: tuple = (0, 0, 0)):
     ps.look_at(center + np.array([0, -40, 20]), center)
 
 
+def clear_scene():
+    """Remove all registered structures (keeps the window and camera)."""
+    import polyscope as ps
+    ps.remove_all_structures()
+
+
+def set_callback(callback):
+    """Register a per-frame UI callback (e.g. imgui buttons)."""
+    import polyscope as ps
+    ps.set_user_callback(callback)
+
+
 def show(screenshot_path: str = None):
     """
     Display the scene.
@@ -153,6 +171,7 @@ def show(screenshot_path: str = None):
     Args:
         screenshot_path: Optional path to save screenshot before showing
     """
+    import polyscope as ps
     if screenshot_path:
         ps.screenshot(screenshot_path, transparent_bg=False)
         print(f"Screenshot saved: {screenshot_path}")
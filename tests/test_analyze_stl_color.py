@@ -0,0 +1,89 @@
+import unittest
+import tempfile
+import numpy as np
+from pathlib import Path
+import sys
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from analyze_stl_color import (
+    STL_RECORD,
+    count_unique_colors,
+    inspect_binary_stl,
+    survey_stl,
+    survey_directory,
+    write_survey
+)
+
+
+def write_binary_stl(path: Path, attrs, header: bytes = b"") -> None:
+    records = np.zeros(len(attrs), dtype=STL_RECORD)
+    records["attr"] = attrs
+    with open(path, "wb") as f:
+        f.write(header.ljust(80, b" ")[:80])
+        f.write(np.uint32(len(attrs)).tobytes())
+        f.write(records.tobytes())
+
+
+class TestStlColorSurvey(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        (self.root / "case1").mkdir()
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_count_unique_colors_packed(self):
+        colors = np.array([[255, 0, 0, 255], [255, 0, 0, 128], [0, 0, 255, 255]], dtype=np.uint8)
+        self.assertEqual(count_unique_colors(colors), 2)
+
+    def test_geometry_only(self):
+        path = self.root / "case1" / "plain.stl"
+        write_binary_stl(path, [0] * 10)
+        info = inspect_binary_stl(path)
+        self.assertEqual(info["format"], "binary")
+        self.assertEqual(info["num_faces"], 10)
+        self.assertEqual(info["color_convention"], "none")
+        self.assertFalse(survey_stl(path)["has_color"])
+
+    def test_viscam_colors(self):
+        path = self.root / "case1" / "viscam.stl"
+        write_binary_stl(path, [0x8000 | 0x001F, 0x8000 | 0x7C00, 0x8000 | 0x001F, 0])
+        info = inspect_binary_stl(path)
+        self.assertEqual(info["color_convention"], "viscam")
+        self.assertEqual(info["colored_faces"], 3)
+        self.assertEqual(info["unique_colors"], 2)
+
+    def test_materialise_header(self):
+        path = self.root / "case1" / "materialise.stl"
+        write_binary_stl(path, [0x0001, 0x0002, 0x8000], header=b"COLOR=\xff\x00\x00\xff")
+        info = inspect_binary_stl(path)
+        self.assertTrue(info["header_color"])
+        self.assertEqual(info["header_rgba"], (255, 0, 0, 255))
+        self.assertEqual(info["colored_faces"], 2)
+        self.assertTrue(survey_stl(path)["has_color"])
+
+    def test_ascii_detected(self):
+        path = self.root / "case1" / "ascii.stl"
+        path.write_text("solid test\n" + " " * 100 + "\nendsolid test\n")
+        self.assertEqual(inspect_binary_stl(path)["format"], "ascii")
+
+    def test_survey_directory_to_csv(self):
+        write_binary_stl(self.root / "case1" / "a.stl", [0] * 5)
+        write_binary_stl(self.root / "case1" / "b.STL", [0x8000 | 1, 0x8000 | 2])
+        rows = survey_directory(self.root, workers=2)
+        self.assertEqual([r["filename"] for r in rows], ["a.stl", "b.STL"])
+        self.assertEqual([r["has_color"] for r in rows], [False, True])
+
+        out = self.root / "survey.csv"
+        write_survey(rows, out)
+        lines = out.read_text().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[0].startswith("case,filename"))
+
+
+if __name__ == '__main__':
+    unittest.main()
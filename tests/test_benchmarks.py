@@ -0,0 +1,86 @@
+import unittest
+import tempfile
+import numpy as np
+from pathlib import Path
+import sys
+
+# Add repository root and scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from benchmarks.synthetic import make_case, make_cases
+from benchmarks.run_benchmarks import compare
+from benchmarks.import_time import TARGETS, parse_importtime, check_target
+from dental_data_pipeline.src.parsers import parse_dental_project, parse_construction_info
+from dental_utils import load_teeth, load_mesh, transform_points, compute_distances
+
+
+class TestSyntheticData(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_case_is_deterministic(self):
+        a = make_case(self.root / "a", "c", seed=7, with_stl=False)
+        b = make_case(self.root / "b", "c", seed=7, with_stl=False)
+        self.assertEqual((a / "c.constructionInfo").read_text(), (b / "c.constructionInfo").read_text())
+
+    def test_case_parses_with_pipeline_and_scripts(self):
+        case_dir = make_case(self.root, "c", seed=1, n_teeth=5, margin_points=50, stl_vertices=5000)
+        case = parse_dental_project(str(case_dir / "c.dentalProject"))
+        margins = parse_construction_info(str(case_dir / "c.constructionInfo"))
+        self.assertEqual(len(case.teeth), 5)
+        self.assertTrue(all(len(m) in (0, 50) for m in margins.values()))
+
+        teeth = [t for t in load_teeth(str(case_dir / "c.constructionInfo")) if len(t["margin_points"])]
+        for tooth in teeth:
+            jaw = "UpperJaw" if tooth["jaw"] == "upper" else "LowerJaw"
+            mesh = load_mesh(str(case_dir / f"c-{jaw}.stl"))
+            scanner = transform_points(tooth["margin_points"], np.linalg.inv(tooth["transform_matrix"]))
+            # Margins land on the synthetic jaw once moved back to Scanner Space
+            self.assertLess(compute_distances(mesh, scanner).mean(), 0.5)
+
+    def test_make_cases_in_memory(self):
+        cases = make_cases(20, seed=0)
+        self.assertEqual(len(cases), 20)
+        self.assertTrue(all(c.jaw_type in ("Upper", "Lower", "Mixed") for c in cases))
+
+
+class TestBenchmarkCompare(unittest.TestCase):
+
+    def test_flags_regression(self):
+        baseline = {"results": {"a": {"median_s": 1.0, "peak_kb": 100}, "b": {"median_s": 1.0, "peak_kb": 100}}}
+        current = {"results": {
+            "a": {"median_s": 1.5, "peak_kb": 100},
+            "b": {"median_s": 1.0, "peak_kb": 100},
+            "c": {"median_s": 1.0, "peak_kb": 100},
+        }}
+        status = {r["name"]: r["status"] for r in compare(current, baseline, 0.25, 0.25)}
+        self.assertEqual(status, {"a": "REGRESSION", "b": "OK", "c": "NEW"})
+
+
+class TestImportTime(unittest.TestCase):
+
+    def test_parse_importtime(self):
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   json.decoder\n"
+            "import time:       300 |        420 | json\n"
+        )
+        rows = parse_importtime(stderr)
+        self.assertEqual([r["name"] for r in rows], ["json.decoder", "json"])
+        self.assertEqual(rows[1]["cumulative_us"], 420)
+        self.assertEqual([r["depth"] for r in rows], [1, 0])
+
+    def test_entry_points_do_not_import_heavy_packages(self):
+        for name, spec in TARGETS.items():
+            result = check_target(name, spec, repeat=1, budget_scale=1.0)
+            self.assertEqual(result["leaked"], [], name)
+
+
+if __name__ == "__main__":
+    unittest.main()
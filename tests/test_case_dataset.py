@@ -0,0 +1,121 @@
+import unittest
+import tempfile
+import threading
+import time
+import numpy as np
+from pathlib import Path
+import sys
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from case_dataset import (
+    write_sample,
+    write_index,
+    load_sample,
+    collate_point_sets,
+    CaseArrayDataset
+)
+
+
+def make_root(tmp: Path, n_samples: int = 12) -> Path:
+    """Write n small synthetic samples with distinct point counts."""
+    rng = np.random.default_rng(0)
+    entries = []
+    for i in range(n_samples):
+        n = 10 + i
+        write_sample(tmp / f"case{i:02d}__upper", {
+            "points": rng.random((n, 3)).astype(np.float32),
+            "labels": np.full(n, i % 3, dtype=np.int8),
+            "margins": rng.random((4 + i, 3)).astype(np.float32),
+            "margin_offsets": np.array([0, 2, 4 + i], dtype=np.int64),
+            "tooth_numbers": np.array([11, 21], dtype=np.int32),
+        })
+        entries.append({"id": f"case{i:02d}__upper", "num_points": n})
+    write_index(tmp, entries)
+    return tmp
+
+
+class TestCaseDataset(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = make_root(Path(self._tmp.name))
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def ids(self, ds):
+        return [s["id"] for s in ds]
+
+    def test_load_sample_is_memory_mapped(self):
+        sample = load_sample(self.root / "case00__upper")
+        self.assertIsInstance(sample["points"], np.memmap)
+
+    def test_shards_are_disjoint_and_complete(self):
+        shards = [
+            self.ids(CaseArrayDataset(self.root, shard_index=i, num_shards=3, num_workers=2, seed=5))
+            for i in range(3)
+        ]
+        flat = [sid for shard in shards for sid in shard]
+        self.assertEqual(len(flat), 12)
+        self.assertEqual(len(set(flat)), 12)
+
+    def test_order_is_deterministic(self):
+        """Same seed and epoch give the same order regardless of worker timing."""
+        kwargs = dict(seed=3, shuffle_buffer=4, num_workers=3)
+        first = self.ids(CaseArrayDataset(self.root, **kwargs))
+        second = self.ids(CaseArrayDataset(self.root, **kwargs))
+        self.assertEqual(first, second)
+
+        ds = CaseArrayDataset(self.root, **kwargs)
+        ds.set_epoch(1)
+        self.assertNotEqual(self.ids(ds), first)
+        self.assertEqual(sorted(self.ids(ds)), sorted(first))
+
+    def test_thread_workers_stop_when_consumer_leaves(self):
+        before = threading.active_count()
+        ds = CaseArrayDataset(self.root, shuffle=False, shuffle_buffer=0, num_workers=2, prefetch=1)
+        stream = iter(ds)
+        first = next(stream)
+        self.assertIsInstance(first["points"], np.memmap)
+        stream.close()
+        deadline = time.time() + 5
+        while threading.active_count() > before and time.time() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(threading.active_count(), before)
+
+    def test_process_workers(self):
+        ds = CaseArrayDataset(self.root, shuffle=False, num_workers=2, worker_type="process")
+        self.assertEqual(sorted(self.ids(ds)), [f"case{i:02d}__upper" for i in range(12)])
+
+    def test_collate_concatenated(self):
+        samples = [load_sample(self.root / f"case{i:02d}__upper") for i in range(3)]
+        batch = collate_point_sets(samples)
+        self.assertEqual(batch["points"].shape, (10 + 11 + 12, 3))
+        np.testing.assert_array_equal(batch["point_offsets"], [0, 10, 21, 33])
+        self.assertEqual(batch["batch"][-1], 2)
+        # Tooth offsets index into the concatenated margins
+        self.assertEqual(batch["margin_offsets"][-1], len(batch["margins"]))
+        self.assertEqual(len(batch["margin_offsets"]), len(batch["tooth_numbers"]) + 1)
+
+    def test_collate_padded(self):
+        samples = [load_sample(self.root / f"case{i:02d}__upper") for i in range(3)]
+        batch = collate_point_sets(samples, pad=True)
+        self.assertEqual(batch["points"].shape, (3, 12, 3))
+        self.assertEqual(batch["mask"].sum(), 33)
+
+    def test_collate_margin_curves(self):
+        samples = [load_sample(self.root / f"case{i:02d}__upper") for i in range(3)]
+        batch = collate_point_sets(samples, margin_k=16)
+        self.assertEqual(batch["margin_curves"].shape, (6, 16, 3))
+        self.assertEqual(batch["margin_curves"].dtype, np.float32)
+
+    def test_batches(self):
+        ds = CaseArrayDataset(self.root, num_workers=2)
+        sizes = [len(b["ids"]) for b in ds.batches(5)]
+        self.assertEqual(sizes, [5, 5, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+import numpy as np
+import trimesh
+from pathlib import Path
+import sys
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from curve_utils import (
+    mesh_edges,
+    extract_level_set,
+    extract_ridge_curves,
+    extract_margin_curves,
+    match_curves_to_teeth
+)
+
+
+class TestCurveUtils(unittest.TestCase):
+
+    def setUp(self):
+        # Sphere of radius 5: the "margin" is the equator (z = 0)
+        self.mesh = trimesh.creation.icosphere(subdivisions=4, radius=5.0)
+
+    def test_mesh_edges_unique(self):
+        """Every side of a closed mesh is shared by two faces."""
+        edges, face_edges = mesh_edges(self.mesh.faces)
+        self.assertEqual(len(edges), len(self.mesh.edges_unique))
+        counts = np.bincount(face_edges.ravel())
+        self.assertTrue(np.all(counts == 2))
+
+    def test_level_set_equator(self):
+        """Zero level of z is a single closed loop on the equator."""
+        curves = extract_level_set(self.mesh.vertices, self.mesh.faces, self.mesh.vertices[:, 2], 0.0)
+        self.assertEqual(len(curves), 1)
+        loop = curves[0]
+        np.testing.assert_allclose(loop[:, 2], 0.0, atol=1e-9)
+        # Ordered: consecutive points are neighbours, including the closing step
+        steps = np.linalg.norm(np.diff(np.vstack([loop, loop[:1]]), axis=0), axis=1)
+        self.assertLess(steps.max(), 1.0)
+
+    def test_ridge_equator_band(self):
+        """A Gaussian band around the equator collapses to one closed loop."""
+        scores = np.exp(-(self.mesh.vertices[:, 2] / 0.8) ** 2)
+        curves = extract_ridge_curves(self.mesh.vertices, self.mesh.faces, scores, threshold=0.5, n_bins=64)
+        self.assertEqual(len(curves), 1)
+        loop = curves[0]
+        self.assertGreater(len(loop), 32)
+        self.assertLess(np.abs(loop[:, 2]).max(), 0.5)
+        # Counter-clockwise seen from +Z
+        angles = np.unwrap(np.arctan2(loop[:, 1], loop[:, 0]))
+        self.assertGreater(angles[-1] - angles[0], 0)
+
+    def test_cached_topology_gives_same_curves(self):
+        from topology_utils import build_topology
+        topology = build_topology(self.mesh.faces, len(self.mesh.vertices))
+        scores = np.exp(-(self.mesh.vertices[:, 2] / 0.8) ** 2)
+        for method, threshold in (("ridge", 0.5), ("level_set", 0.5)):
+            plain = extract_margin_curves(self.mesh, scores, threshold, method=method)
+            cached = extract_margin_curves(self.mesh, scores, threshold, method=method, topology=topology)
+            self.assertEqual(len(plain), len(cached))
+            for a, b in zip(plain, cached):
+                np.testing.assert_allclose(a, b)
+
+    def test_below_threshold_returns_nothing(self):
+        scores = np.zeros(len(self.mesh.vertices))
+        self.assertEqual(extract_margin_curves(self.mesh, scores), [])
+
+    def test_score_length_mismatch(self):
+        with self.assertRaises(ValueError):
+            extract_margin_curves(self.mesh, np.zeros(3))
+
+    def test_match_curves_to_teeth_design_space(self):
+        """Matched curves come back in the tooth's Design Space."""
+        scores = np.exp(-(self.mesh.vertices[:, 2] / 0.8) ** 2)
+        curves = extract_margin_curves(self.mesh, scores)
+
+        matrix = np.eye(4)
+        matrix[0, 3] = 10.0  # Scanner -> Design: +10 in X
+        angles = np.linspace(0, 2 * np.pi, 20, endpoint=False)
+        margin = np.stack([5 * np.cos(angles) + 10, 5 * np.sin(angles), np.zeros(20)], axis=1)
+        tooth = {"number": 26, "margin_points": margin, "transform_matrix": matrix}
+
+        matches = match_curves_to_teeth(curves, [tooth])
+        self.assertIn(26, matches)
+        np.testing.assert_allclose(matches[26].mean(axis=0), [10, 0, 0], atol=0.2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+import tempfile
+import json
+import numpy as np
+from pathlib import Path
+import sys
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from case_dataset import write_sample, write_index, load_sample, collate_point_sets
+from knn_utils import knn_graphs, knn_field, ensure_knn, load_knn, build_dataset_knn
+
+
+def brute_force_knn(points: np.ndarray, width: int) -> np.ndarray:
+    d = np.linalg.norm(points[:, None] - points[None], axis=-1)
+    np.fill_diagonal(d, np.inf)
+    return np.argsort(d, axis=1, kind="stable")[:, :width]
+
+
+class TestKnnUtils(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        rng = np.random.default_rng(0)
+        entries = []
+        for i in range(3):
+            sid = f"case{i}__upper"
+            write_sample(self.root / sid, {"points": rng.random((200 + 10 * i, 3)).astype(np.float32)})
+            entries.append({"id": sid, "num_points": 200 + 10 * i})
+        write_index(self.root, entries)
+        self.sample = self.root / "case0__upper"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_matches_brute_force(self):
+        points = np.load(self.sample / "points.npy").astype(np.float64)
+        graphs = knn_graphs(points, k=8, dilations=(1, 3), chunk_size=64)
+        reference = brute_force_knn(points, 8 * 3)
+        self.assertEqual(graphs[1].dtype, np.int32)
+        np.testing.assert_array_equal(graphs[1], reference[:, :8])
+        np.testing.assert_array_equal(graphs[3], reference[:, ::3])
+
+    def test_duplicates_and_small_sets(self):
+        # Coincident points never list themselves, only each other
+        points = np.array([[0, 0, 0], [0, 0, 0], [1, 0, 0], [5, 0, 0]], dtype=float)
+        graph = knn_graphs(points, k=2)[1]
+        self.assertFalse(np.any(graph == np.arange(4)[:, None]))
+        self.assertEqual(graph[0, 0], 1)
+        self.assertEqual(graph[1, 0], 0)
+
+        # Fewer than k + 1 points repeat the furthest neighbour
+        graph = knn_graphs(points[2:], k=3)[1]
+        np.testing.assert_array_equal(graph, [[1, 1, 1], [0, 0, 0]])
+
+    def test_ensure_caches_and_rebuilds(self):
+        self.assertEqual(ensure_knn(self.sample, k=8, dilations=(1, 2)), {1: "built", 2: "built"})
+        self.assertEqual(ensure_knn(self.sample, k=8, dilations=(1, 2)), {1: "cached", 2: "cached"})
+        meta = json.loads((self.sample / f"{knn_field(8, 2)}.json").read_text())
+        self.assertEqual((meta["k"], meta["dilation"], meta["num_points"]), (8, 2, 200))
+
+        # New points invalidate the stored graphs
+        np.save(self.sample / "points.npy", np.random.default_rng(1).random((50, 3)).astype(np.float32))
+        self.assertEqual(ensure_knn(self.sample, k=8, dilations=(2,)), {2: "built"})
+        self.assertEqual(load_knn(self.sample, k=8, dilation=2).shape, (50, 8))
+
+    def test_build_dataset_and_collate(self):
+        stats = build_dataset_knn(self.root, k=4, dilations=(1, 2), workers=1)
+        self.assertEqual((stats["samples"], stats["graphs_built"]), (3, 6))
+        self.assertEqual(build_dataset_knn(self.root, k=4, dilations=(1,), workers=1)["graphs_cached"], 3)
+
+        field = knn_field(4, 2)
+        samples = [load_sample(self.root / f"case{i}__upper", ("points", field)) for i in range(3)]
+        batch = collate_point_sets(samples)
+        self.assertEqual(batch[field].shape, (630, 4))
+        # Neighbours stay within their own sample after re-basing
+        np.testing.assert_array_equal(batch["batch"][batch[field]], batch["batch"][:, None] * np.ones(4, dtype=int))
+        np.testing.assert_array_equal(batch[field][200:410] - 200, samples[1][field])
+
+        padded = collate_point_sets(samples, pad=True)
+        self.assertEqual(padded[field].shape, (3, 220, 4))
+        np.testing.assert_array_equal(padded[field][1, :210], samples[1][field])
+        # Pad rows must not look like neighbour 0
+        self.assertTrue(np.all(padded[field][0, 200:] == -1))
+
+    def test_collate_rebases_graphs_of_other_fields(self):
+        rng = np.random.default_rng(1)
+        for i in range(3):
+            n = 20 + 5 * i
+            write_sample(self.root / f"case{i}__upper", {"margins": rng.random((n, 3)), "margin_offsets": np.array([0, n])})
+            ensure_knn(self.root / f"case{i}__upper", k=3, field="margins")
+        field = f"margins_{knn_field(3, 1)}"
+        samples = [load_sample(self.root / f"case{i}__upper", ("points", "margins", "margin_offsets", field)) for i in range(3)]
+
+        for pad in (False, True):
+            batch = collate_point_sets(samples, pad=pad)
+            self.assertEqual(batch[field].shape, (75, 3))
+            # Re-based by margin counts (20, 25), not point counts
+            np.testing.assert_array_equal(batch[field][20:45] - 20, samples[1][field])
+            np.testing.assert_array_equal(batch[field][45:] - 45, samples[2][field])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+import tempfile
+import numpy as np
+import trimesh
+from pathlib import Path
+import sys
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from lod_utils import (
+    build_lods,
+    load_lods,
+    load_labels,
+    transfer_vertex_data,
+    lod_mesh,
+    split_focus_region,
+    _cluster_decimate
+)
+
+
+class TestLodUtils(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        self.mesh = trimesh.creation.icosphere(subdivisions=5, radius=10.0)
+        self.stl = self.tmp / "case-UpperJaw.stl"
+        self.mesh.export(self.stl)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_build_lods_reduces_faces(self):
+        lods = build_lods(self.mesh, ratios=(0.25, 0.05))
+        self.assertLess(len(lods[0]["faces"]), len(self.mesh.faces) * 0.5)
+        self.assertLess(len(lods[1]["faces"]), len(lods[0]["faces"]))
+        for lod in lods:
+            self.assertEqual(len(lod["source_index"]), len(lod["vertices"]))
+            self.assertLess(lod["source_index"].max(), len(self.mesh.vertices))
+
+    def test_cluster_fallback(self):
+        vertices, faces = _cluster_decimate(self.mesh.vertices, self.mesh.faces, 2000)
+        self.assertLess(len(faces), len(self.mesh.faces))
+        self.assertLess(faces.max(), len(vertices))
+
+    def test_lods_are_cached(self):
+        first = load_lods(self.stl, cache_dir=self.tmp / "cache")
+        self.assertEqual(len(list((self.tmp / "cache").iterdir())), 1)
+        second = load_lods(self.stl, cache_dir=self.tmp / "cache")
+        np.testing.assert_array_equal(first[1]["faces"], second[1]["faces"])
+
+    def test_labels_cached_and_transferred(self):
+        xml = self.tmp / "case.constructionInfo"
+        xml.write_text("<ConstructionInfo/>")
+        # Labels follow the vertex order of the mesh loaded from the STL
+        loaded = trimesh.load(str(self.stl))
+        labels_full = (loaded.vertices[:, 2] > 0).astype(int)
+
+        calls = []
+        def compute():
+            calls.append(1)
+            return labels_full
+        load_labels(self.stl, xml, compute, self.tmp / "cache")
+        labels = load_labels(self.stl, xml, compute, self.tmp / "cache")
+        self.assertEqual(len(calls), 1)
+
+        lod = load_lods(self.stl, cache_dir=self.tmp / "cache")[1]
+        lod_labels = transfer_vertex_data(labels, lod)
+        # Transferred labels agree with the geometry of the decimated vertices
+        agree = lod_labels == (lod["vertices"][:, 2] > 0)
+        self.assertGreater(agree.mean(), 0.95)
+
+    def test_split_focus_region(self):
+        coarse = lod_mesh(build_lods(self.mesh, ratios=(0.05,))[0])
+        center = np.array([0, 0, 10.0])
+        rest, patch, patch_index = split_focus_region(coarse, self.mesh, center, radius=4.0)
+        self.assertLess(len(rest.faces), len(coarse.faces))
+        self.assertTrue(np.all(np.linalg.norm(patch.triangles_center - center, axis=1) < 4.0))
+        np.testing.assert_array_equal(patch.vertices, self.mesh.vertices[patch_index])
+
+
+if __name__ == '__main__':
+    unittest.main()
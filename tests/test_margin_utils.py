@@ -0,0 +1,72 @@
+import unittest
+import numpy as np
+from pathlib import Path
+import sys
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import margin_utils
+from margin_utils import pack_margins, resample_margins
+
+
+def ring(n: int, radius: float = 5.0, clockwise: bool = False, phase: float = 0.0) -> np.ndarray:
+    """Closed circle of n points in the z = 0 plane."""
+    angles = np.linspace(0, 2 * np.pi, n, endpoint=False) + phase
+    if clockwise:
+        angles = -angles
+    return np.c_[radius * np.cos(angles), radius * np.sin(angles), np.zeros(n)]
+
+
+class TestMarginUtils(unittest.TestCase):
+
+    def test_pack_margins(self):
+        points, offsets = pack_margins([ring(5), np.zeros((0, 3)), ring(3)])
+        self.assertEqual(points.shape, (8, 3))
+        np.testing.assert_array_equal(offsets, [0, 5, 5, 8])
+
+    def test_equal_arc_spacing(self):
+        """Resampled points are equally spaced along the closed curve."""
+        rng = np.random.default_rng(0)
+        # Irregular input spacing: random angles on a circle
+        angles = np.sort(rng.uniform(0, 2 * np.pi, 400))
+        circle = np.c_[5 * np.cos(angles), 5 * np.sin(angles), np.zeros(400)]
+        curves = resample_margins(*pack_margins([circle]), k=32)
+        self.assertEqual(curves.shape, (1, 32, 3))
+        steps = np.linalg.norm(np.diff(np.vstack([curves[0], curves[0][:1]]), axis=0), axis=1)
+        np.testing.assert_allclose(steps, steps.mean(), rtol=1e-2)
+
+    def test_canonical_winding_and_start(self):
+        """Curves of different density, direction and start point line up index by index."""
+        margins = [ring(50), ring(333, clockwise=True, phase=1.0), ring(1000, phase=2.5)]
+        curves = resample_margins(*pack_margins(margins), k=16)
+        np.testing.assert_allclose(curves[0, 0], [5, 0, 0], atol=0.05)
+        np.testing.assert_allclose(curves[1], curves[0], atol=0.05)
+        np.testing.assert_allclose(curves[2], curves[0], atol=0.05)
+        # Counter-clockwise seen from +z: the second point has y > 0
+        self.assertGreater(curves[0, 1, 1], 0)
+
+    def test_degenerate_teeth(self):
+        """Empty margins are NaN; single-point margins repeat that point."""
+        curves = resample_margins(*pack_margins([np.zeros((0, 3)), np.array([[1.0, 2.0, 3.0]]), ring(8)]), k=4)
+        self.assertTrue(np.isnan(curves[0]).all())
+        np.testing.assert_array_equal(curves[1], np.tile([1.0, 2.0, 3.0], (4, 1)))
+        self.assertFalse(np.isnan(curves[2]).any())
+
+    def test_chunking_matches_single_pass(self):
+        """Splitting the teeth into chunks does not change the result."""
+        rng = np.random.default_rng(1)
+        margins = [rng.random((n, 3)) for n in rng.integers(0, 40, 50)]
+        points, offsets = pack_margins(margins)
+        single = resample_margins(points, offsets, k=8)
+        chunk_points = margin_utils.CHUNK_POINTS
+        margin_utils.CHUNK_POINTS = 64
+        try:
+            chunked = resample_margins(points, offsets, k=8)
+        finally:
+            margin_utils.CHUNK_POINTS = chunk_points
+        np.testing.assert_allclose(chunked, single, equal_nan=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
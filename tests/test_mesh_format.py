@@ -0,0 +1,118 @@
+import unittest
+import tempfile
+import numpy as np
+import trimesh
+from pathlib import Path
+import sys
+
+# Add repository root and scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from benchmarks.synthetic import make_case
+from dental_utils import load_mesh
+from mesh_format import (
+    quantize_triangles, save_qmesh, save_qmesh_triangles, load_qmesh, read_header, convert_stl,
+    morton_codes, find_stls, convert_dataset, qmesh_path,
+)
+
+
+class TestMeshFormat(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        self.case_dir = make_case(self.tmp / "data", "case_a", seed=0, stl_vertices=3000)
+        self.stl = self.case_dir / "case_a-UpperJaw.stl"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_convert_matches_load_mesh(self):
+        result = convert_stl(self.stl, precision=0.001)
+        self.assertLess(result["qmesh_bytes"], result["stl_bytes"] / 5)
+        self.assertLessEqual(result["max_error_mm"], 0.0005 + 1e-9)
+
+        mesh = load_mesh(str(self.stl))
+        vertices, faces = load_qmesh(result["qmesh"])
+        # Same vertex order and faces as trimesh's merge, coordinates within half a step
+        np.testing.assert_array_equal(faces, mesh.faces)
+        np.testing.assert_allclose(vertices, mesh.vertices, atol=0.0005 + 1e-6)
+
+        # dental_utils.load_mesh reads the conversion directly
+        converted = load_mesh(result["qmesh"])
+        np.testing.assert_array_equal(converted.faces, mesh.faces)
+
+    def test_morton_order_keeps_surface(self):
+        mesh = load_mesh(str(self.stl))
+        path = self.tmp / "morton.qmesh"
+        save_qmesh(path, mesh.vertices, mesh.faces, morton=True)
+        vertices, faces = load_qmesh(path)
+        self.assertTrue(read_header(path)["morton"])
+        # Vertices are in Z-order
+        q = np.rint((vertices - vertices.min(axis=0)) / 0.001).astype(np.int64)
+        codes = morton_codes(q)
+        self.assertTrue(np.all(codes[1:] >= codes[:-1]))
+
+        # Same oriented triangles: compare corner cycles starting at the smallest corner
+        origin = mesh.vertices.min(axis=0)
+
+        def triangles(v, f):
+            corners = [tuple(c) for c in np.rint((v - origin) / 0.001).astype(np.int64).tolist()]
+            out = set()
+            for a, b, c in f.tolist():
+                cycle = [corners[a], corners[b], corners[c]]
+                k = cycle.index(min(cycle))
+                out.add(tuple(cycle[k:] + cycle[:k]))
+            return out
+        self.assertEqual(len(faces), len(mesh.faces))
+        self.assertEqual(triangles(vertices, faces), triangles(mesh.vertices, mesh.faces))
+
+    def test_quantization_merges_within_step(self):
+        triangles = np.array([
+            [[0, 0, 0], [1, 0, 0], [0, 1, 0]],
+            [[1.0000001, 0, 0], [1, 1, 0], [0, 1, 0]],
+        ])
+        encoded = quantize_triangles(triangles, precision=0.001)
+        self.assertEqual(len(encoded["quantized"]), 4)
+        np.testing.assert_array_equal(encoded["faces"], [[0, 1, 2], [1, 3, 2]])
+
+    def test_empty_and_large_meshes(self):
+        path = self.tmp / "empty.qmesh"
+        save_qmesh(path, np.zeros((0, 3)), np.zeros((0, 3), dtype=int))
+        vertices, faces = load_qmesh(path)
+        self.assertEqual((vertices.shape, faces.shape), ((0, 3), (0, 3)))
+
+        # Extent beyond the packed-key range falls back to row-wise dedup
+        mesh = trimesh.creation.icosphere(subdivisions=2, radius=3000.0)
+        save_qmesh_triangles(path, mesh.triangles, precision=0.001)
+        vertices, faces = load_qmesh(path)
+        self.assertEqual(len(vertices), len(mesh.vertices))
+        np.testing.assert_allclose(vertices[faces], mesh.triangles, atol=0.0005 + 1e-6)
+
+        # Indexed meshes keep their own vertex order
+        save_qmesh(path, mesh.vertices, mesh.faces, precision=0.001)
+        vertices, faces = load_qmesh(path)
+        np.testing.assert_array_equal(faces, mesh.faces)
+        np.testing.assert_allclose(vertices, mesh.vertices, atol=0.0005 + 1e-6)
+
+    def test_rejects_extent_beyond_delta_range(self):
+        # 3e9 cells fit in uint32 but their deltas do not fit the zigzag int32 range
+        vertices = np.array([[0.0, 0.0, 0.0], [3.0e6, 0.0, 0.0], [0.0, 1.0, 0.0]])
+        with self.assertRaises(ValueError):
+            save_qmesh(self.tmp / "far.qmesh", vertices, np.array([[0, 1, 2]]), precision=0.001)
+
+    def test_convert_dataset(self):
+        stls = find_stls(self.tmp / "data")
+        self.assertEqual(len(stls), 2)
+        results = convert_dataset(stls, workers=1)
+        self.assertTrue(all(qmesh_path(p).exists() for p in stls))
+        self.assertEqual([r["stl"] for r in results], [str(p) for p in stls])
+
+    def test_rejects_other_files(self):
+        with self.assertRaises(ValueError):
+            load_qmesh(self.stl)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import unittest
+import tempfile
+import numpy as np
+import trimesh
+from pathlib import Path
+import sys
+
+# Add repository root and scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from benchmarks.synthetic import make_case
+from render_utils import (
+    look_at_camera, orbit_cameras, project, rasterize, render_views, backproject, render_case,
+    render_thumbnail, render_case_thumbnail, write_png, LABEL_COLORS, MARGIN_COLOR, BACKGROUND,
+)
+
+
+class TestRenderUtils(unittest.TestCase):
+
+    def setUp(self):
+        self.mesh = trimesh.creation.icosphere(subdivisions=3, radius=5.0)
+        self.top = look_at_camera([0, 0, 20], [0, 0, 0], up=(0, 1, 0), width=64, height=64, scale=12.0)
+
+    def test_project_orthographic(self):
+        xy, depth = project(np.array([[0.0, 0.0, 0.0], [6.0, 0.0, 5.0]]), self.top)
+        np.testing.assert_allclose(xy[0], [32, 32])
+        np.testing.assert_allclose(xy[1], [64, 32])
+        np.testing.assert_allclose(depth, [20, 15])
+
+    def test_sphere_depth_and_silhouette(self):
+        view = rasterize(self.mesh.vertices, self.mesh.faces, self.top)
+        hit = view["face_id"] >= 0
+        # Silhouette is the disc of radius 5 (= 5 * 64 / 12 px), up to facetting
+        area = hit.sum() * (12.0 / 64) ** 2
+        self.assertAlmostEqual(area, np.pi * 25, delta=0.08 * np.pi * 25)
+        # Nearest surface: the sphere's top at z = 5, seen from z = 20
+        self.assertAlmostEqual(view["depth"][hit].min(), 15.0, delta=0.1)
+        self.assertTrue(np.all(view["depth"][~hit] == 0))
+        np.testing.assert_allclose(view["bary"][hit].sum(axis=1), 1.0, atol=1e-5)
+
+    def test_occlusion_keeps_nearest_face(self):
+        # Two parallel squares; the camera must see the one at z = 1
+        square = np.array([[-1, -1, 0], [1, -1, 0], [1, 1, 0], [-1, 1, 0]], dtype=float)
+        vertices = np.vstack([square, square + [0, 0, 1]])
+        faces = np.array([[0, 1, 2], [0, 2, 3], [4, 5, 6], [4, 6, 7]])
+        camera = look_at_camera([0, 0, 10], [0, 0, 0], up=(0, 1, 0), width=16, height=16, scale=4.0)
+        face_id = rasterize(vertices, faces, camera)["face_id"]
+        self.assertEqual(set(np.unique(face_id[face_id >= 0])), {2, 3})
+
+    def test_perspective_matches_orthographic_centre(self):
+        camera = look_at_camera([0, 0, 20], [0, 0, 0], up=(0, 1, 0), width=64, height=64, fov_deg=40)
+        view = rasterize(self.mesh.vertices, self.mesh.faces, camera)
+        self.assertAlmostEqual(view["depth"][32, 32], 15.0, delta=0.1)
+
+    def test_render_views_outputs(self):
+        labels = (self.mesh.vertices[:, 2] > 0).astype(np.int16)
+        cameras = orbit_cameras(self.mesh.vertices, k=4, size=32)
+        views = render_views(self.mesh.vertices, self.mesh.faces, cameras, vertex_labels=labels)
+        self.assertEqual(views["depth"].shape, (4, 32, 32))
+        self.assertEqual(views["normal"].shape, (4, 32, 32, 3))
+        hit = views["face_id"] >= 0
+        self.assertTrue(hit.any(axis=(1, 2)).all())
+        # Normals are unit length and face the camera (+z in camera space)
+        np.testing.assert_allclose(np.linalg.norm(views["normal"][hit], axis=1), 1.0, atol=1e-5)
+        self.assertTrue(np.all(views["normal"][hit][:, 2] >= 0))
+        self.assertEqual(set(np.unique(views["label"][~hit])), {-1})
+        self.assertEqual(set(np.unique(views["label"][hit])), {0, 1})
+
+    def test_backproject_recovers_vertex_values(self):
+        cameras = orbit_cameras(self.mesh.vertices, k=6, size=96, elevation_deg=30)
+        cameras += orbit_cameras(self.mesh.vertices, k=6, size=96, elevation_deg=-30)
+        views = render_views(self.mesh.vertices, self.mesh.faces, cameras)
+        # A linear field rendered per pixel comes back as (approximately) itself
+        field = self.mesh.vertices[:, 2]
+        faces = self.mesh.faces[views["face_id"].clip(0)]
+        pixels = (views["bary"] * field[faces]).sum(axis=-1)
+        scores = backproject(pixels, views, self.mesh.faces, len(self.mesh.vertices))
+        seen = ~np.isnan(scores)
+        self.assertGreater(seen.mean(), 0.95)
+        np.testing.assert_allclose(scores[seen], field[seen], atol=0.6)
+
+        multi = backproject(np.stack([pixels, -pixels], axis=-1), views, self.mesh.faces, len(self.mesh.vertices))
+        np.testing.assert_allclose(multi[seen, 1], -scores[seen])
+
+    def test_render_case(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            case_dir = Path(make_case(Path(tmp) / "data", "case_a", seed=0))
+            written = render_case(case_dir, Path(tmp) / "out", views=2, size=32)
+            self.assertEqual(written, ["case_a__upper.npz", "case_a__lower.npz"])
+            with np.load(Path(tmp) / "out" / written[0]) as data:
+                self.assertEqual(data["depth"].shape, (2, 32, 32))
+                self.assertEqual(data["label"].shape, (2, 32, 32))
+
+    def test_thumbnail_colours_and_margin(self):
+        labels = (self.mesh.vertices[:, 2] > 3).astype(np.int16)
+        angles = np.linspace(0, 2 * np.pi, 50, endpoint=False)
+        ring = np.c_[3 * np.cos(angles), 3 * np.sin(angles), np.full(50, 4.0)]
+        image = render_thumbnail(self.mesh.vertices, self.mesh.faces, labels, [ring], size=64)
+        self.assertEqual(image.shape, (64, 64, 3))
+        self.assertTrue(np.all(image[0, 0] == BACKGROUND))
+        # Radius 3 ring at 64 / 10.5 px per mm (sphere diameter plus 5% border)
+        self.assertTrue(np.all(image[32, 32 + 18] == MARGIN_COLOR))
+        # Centre (top of the sphere) is tooth-coloured, the rim gum-coloured
+        self.assertEqual(np.argmin(np.abs(LABEL_COLORS - image[32, 32]).sum(axis=1)), 1)
+        self.assertEqual(np.argmin(np.abs(LABEL_COLORS - image[32, 32 + 26]).sum(axis=1)), 0)
+
+    def test_case_thumbnail_png(self):
+        import zlib
+        with tempfile.TemporaryDirectory() as tmp:
+            case_dir = make_case(Path(tmp) / "data", "case_a", seed=0, stl_vertices=2000)
+            image = render_case_thumbnail(case_dir, size=40)
+            self.assertEqual(image.shape, (40, 80, 3))
+            path = Path(tmp) / "thumb.png"
+            write_png(path, image)
+            data = path.read_bytes()
+            self.assertEqual(data[:8], b"\x89PNG\r\n\x1a\n")
+            raw = np.frombuffer(zlib.decompress(data[41:-12]), dtype=np.uint8).reshape(40, 1 + 80 * 3)
+            np.testing.assert_array_equal(raw[:, 1:].reshape(40, 80, 3), image)
+
+
+if __name__ == "__main__":
+    unittest.main()
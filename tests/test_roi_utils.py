@@ -0,0 +1,80 @@
+import unittest
+import tempfile
+import numpy as np
+import trimesh
+from pathlib import Path
+import sys
+
+# Add repository root and scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from benchmarks.synthetic import make_case
+from dental_utils import load_teeth, transform_points
+from roi_utils import crop_teeth, load_tooth_crops
+
+
+def translation(offset) -> np.ndarray:
+    """Scanner -> Design matrix (as from load_teeth) translating by offset."""
+    matrix = np.identity(4)
+    matrix[:3, 3] = offset
+    return matrix
+
+
+class TestRoiUtils(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        self.mesh = trimesh.creation.icosphere(subdivisions=5, radius=10.0)
+        # Tooth 26: margin ring around the top of the sphere, stored in Design Space
+        angles = np.linspace(0, 2 * np.pi, 40, endpoint=False)
+        ring = np.c_[3 * np.cos(angles), 3 * np.sin(angles), np.full(40, 9.5)]
+        matrix = translation([0.0, 0.0, -9.5])
+        self.teeth = [
+            {"number": 26, "jaw": "upper", "margin_points": transform_points(ring, matrix),
+             "transform_matrix": matrix, "scan_filename": "case-UpperJaw.stl"},
+            {"number": 25, "jaw": "upper", "margin_points": np.zeros((0, 3)),
+             "transform_matrix": np.identity(4), "scan_filename": "case-UpperJaw.stl"},
+        ]
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_crop_is_local_and_reindexed(self):
+        crops = crop_teeth(self.mesh.vertices, self.mesh.faces, self.teeth, radius=4.0)
+        self.assertEqual([c["number"] for c in crops], [26])
+        crop = crops[0]
+        self.assertLess(len(crop["vertices"]), 0.1 * len(self.mesh.vertices))
+        np.testing.assert_allclose(crop["vertices"], self.mesh.vertices[crop["vertex_index"]], atol=1e-5)
+        self.assertLess(crop["faces"].max(), len(crop["vertices"]))
+        # Every kept face is a jaw face within the radius
+        jaw_faces = {tuple(sorted(f)) for f in self.mesh.faces.tolist()}
+        for face in crop["vertex_index"][crop["faces"]].tolist():
+            self.assertIn(tuple(sorted(face)), jaw_faces)
+        self.assertTrue(np.all(np.linalg.norm(crop["vertices"] - crop["center"], axis=1) <= 4.0 + 1e-5))
+        # Scanner-frame margin sits around the sphere's pole
+        np.testing.assert_allclose(crop["margin"][:, 2], 9.5, atol=1e-5)
+
+    def test_design_space_crop(self):
+        crop = crop_teeth(self.mesh.vertices, self.mesh.faces, self.teeth, radius=4.0, design_space=True)[0]
+        self.assertEqual(crop["frame"], "design")
+        np.testing.assert_allclose(crop["margin"][:, 2], 0.0, atol=1e-5)
+        np.testing.assert_allclose(crop["vertices"], self.mesh.vertices[crop["vertex_index"]] - [0, 0, 9.5], atol=1e-4)
+
+    def test_crops_are_cached(self):
+        case_dir = make_case(self.tmp, "c", seed=3, n_teeth=4, margin_points=60, stl_vertices=20000)
+        stl, xml = case_dir / "c-UpperJaw.stl", case_dir / "c.constructionInfo"
+        first = load_tooth_crops(stl, xml, cache_dir=self.tmp / "cache")
+        upper = [t["number"] for t in load_teeth(str(xml)) if t["jaw"] == "upper" and len(t["margin_points"])]
+        self.assertEqual(sorted(first), sorted(upper))
+        self.assertEqual(len(list((self.tmp / "cache").iterdir())), 1)
+
+        number = upper[0]
+        second = load_tooth_crops(stl, xml, numbers=[number, 99], cache_dir=self.tmp / "cache")
+        self.assertEqual(list(second), [number])
+        np.testing.assert_array_equal(first[number]["faces"], second[number]["faces"])
+        self.assertEqual(second[number]["frame"], "scanner")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+import tempfile
+import numpy as np
+import trimesh
+from pathlib import Path
+import sys
+
+# Add repository root and scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from benchmarks.synthetic import make_case
+from topology_utils import (
+    build_topology, load_topology, neighbors, boundary_loops, adjacency_matrix, TOPOLOGY_KEYS,
+)
+
+
+def open_box() -> tuple[np.ndarray, np.ndarray]:
+    """Unit cube without its two top faces: one square boundary loop."""
+    box = trimesh.creation.box()
+    keep = box.face_normals[:, 2] < 0.5
+    return box.vertices, box.faces[keep]
+
+
+class TestTopologyUtils(unittest.TestCase):
+
+    def setUp(self):
+        self.sphere = trimesh.creation.icosphere(subdivisions=3)
+
+    def test_matches_trimesh_connectivity(self):
+        mesh = self.sphere
+        topo = build_topology(mesh.faces, len(mesh.vertices))
+        self.assertEqual(len(topo["edges"]), len(mesh.edges_unique))
+        np.testing.assert_array_equal(topo["edge_face_count"], 2)
+        for v in range(0, len(mesh.vertices), 37):
+            self.assertEqual(neighbors(topo, v).tolist(), sorted(mesh.vertex_neighbors[v]))
+            start, end = topo["vf_offsets"][v], topo["vf_offsets"][v + 1]
+            self.assertEqual(sorted(topo["vf_indices"][start:end]), sorted(f for f in mesh.vertex_faces[v] if f >= 0))
+
+        # Face adjacency: the face across side k shares that side's edge
+        pairs = {tuple(sorted((f, g))) for f, row in enumerate(topo["face_adjacency"].tolist()) for g in row}
+        self.assertEqual(pairs, {tuple(p) for p in np.sort(mesh.face_adjacency, axis=1).tolist()})
+
+        # Closed surface: no boundary
+        self.assertEqual(boundary_loops(topo), [])
+        self.assertEqual((adjacency_matrix(topo) != (adjacency_matrix(topo).T)).nnz, 0)
+
+    def test_boundary_loop_follows_winding(self):
+        vertices, faces = open_box()
+        topo = build_topology(faces, len(vertices))
+        loops = boundary_loops(topo)
+        self.assertEqual(len(loops), 1)
+        self.assertTrue(topo["loop_closed"][0])
+        loop = loops[0]
+        np.testing.assert_allclose(vertices[loop][:, 2], 0.5)
+        # Every consecutive pair is a boundary side of some face, in face winding order
+        sides = {(a, b) for f in faces.tolist() for a, b in zip(f, f[1:] + f[:1])}
+        for a, b in zip(loop.tolist(), np.roll(loop, -1).tolist()):
+            self.assertIn((a, b), sides)
+
+    def test_loops_sorted_and_open_chains(self):
+        # A grid with one interior hole: border loop first, then the hole
+        grid = trimesh.creation.box().subdivide().subdivide()
+        top = np.flatnonzero(grid.face_normals[:, 2] > 0.5)
+        faces = np.delete(grid.faces, top[:2], axis=0)
+        topo = build_topology(faces, len(grid.vertices))
+        sizes = [len(l) for l in boundary_loops(topo)]
+        self.assertEqual(sizes, sorted(sizes, reverse=True))
+        self.assertTrue(np.all(topo["loop_closed"]))
+
+        # Inconsistent winding breaks the loop into an open chain
+        vertices, faces = open_box()
+        faces = faces.copy()
+        flip = np.flatnonzero(np.abs(trimesh.Trimesh(vertices, faces, process=False).face_normals[:, 0]) > 0.5)[0]
+        faces[flip] = faces[flip, ::-1]
+        topo = build_topology(faces, len(vertices))
+        self.assertFalse(np.all(topo["loop_closed"]))
+        self.assertEqual(sum(len(l) for l in boundary_loops(topo)) - (~topo["loop_closed"]).sum(), 4)
+
+    def test_cache_roundtrip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            case_dir = make_case(Path(tmp) / "data", "case_a", seed=0, stl_vertices=2000)
+            stl = case_dir / "case_a-UpperJaw.stl"
+            first = load_topology(stl)
+            cache = list((case_dir / ".lod_cache").glob("*.topology"))
+            self.assertEqual(len(cache), 1)
+            self.assertEqual(sorted(p.stem for p in cache[0].iterdir()), sorted(TOPOLOGY_KEYS))
+            self.assertIsInstance(first["edges"], np.memmap)
+
+            mesh = trimesh.load(stl)
+            built = build_topology(mesh.faces, len(mesh.vertices))
+            for key in TOPOLOGY_KEYS:
+                np.testing.assert_array_equal(load_topology(stl)[key], built[key])
+            self.assertEqual(len(boundary_loops(first)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
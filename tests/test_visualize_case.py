@@ -0,0 +1,81 @@
+import unittest
+import tempfile
+import argparse
+import numpy as np
+import trimesh
+from pathlib import Path
+import sys
+from unittest import mock
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import visualize_case
+from visualize_case import read_manifest, load_case, CaseBrowser
+
+
+def make_case(root: Path, name: str) -> Path:
+    """Sphere 'jaw' with one tooth whose margin runs along the equator."""
+    case_dir = root / name
+    case_dir.mkdir()
+    trimesh.creation.icosphere(subdivisions=3, radius=5.0).export(case_dir / f"{name}-UpperJaw.stl")
+    angles = np.linspace(0, 2 * np.pi, 30, endpoint=False)
+    vecs = "".join(f"<Vec3><x>{5 * np.cos(a)}</x><y>{5 * np.sin(a)}</y><z>0</z></Vec3>" for a in angles)
+    (case_dir / f"{name}.constructionInfo").write_text(
+        f"<ConstructionInfo><Teeth><Tooth><Number>26</Number><Margin>{vecs}</Margin></Tooth></Teeth></ConstructionInfo>"
+    )
+    return case_dir
+
+
+class TestVisualizeCase(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.cases = [make_case(self.root, f"case{i}") for i in range(4)]
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_read_manifest_skips_comments(self):
+        manifest = self.root / "cases.txt"
+        manifest.write_text(f"# review batch\n{self.cases[0]}\n\n{self.cases[1]}  # second\n")
+        self.assertEqual(read_manifest(manifest), self.cases[:2])
+
+    def test_load_case_with_labels(self):
+        data = load_case(self.cases[0], with_labels=True, verbose=False)
+        self.assertEqual(len(data["upper_labels"]), len(data["upper_mesh"].vertices))
+        self.assertIn(26, data["distances"])
+        self.assertIsNone(data["lower_mesh"])
+
+    def test_load_case_lod_skips_full_mesh_when_cached(self):
+        cache = str(self.root / "cache")
+        cold = load_case(self.cases[0], with_labels=True, verbose=False, lod=2, lod_cache=cache)
+        self.assertIsNotNone(cold["upper_mesh"])
+
+        with mock.patch.object(visualize_case, "load_mesh", side_effect=AssertionError("STL parsed")):
+            warm = load_case(self.cases[0], with_labels=True, verbose=False, lod=2, lod_cache=cache)
+        self.assertIsNone(warm["upper_mesh"])
+        np.testing.assert_allclose(warm["distances"][26], cold["distances"][26])
+        np.testing.assert_array_equal(warm["upper_labels"], cold["upper_labels"])
+        self.assertLess(len(warm["upper_lod"]["vertices"]), len(cold["upper_mesh"].vertices))
+        # The full-resolution mesh is still available for a focus patch
+        self.assertEqual(len(warm["upper_full"]().vertices), len(cold["upper_mesh"].vertices))
+
+    def test_load_case_missing(self):
+        with self.assertRaises(FileNotFoundError):
+            load_case(self.root / "nope", verbose=False)
+
+    def test_browser_prefetch_window(self):
+        args = argparse.Namespace(jaw="both", lod=0, focus_tooth=None, lod_cache=None)
+        browser = CaseBrowser(self.cases, args, prefetch=2)
+        browser.go(0, display=False)
+        self.assertEqual(sorted(browser.futures), [0, 1, 2])
+        browser.go(2, display=False)
+        self.assertEqual(sorted(browser.futures), [1, 2, 3])
+        self.assertEqual(browser.current["name"], "case2")
+        browser.executor.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()